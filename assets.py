@@ -0,0 +1,340 @@
+import argparse
+import base64
+import functools
+import hashlib
+import json
+import os
+import shutil
+import threading
+
+import data_store
+import timing
+
+# ===========================================================
+# ========== PIPELINE ASET GAMBAR ===========================
+# ===========================================================
+# Membuat varian gambar yang sudah diperkecil & dikompres ulang
+# (WebP/JPEG, atau PNG untuk ikon) di data/optimized/, beserta manifest
+# yang memetakan nama logis aset ke file hasil optimasi.
+#
+#     python assets.py          # bangun ulang aset yang sumbernya berubah
+#     python assets.py --force  # bangun ulang semua
+#
+# Aplikasi memanggil ensure_built() saat start; jika sumber tidak berubah
+# (mtime + ukuran sama), tidak ada gambar yang diproses ulang.
+#
+# Setiap varian juga disalin ke static/img/ dengan nama ber-hash isi,
+# sehingga kartu HTML bisa merujuk URL statis (app/static/...?v=hash)
+# yang di-cache browser jangka panjang, bukan data base64 inline.
+
+OUTPUT_DIR = os.path.join(data_store.DATA_DIR, "optimized")
+BANNER_PATH = os.path.join(data_store.DATA_DIR, "banner.jpg")
+BANNER_MAX_SIZE = (2400, 1200)  # lebar, tinggi maksimum banner yang disimpan
+MANIFEST_PATH = os.path.join(OUTPUT_DIR, "manifest.json")
+STATIC_DIR = os.path.join("static", "img")
+STATIC_URL = "app/static/img"
+
+# nama logis -> sumber, lebar maksimum tiap varian, format keluaran
+ASSETS = {
+    "landing": {
+        "source": os.path.join(data_store.DATA_DIR, "img-bgrn.png"),
+        "widths": [800, 1600],
+        "formats": ["webp", "jpeg"],
+    },
+    "banner": {
+        "source": BANNER_PATH,
+        "widths": [800, 1600],
+        "formats": ["webp", "jpeg"],
+    },
+    "game_preview": {
+        "source": os.path.join(data_store.DATA_DIR, "game-preview.png"),
+        "widths": [600, 1200],
+        "formats": ["webp", "jpeg"],
+    },
+    "logo": {
+        "source": os.path.join(data_store.DATA_DIR, "logo.png"),
+        "widths": [64, 192],
+        "formats": ["png"],
+    },
+    "buku_profil": {
+        "source": os.path.join(data_store.DATA_DIR, "buku-profil.png"),
+        "widths": [280],
+        "formats": ["webp", "png"],
+    },
+    "buku_saku": {
+        "source": os.path.join(data_store.DATA_DIR, "buku-saku.png"),
+        "widths": [280],
+        "formats": ["webp", "png"],
+    },
+    "buku_anak": {
+        "source": os.path.join(data_store.DATA_DIR, "buku-anak.png"),
+        "widths": [280],
+        "formats": ["webp", "png"],
+    },
+}
+
+SAVE_OPTIONS = {
+    "webp": {"format": "WEBP", "quality": 80, "method": 6},
+    "jpeg": {"format": "JPEG", "quality": 82, "optimize": True, "progressive": True},
+    "png": {"format": "PNG", "optimize": True},
+}
+
+EXTENSIONS = {"webp": ".webp", "jpeg": ".jpg", "png": ".png"}
+MIME_TYPES = {
+    ".webp": "image/webp",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".png": "image/png",
+}
+
+_lock = threading.Lock()
+_manifest = None
+
+
+def _source_signature(path):
+    stat = os.stat(path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _prepare(image, fmt):
+    # JPEG tidak punya alpha: tempel di atas latar putih
+    if fmt == "jpeg":
+        if image.mode in ("RGBA", "LA", "P"):
+            image = image.convert("RGBA")
+            from PIL import Image
+
+            background = Image.new("RGB", image.size, (255, 255, 255))
+            background.paste(image, mask=image.getchannel("A"))
+            return background
+        return image.convert("RGB")
+    if image.mode not in ("RGB", "RGBA"):
+        return image.convert("RGBA")
+    return image
+
+
+def resize_variants(image, name, widths, formats, output_dir=OUTPUT_DIR):
+    """Simpan `image` (PIL) dalam beberapa lebar & format; kembalikan daftar varian."""
+    from PIL import Image
+
+    os.makedirs(output_dir, exist_ok=True)
+    variants = []
+    for width in widths:
+        width = min(width, image.width)
+        height = max(1, round(image.height * width / image.width))
+        resized = image.resize((width, height), Image.Resampling.LANCZOS)
+        for fmt in formats:
+            path = os.path.join(output_dir, f"{name}-{width}{EXTENSIONS[fmt]}")
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            _prepare(resized, fmt).save(tmp_path, **SAVE_OPTIONS[fmt])
+            os.replace(tmp_path, path)
+            variants.append(
+                {
+                    "width": width,
+                    "height": height,
+                    "format": fmt,
+                    "path": path,
+                    "bytes": os.path.getsize(path),
+                }
+            )
+    return variants
+
+
+def _content_hash(path):
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()[:12]
+
+
+def publish_static(name, variants):
+    """Salin varian ke static/img/ dengan nama ber-hash; hapus salinan lama."""
+    os.makedirs(STATIC_DIR, exist_ok=True)
+    published = set()
+    for variant in variants:
+        digest = _content_hash(variant["path"])
+        stem, ext = os.path.splitext(os.path.basename(variant["path"]))
+        static_name = f"{stem}.{digest}{ext}"
+        static_path = os.path.join(STATIC_DIR, static_name)
+        if not os.path.exists(static_path):
+            tmp_path = f"{static_path}.{os.getpid()}.tmp"
+            shutil.copyfile(variant["path"], tmp_path)
+            os.replace(tmp_path, static_path)
+        variant["static"] = static_name
+        variant["hash"] = digest
+        published.add(static_name)
+
+    for filename in os.listdir(STATIC_DIR):
+        if filename.startswith(f"{name}-") and filename not in published:
+            os.remove(os.path.join(STATIC_DIR, filename))
+    return variants
+
+
+@timing.timed("gambar:optimasi")
+def _build_asset(name, spec):
+    from PIL import Image, ImageOps
+
+    with Image.open(spec["source"]) as image:
+        image = ImageOps.exif_transpose(image)
+        image.load()
+    variants = resize_variants(image, name, spec["widths"], spec["formats"])
+    return publish_static(name, variants)
+
+
+def load_manifest():
+    try:
+        with open(MANIFEST_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def _save_manifest(manifest):
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    tmp_path = f"{MANIFEST_PATH}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, MANIFEST_PATH)
+
+
+def _is_fresh(entry, spec):
+    if not entry or entry.get("source") != spec["source"]:
+        return False
+    try:
+        if entry.get("source_signature") != _source_signature(spec["source"]):
+            return False
+    except FileNotFoundError:
+        return True  # sumber hilang: pakai varian lama jika ada
+    return all(
+        os.path.exists(v["path"])
+        and "static" in v
+        and os.path.exists(os.path.join(STATIC_DIR, v["static"]))
+        for v in entry.get("variants", [])
+    )
+
+
+def build(force=False, names=None, verbose=False):
+    """Bangun varian untuk aset yang sumbernya berubah; kembalikan manifest."""
+    global _manifest
+    with _lock:
+        manifest = dict(_manifest) if _manifest is not None else load_manifest()
+        changed = False
+        for name, spec in ASSETS.items():
+            if names and name not in names:
+                continue
+            if not os.path.exists(spec["source"]):
+                continue
+            if not force and _is_fresh(manifest.get(name), spec):
+                continue
+
+            manifest[name] = {
+                "source": spec["source"],
+                "source_signature": _source_signature(spec["source"]),
+                "source_bytes": os.path.getsize(spec["source"]),
+                "variants": _build_asset(name, spec),
+            }
+            changed = True
+            if verbose:
+                total = sum(v["bytes"] for v in manifest[name]["variants"])
+                print(
+                    f"- {name}: {manifest[name]['source_bytes']} -> "
+                    f"{total} byte ({len(manifest[name]['variants'])} varian)"
+                )
+
+        if changed:
+            _save_manifest(manifest)
+        _manifest = manifest
+        return manifest
+
+
+def ensure_built():
+    # Dipanggil saat start: murah jika semua aset masih segar
+    try:
+        return build()
+    except OSError:
+        return load_manifest()
+
+
+def save_banner(uploaded, path=BANNER_PATH):
+    """Proses unggahan banner: batasi dimensi, buang EXIF, kompres ulang.
+
+    File ditulis ke file sementara lalu di-rename (atomik), sehingga pembaca
+    tidak pernah melihat banner setengah tertulis. Varian responsif dibangun
+    ulang sekali di sini; kembalikan entri manifest banner.
+    """
+    from PIL import Image, ImageOps
+
+    with Image.open(uploaded) as image:
+        image = ImageOps.exif_transpose(image)
+        image.load()
+    image.thumbnail(BANNER_MAX_SIZE, Image.Resampling.LANCZOS)
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    # tanpa argumen exif=: metadata (GPS, kamera) tidak ikut tersimpan
+    _prepare(image, "jpeg").save(tmp_path, **SAVE_OPTIONS["jpeg"])
+    os.replace(tmp_path, path)
+
+    return build(force=True, names=["banner"]).get("banner")
+
+
+def _variant(name, fmt, width):
+    manifest = _manifest if _manifest is not None else load_manifest()
+    entry = manifest.get(name)
+    if not entry:
+        return None
+    candidates = [v for v in entry["variants"] if v["format"] == fmt]
+    if width is not None:
+        fitting = [v for v in candidates if v["width"] >= width]
+        candidates = sorted(fitting or candidates, key=lambda v: v["width"])
+    else:
+        candidates = sorted(candidates, key=lambda v: -v["width"])
+    for variant in candidates[:1]:
+        if os.path.exists(variant["path"]):
+            return variant
+    return None
+
+
+def asset_path(name, fmt="webp", width=None):
+    """Path varian teroptimasi terbaik untuk `name`; fallback ke file sumber."""
+    variant = _variant(name, fmt, width)
+    return variant["path"] if variant else ASSETS[name]["source"]
+
+
+@functools.lru_cache(maxsize=32)
+@timing.timed("gambar:base64")
+def _encode(path, mtime_ns, size):
+    with open(path, "rb") as f:
+        payload = base64.b64encode(f.read()).decode()
+    mime = MIME_TYPES.get(os.path.splitext(path)[1].lower(), "image/png")
+    return f"data:{mime};base64,{payload}"
+
+
+def data_uri(path):
+    """Data URI base64 untuk `path`, di-memo per (mtime, ukuran) file."""
+    stat = os.stat(path)
+    return _encode(path, stat.st_mtime_ns, stat.st_size)
+
+
+def _static_serving():
+    import streamlit as st
+
+    return bool(st.get_option("server.enableStaticServing"))
+
+
+def image_src(name, fmt="webp", width=None):
+    """Nilai `src` untuk <img>: URL statis ber-hash, atau data URI sebagai cadangan."""
+    variant = _variant(name, fmt, width)
+    if variant and variant.get("static") and _static_serving():
+        if os.path.exists(os.path.join(STATIC_DIR, variant["static"])):
+            return f"{STATIC_URL}/{variant['static']}?v={variant['hash']}"
+    return data_uri(asset_path(name, fmt, width))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Bangun varian gambar teroptimasi di data/optimized/."
+    )
+    parser.add_argument("--force", action="store_true", help="bangun ulang semua aset")
+    parser.add_argument("names", nargs="*", help="nama aset tertentu (default: semua)")
+    args = parser.parse_args()
+
+    build(force=args.force, names=args.names or None, verbose=True)
+    print(f"Manifest: {MANIFEST_PATH}")
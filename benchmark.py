@@ -0,0 +1,431 @@
+import argparse
+import json
+import os
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import data_store
+
+# ===========================================================
+# ========== BENCHMARK LATENSI DASHBOARD ====================
+# ===========================================================
+# Mengukur setiap halaman publik dan setiap menu per kategori user
+# (page_registry) dengan Streamlit AppTest di atas data sintetis
+# (synth_data.py) berbagai ukuran:
+#   - first_ms       : rerun pertama halaman di sesi baru
+#   - warm_p50_ms    : median rerun berikutnya (cache sudah terisi)
+#   - first_peak_mem_mb : puncak alokasi Python rerun pertama (tracemalloc),
+#                         diukur di sesi baru setelah cache proses dikosongkan
+#   - warm_peak_mem_mb  : puncak alokasi Python satu rerun hangat
+#   - maxrss_mb      : RSS maksimum proses sejauh ini
+#   - msg_bytes      : ukuran ForwardMsg yang dikirim ke browser per rerun
+#   - media_bytes    : gambar/file yang disimpan ke media manager per rerun
+# Gambar yang dilayani dari /app/static tidak ikut dihitung (dikirim
+# terpisah oleh server statis).
+#
+#     python benchmark.py run --rows 10000 100000 --out bench_results.jsonl
+#     python benchmark.py compare lama.jsonl baru.jsonl --threshold 0.2
+#
+# Setiap ukuran dijalankan di salinan aplikasi (folder sementara) dan di
+# proses terpisah, sehingga data/ asli tidak tersentuh dan cache satu
+# ukuran tidak terbawa ke ukuran berikutnya. Hasil ditambahkan ke file
+# JSONL (satu rekaman per halaman) bertanda versi git & waktu, sehingga
+# hasil sebelum/sesudah optimasi bisa dibandingkan dengan `compare`.
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+PUBLIC_ROLE = "Publik"
+ROLES = ["Admin", "Developer", "Nakes", "PT", "Pemerintah"]
+STORAGES = ["csv", "partisi", "sqlite"]
+
+# Metrik yang dibandingkan oleh `compare` (nilai lebih besar = lebih buruk)
+COMPARED = [
+    "first_ms",
+    "warm_p50_ms",
+    "first_peak_mem_mb",
+    "warm_peak_mem_mb",
+    "msg_bytes",
+    "media_bytes",
+]
+
+# Berkas turunan yang dibangun ulang dari data (jangan terbawa dari data contoh)
+DERIVED_FILES = [
+    "rollup_diagnosa.json",
+    "rollup_diagnosa.log",
+    "nik_index.json",
+    "nik_index.log",
+    "laporan_status.json",
+    "laporan_status.log",
+    "laporan_migrasi.json",
+    "sipetualang.db",
+    "sipetualang.db-wal",
+    "sipetualang.db-shm",
+]
+PARTITIONED_TABLES = ["diagnosa_masyarakat", "data_pasien_nakes"]
+
+
+# ===========================================================
+# ========== PENGHITUNG BYTE ================================
+# ===========================================================
+_sent = {"msg": 0, "media": 0}
+
+
+def _install_counters():
+    from streamlit.runtime.forward_msg_queue import ForwardMsgQueue
+    from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+
+    enqueue = ForwardMsgQueue.enqueue
+    load_and_get_id = MemoryMediaFileStorage.load_and_get_id
+
+    def counted_enqueue(self, msg):
+        _sent["msg"] += msg.ByteSize()
+        return enqueue(self, msg)
+
+    def counted_load(self, path_or_data, *args, **kwargs):
+        if isinstance(path_or_data, (bytes, bytearray)):
+            _sent["media"] += len(path_or_data)
+        elif isinstance(path_or_data, str) and os.path.exists(path_or_data):
+            _sent["media"] += os.path.getsize(path_or_data)
+        return load_and_get_id(self, path_or_data, *args, **kwargs)
+
+    ForwardMsgQueue.enqueue = counted_enqueue
+    MemoryMediaFileStorage.load_and_get_id = counted_load
+
+
+def _reset_counters():
+    _sent.update(msg=0, media=0)
+
+
+# ===========================================================
+# ========== PENGUKURAN (DI PROSES WORKER) ==================
+# ===========================================================
+def _app(role, timeout):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file("app.py", default_timeout=timeout)
+    if role != PUBLIC_ROLE:
+        at.session_state["logged_in"] = True
+        at.session_state["kategori"] = role
+        at.session_state["username"] = role
+        at.session_state["nama"] = role
+    return at
+
+
+def _timed_run(at):
+    _reset_counters()
+    t0 = time.perf_counter()
+    at.run()
+    ms = (time.perf_counter() - t0) * 1000
+    return ms, len(at.exception), dict(_sent)
+
+
+def _traced_run(at):
+    # tracemalloc memperlambat rerun, jadi tidak dipakai di rerun yang diukur waktunya
+    tracemalloc.start()
+    try:
+        at.run()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _drop_caches():
+    """Kosongkan cache tabel, grafik & unduhan agar rerun berikutnya dingin."""
+    import charts
+    import exports
+
+    data_store.invalidate()
+    charts._cache.clear()
+    exports._cache.clear()
+
+
+def _open(role, script, timeout):
+    at = _app(role, timeout)
+    at.switch_page(script)
+    return at
+
+
+def measure_page(role, script, repeat, timeout):
+    """Metrik satu halaman: rerun pertama, `repeat` rerun hangat, memori."""
+    at = _open(role, script, timeout)
+    first_ms, exceptions, _ = _timed_run(at)
+
+    warm, sent = [], {"msg": 0, "media": 0}
+    for _ in range(repeat):
+        ms, errors, sent = _timed_run(at)
+        warm.append(ms)
+        exceptions = max(exceptions, errors)
+
+    warm_peak = _traced_run(at)
+    # Rerun dingin kedua (sesi baru, cache kosong) khusus untuk memori
+    _drop_caches()
+    first_peak = _traced_run(_open(role, script, timeout))
+
+    return {
+        "first_ms": round(first_ms, 1),
+        "warm_p50_ms": round(statistics.median(warm), 1) if warm else None,
+        "warm_max_ms": round(max(warm), 1) if warm else None,
+        "repeat": repeat,
+        "first_peak_mem_mb": round(first_peak / 2**20, 2),
+        "warm_peak_mem_mb": round(warm_peak / 2**20, 2),
+        # ru_maxrss dalam KB di Linux
+        "maxrss_mb": round(
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1
+        ),
+        "msg_bytes": sent["msg"],
+        "media_bytes": sent["media"],
+        "exceptions": exceptions,
+    }
+
+
+def pages():
+    """(kategori, judul, skrip) untuk halaman publik & menu tiap kategori."""
+    import page_registry
+
+    out = [
+        (PUBLIC_ROLE, title, script)
+        for title, (script, _) in page_registry.PUBLIC_PAGES.items()
+    ]
+    for role in ROLES:
+        out += [
+            (role, title, page_registry.PAGES[title][0])
+            for title in page_registry.allowed_menu(role)
+        ]
+    return [
+        (role, title, os.path.join(page_registry.VIEWS_DIR, script))
+        for role, title, script in out
+    ]
+
+
+def worker(args):
+    """Jalankan semua halaman di folder aplikasi saat ini; tambah ke args.out."""
+    sys.path.insert(0, os.getcwd())
+    if args.storage == "partisi":
+        import partitions
+
+        for name in PARTITIONED_TABLES:
+            partitions.migrate(name)
+    elif args.storage == "sqlite":
+        import sqlite_store
+
+        sqlite_store.migrate()
+
+    base = {
+        "version": os.environ.get("SIPETUALANG_BENCH_VERSION", "unknown"),
+        "label": args.label,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "rows": args.rows,
+        "storage": args.storage,
+        "warmup": args.warmup,
+    }
+    records = []
+    if args.warmup:
+        import warmup
+
+        t0 = time.perf_counter()
+        warmup.run()
+        records.append(
+            dict(
+                base,
+                role="-",
+                page="warmup",
+                first_ms=round((time.perf_counter() - t0) * 1000, 1),
+            )
+        )
+
+    _install_counters()
+    for role, title, script in pages():
+        try:
+            metrics = measure_page(role, script, args.repeat, args.timeout)
+        except Exception as exc:  # timeout / error AppTest: catat & lanjut
+            metrics = {"error": f"{type(exc).__name__}: {exc}"}
+        record = dict(base, role=role, page=title, **metrics)
+        records.append(record)
+        print(
+            f"  {role:<11} {title:<32} "
+            + (
+                f"{metrics['first_ms']:>9.1f} ms  p50 {metrics['warm_p50_ms']} ms"
+                if "error" not in metrics
+                else metrics["error"]
+            ),
+            flush=True,
+        )
+
+    with open(args.out, "a", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+# ===========================================================
+# ========== ORKESTRASI (PROSES INDUK) ======================
+# ===========================================================
+def _git_version():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _prepare_copy(app_dir, rows, seed):
+    import synth_data
+
+    shutil.copytree(
+        ROOT,
+        app_dir,
+        ignore=shutil.ignore_patterns(".git", "__pycache__", "*.jsonl"),
+    )
+    data_dir = os.path.join(app_dir, data_store.DATA_DIR)
+    for name in DERIVED_FILES:
+        try:
+            os.remove(os.path.join(data_dir, name))
+        except FileNotFoundError:
+            pass
+    for name in PARTITIONED_TABLES:
+        shutil.rmtree(os.path.join(data_dir, name), ignore_errors=True)
+    synth_data.generate(
+        data_dir, rows, seed=seed, source_dir=os.path.join(ROOT, data_store.DATA_DIR)
+    )
+
+
+def run(args):
+    out = os.path.abspath(args.out)
+    env = dict(
+        os.environ,
+        SIPETUALANG_BENCH_VERSION=_git_version(),
+        SIPETUALANG_STORAGE="sqlite" if args.storage == "sqlite" else "csv",
+    )
+    status = 0
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory(prefix="sipetualang-bench-") as work:
+            app_dir = os.path.join(work, "app")
+            t0 = time.perf_counter()
+            _prepare_copy(app_dir, rows, args.seed)
+            print(
+                f"== {rows} baris ({args.storage}), data siap dalam "
+                f"{time.perf_counter() - t0:.1f} detik",
+                flush=True,
+            )
+            cmd = [
+                sys.executable,
+                os.path.join(app_dir, "benchmark.py"),
+                "_worker",
+                "--rows",
+                str(rows),
+                "--out",
+                out,
+                "--repeat",
+                str(args.repeat),
+                "--timeout",
+                str(args.timeout),
+                "--storage",
+                args.storage,
+                "--label",
+                args.label,
+            ]
+            if args.warmup:
+                cmd.append("--warmup")
+            status = subprocess.run(cmd, cwd=app_dir, env=env).returncode or status
+    print(f"Hasil ditambahkan ke {out}")
+    return status
+
+
+# ===========================================================
+# ========== PERBANDINGAN HASIL =============================
+# ===========================================================
+def load_results(path):
+    """Rekaman terbaru per (rows, storage, role, page) dari file JSONL."""
+    latest = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            key = (
+                record["rows"],
+                record.get("storage", "csv"),
+                record["role"],
+                record["page"],
+            )
+            if key not in latest or record["timestamp"] >= latest[key]["timestamp"]:
+                latest[key] = record
+    return latest
+
+
+def compare(args):
+    """Tandai metrik yang naik lebih dari `threshold` (0.2 = 20%)."""
+    old, new = load_results(args.old), load_results(args.new)
+    regressions = 0
+    for key in sorted(set(old) & set(new), key=str):
+        rows, storage, role, page = key
+        for metric in COMPARED:
+            before, after = old[key].get(metric), new[key].get(metric)
+            if not before or after is None:
+                continue
+            change = after / before - 1
+            if change > args.threshold:
+                regressions += 1
+                print(
+                    f"REGRESI {rows} {storage} {role}/{page} {metric}: "
+                    f"{before} -> {after} (+{change:.0%})"
+                )
+    for key in sorted(set(new) - set(old), key=str):
+        print(f"baru   {key}")
+    print(
+        f"{len(set(old) & set(new))} halaman dibandingkan, "
+        f"{regressions} regresi > {args.threshold:.0%}"
+    )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark latensi, memori & byte per halaman dashboard."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="jalankan benchmark")
+    run_parser.add_argument(
+        "--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000]
+    )
+    run_parser.add_argument("--out", default="bench_results.jsonl")
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument("--label", default="", help="catatan bebas, mis. 'sebelum'")
+
+    compare_parser = commands.add_parser("compare", help="bandingkan dua hasil")
+    compare_parser.add_argument("old")
+    compare_parser.add_argument("new")
+    compare_parser.add_argument("--threshold", type=float, default=0.2)
+
+    # Dipanggil oleh `run` di salinan aplikasi, bukan untuk dipakai langsung
+    worker_parser = commands.add_parser("_worker")
+    worker_parser.add_argument("--rows", type=int, required=True)
+    worker_parser.add_argument("--out", required=True)
+    worker_parser.add_argument("--label", default="")
+
+    for sub in (run_parser, worker_parser):
+        sub.add_argument("--repeat", type=int, default=5)
+        sub.add_argument("--timeout", type=float, default=120, help="detik per rerun")
+        sub.add_argument("--storage", choices=STORAGES, default="csv")
+        sub.add_argument(
+            "--warmup", action="store_true", help="jalankan warmup.run() dulu"
+        )
+
+    args = parser.parse_args()
+    if args.command == "run":
+        sys.exit(run(args))
+    elif args.command == "compare":
+        sys.exit(compare(args))
+    else:
+        worker(args)
@@ -0,0 +1,137 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from io import BytesIO
+
+import timing
+
+# ===========================================================
+# ========== LAYANAN RENDER GRAFIK ==========================
+# ===========================================================
+# Grafik digambar dengan objek Figure langsung (bukan pyplot), sehingga
+# tidak ada figure yang tertinggal di registry pyplot. Hasilnya berupa
+# bytes PNG/SVG, di-cache LRU dengan kunci hash data + jenis grafik;
+# pengunjung dengan filter yang sama memakai render yang sama.
+# matplotlib baru diimpor saat render pertama (bukan saat modul diimpor),
+# sehingga cache hit tidak pernah memuatnya.
+
+CACHE_SIZE = int(os.environ.get("SIPETUALANG_CHART_CACHE", "128"))
+
+_cache = OrderedDict()  # hash -> bytes
+_lock = threading.Lock()
+
+
+def _cache_key(kind, payload, options):
+    return hashlib.sha1(repr((kind, payload, options)).encode("utf-8")).hexdigest()
+
+
+def _render(kind, payload, options, draw):
+    key = _cache_key(kind, payload, options)
+    with _lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+
+    from matplotlib.figure import Figure
+
+    # hanya render sungguhan (cache miss) yang dicatat
+    with timing.section(f"grafik:{kind}") as span:
+        fig = Figure(figsize=options.get("figsize"))
+        try:
+            ax = fig.subplots()
+            draw(fig, ax)
+            buf = BytesIO()
+            fmt = options.get("fmt", "png")
+            fig.savefig(buf, format=fmt, bbox_inches="tight")
+        finally:
+            fig.clear()
+        data = buf.getvalue()
+        span.nbytes = len(data)
+    if options.get("fmt") == "svg":
+        data = data.decode("utf-8")
+
+    with _lock:
+        _cache[key] = data
+        _cache.move_to_end(key)
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return data
+
+
+def _as_list(values):
+    return [v.item() if hasattr(v, "item") else v for v in values]
+
+
+def bar_chart(
+    labels,
+    values,
+    title="",
+    xlabel="",
+    ylabel="",
+    figsize=None,
+    rotation=45,
+    grid=False,
+    fmt="png",
+):
+    """Bar chart vertikal; mengembalikan bytes PNG (atau string SVG)."""
+    labels, values = _as_list(labels), _as_list(values)
+    options = {
+        "title": title,
+        "xlabel": xlabel,
+        "ylabel": ylabel,
+        "figsize": figsize,
+        "rotation": rotation,
+        "grid": grid,
+        "fmt": fmt,
+    }
+
+    def draw(fig, ax):
+        ax.bar([str(label) for label in labels], values)
+        ax.tick_params(axis="x", labelrotation=rotation)
+        if rotation and rotation != 90:
+            for tick in ax.get_xticklabels():
+                tick.set_horizontalalignment("right")
+        ax.set_title(title)
+        ax.set_xlabel(xlabel)
+        ax.set_ylabel(ylabel)
+        if grid:
+            ax.grid(axis="y", linestyle="--", alpha=0.4)
+
+    return _render("bar", (labels, values), options, draw)
+
+
+def pie_chart(labels, values, title="", figsize=None, fmt="png"):
+    labels, values = _as_list(labels), _as_list(values)
+    options = {"title": title, "figsize": figsize, "fmt": fmt}
+
+    def draw(fig, ax):
+        ax.pie(values, labels=[str(label) for label in labels], autopct="%1.1f%%")
+        ax.set_title(title)
+
+    return _render("pie", (labels, values), options, draw)
+
+
+def line_chart(frame, xlabel="", ylabel="", figsize=None, grid=False, fmt="png"):
+    """Satu garis per kolom `frame`, sumbu x = index frame."""
+    payload = (
+        _as_list(frame.index),
+        _as_list(frame.columns),
+        frame.to_numpy().tolist(),
+    )
+    options = {
+        "xlabel": xlabel,
+        "ylabel": ylabel,
+        "figsize": figsize,
+        "grid": grid,
+        "fmt": fmt,
+    }
+
+    def draw(fig, ax):
+        frame.plot(ax=ax)
+        ax.set_xlabel(xlabel)
+        ax.set_ylabel(ylabel)
+        if grid:
+            ax.grid(axis="y", linestyle="--", alpha=0.4)
+
+    return _render("line", payload, options, draw)
@@ -0,0 +1,81 @@
+import html
+import os
+
+import streamlit as st
+
+import data_store
+
+# ===========================================================
+# ========== FEED KOMENTAR PENGUNJUNG =======================
+# ===========================================================
+# Komentar ditampilkan terbaru dulu, per halaman, dalam SATU blok HTML.
+# Kursor (nomor baris komentar tertua yang tampil) disimpan di session
+# state; "Muat lebih banyak" menggeser kursor satu halaman ke belakang.
+# Baris dibaca lewat data_store.read_rows (indeks offset baris), sehingga
+# biaya halaman pertama tetap sama berapa pun jumlah komentar.
+
+TABLE = "komentar_pengunjung"
+PAGE_SIZE = int(os.environ.get("SIPETUALANG_COMMENT_PAGE", "10"))
+
+BUBBLE_HTML = """
+<div style="
+    background-color:#dcf8c6;
+    padding:10px 15px;
+    margin-bottom:10px;
+    border-radius:15px;
+    max-width:100%;
+    box-shadow:0 2px 4px rgba(0,0,0,0.1);
+">
+    <strong style="color:#075e54;">{nama}</strong><br>
+    <span style="font-size:15px;">{isi}</span><br>
+    <span style="font-size:11px; color:#555; float:right;">{waktu}</span>
+</div>
+"""
+
+
+def _text(value):
+    if value is None or value != value:  # None / NaN / NaT
+        return ""
+    if hasattr(value, "strftime"):
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    return html.escape(str(value))
+
+
+def render_comments(df):
+    """HTML satu blok untuk baris komentar `df` (urutan terbaru dulu)."""
+    bubbles = [
+        BUBBLE_HTML.format(
+            nama=_text(row.get("Nama")),
+            isi=_text(row.get("Komentar")),
+            waktu=_text(row.get("Waktu")),
+        )
+        for row in df.iloc[::-1].to_dict("records")
+    ]
+    return "".join(bubbles)
+
+
+def _load_more(key, page_size):
+    st.session_state[key] = max(st.session_state[key] - page_size, 0)
+
+
+def show_comment_feed(page_size=PAGE_SIZE, key="komentar_cursor"):
+    total = data_store.row_count(TABLE)
+    if total == 0:
+        st.info("Belum ada komentar yang masuk.")
+        return
+
+    # kursor = nomor baris komentar tertua yang ditampilkan
+    if key not in st.session_state:
+        st.session_state[key] = max(total - page_size, 0)
+    cursor = min(st.session_state[key], total)
+
+    df = data_store.read_rows(TABLE, cursor, total)
+    st.markdown(render_comments(df), unsafe_allow_html=True)
+
+    if cursor > 0:
+        st.button(
+            f"⬇️ Muat {min(page_size, cursor)} komentar sebelumnya",
+            key=f"{key}_more",
+            on_click=_load_more,
+            args=(key, page_size),
+        )
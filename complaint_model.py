@@ -0,0 +1,261 @@
+import argparse
+import os
+import re
+import threading
+
+import numpy as np
+import pandas as pd
+
+import data_store
+
+# ===========================================================
+# ========== MODEL KELUHAN -> DIAGNOSA (NAIVE BAYES) ========
+# ===========================================================
+# Multinomial naive Bayes atas n-gram karakter dari pasangan Keluhan/
+# Diagnosa yang sudah dikonfirmasi nakes (data_pasien_nakes). Dilatih
+# offline lalu disimpan ke data/model_keluhan.npz; aplikasi memuatnya
+# sekali per proses (dimuat ulang hanya jika file model berubah).
+#
+#     python complaint_model.py train             # latih & simpan model
+#     python complaint_model.py score [--output]  # skor riwayat masyarakat
+
+MODEL_PATH = os.path.join(data_store.DATA_DIR, "model_keluhan.npz")
+TRAIN_TABLE = "data_pasien_nakes"
+HISTORY_TABLE = "diagnosa_masyarakat"
+NGRAM_RANGE = (2, 4)
+ALPHA = 0.5
+BATCH_SIZE = 2048  # jumlah teks unik per matriks skor pada mode batch
+# Keyakinan (terkalibrasi) minimum agar prediksi model ditampilkan sebagai
+# saran di Cek Diagnosa Dini (env SIPETUALANG_MODEL_MIN_CONF). Diagnosa
+# yang disimpan tetap hasil aturan kata kunci (diagnosis_rules).
+MIN_CONFIDENCE = float(os.environ.get("SIPETUALANG_MODEL_MIN_CONF", "0.7"))
+
+_lock = threading.Lock()
+_loaded = None  # (signature file model, NaiveBayesModel)
+
+
+def _normalize(text):
+    if not isinstance(text, str):
+        return ""
+    return " ".join(re.sub(r"[^0-9a-z]+", " ", text.lower()).split())
+
+
+def char_ngrams(text, ngram_range=NGRAM_RANGE):
+    """N-gram karakter dari teks yang dinormalisasi (dengan batas kata)."""
+    padded = f" {_normalize(text)} "
+    if not padded.strip():
+        return []
+    low, high = ngram_range
+    return [
+        padded[i : i + n]
+        for n in range(low, high + 1)
+        for i in range(len(padded) - n + 1)
+    ]
+
+
+class NaiveBayesModel:
+    """Parameter model: kelas, vocab n-gram, log prior & log likelihood.
+
+    Keyakinan dikalibrasi dua cara: log likelihood dibagi jumlah ukuran
+    n-gram (setiap huruf ikut di beberapa n-gram yang saling tumpang
+    tindih, jadi buktinya terhitung berulang), lalu dikali porsi kata
+    keluhan yang pernah muncul di data latih. Keluhan dengan kata asing
+    ("sakit gigi") tidak lagi diprediksi dengan yakin.
+    """
+
+    def __init__(
+        self, classes, vocab, log_prior, feature_log_prob, ngram_range, words=None
+    ):
+        self.classes = np.asarray(classes, dtype=object)
+        self.vocab = list(vocab)
+        self.index = {gram: i for i, gram in enumerate(self.vocab)}
+        self.log_prior = np.asarray(log_prior, dtype=np.float32)
+        self.feature_log_prob = np.asarray(feature_log_prob, dtype=np.float32)
+        self.ngram_range = tuple(int(n) for n in ngram_range)
+        self.temperature = float(self.ngram_range[1] - self.ngram_range[0] + 1)
+        # kata keluhan di data latih (None = model lama, tanpa cek kata)
+        self.words = None if words is None else frozenset(words)
+
+    # --- fitur ---
+    def _features(self, text):
+        idx = [
+            self.index[g]
+            for g in char_ngrams(text, self.ngram_range)
+            if g in self.index
+        ]
+        return np.unique(np.asarray(idx, dtype=np.int64), return_counts=True)
+
+    def _count_matrix(self, texts):
+        counts = np.zeros((len(texts), len(self.vocab)), dtype=np.float32)
+        for row, text in enumerate(texts):
+            idx, n = self._features(text)
+            counts[row, idx] = n
+        return counts
+
+    def _proba(self, loglik):
+        joint = self.log_prior + loglik / self.temperature
+        joint = joint - joint.max(axis=1, keepdims=True)
+        proba = np.exp(joint)
+        return proba / proba.sum(axis=1, keepdims=True)
+
+    def coverage(self, text):
+        """Porsi kata keluhan yang dikenal model (0..1)."""
+        words = _normalize(text).split()
+        if self.words is None or not words:
+            return 1.0 if words else 0.0
+        return sum(w in self.words for w in words) / len(words)
+
+    # --- prediksi ---
+    def predict(self, text, k=3):
+        """Top-k [(diagnosa, keyakinan 0..1)] untuk satu keluhan."""
+        idx, n = self._features(text)
+        if len(idx) == 0:
+            return []
+        loglik = self.feature_log_prob[:, idx] @ n.astype(np.float32)
+        proba = self._proba(loglik[None, :])[0] * self.coverage(text)
+        top = np.argsort(-proba)[:k]
+        return [(self.classes[i], float(proba[i])) for i in top]
+
+    def predict_batch(self, texts, k=1):
+        """Top-k untuk Series keluhan: DataFrame kolom Prediksi_i/Keyakinan_i."""
+        texts = pd.Series(texts)
+        codes, uniques = pd.factorize(texts.map(_normalize))
+        labels = np.empty((len(uniques), k), dtype=object)
+        scores = np.zeros((len(uniques), k), dtype=np.float32)
+        for start in range(0, len(uniques), BATCH_SIZE):
+            chunk = list(uniques[start : start + BATCH_SIZE])
+            counts = self._count_matrix(chunk)
+            proba = self._proba(counts @ self.feature_log_prob.T)
+            proba *= np.array([self.coverage(t) for t in chunk])[:, None]
+            top = np.argsort(-proba, axis=1)[:, :k]
+            labels[start : start + len(chunk)] = self.classes[top]
+            scores[start : start + len(chunk)] = np.take_along_axis(proba, top, 1)
+            empty = counts.sum(axis=1) == 0
+            labels[start : start + len(chunk)][empty] = None
+            scores[start : start + len(chunk)][empty] = 0.0
+
+        out = {}
+        for i in range(k):
+            suffix = "" if k == 1 else f" {i + 1}"
+            col_labels = np.append(labels[:, i], None)  # kode -1 = keluhan kosong
+            col_scores = np.append(scores[:, i], 0.0)
+            out[f"Prediksi{suffix}"] = col_labels[codes]
+            out[f"Keyakinan{suffix}"] = col_scores[codes].round(4)
+        return pd.DataFrame(out, index=texts.index)
+
+    # --- simpan/muat ---
+    def save(self, path=MODEL_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez_compressed(
+            tmp_path,
+            classes=self.classes.astype(str),
+            vocab=np.asarray(self.vocab, dtype=str),
+            log_prior=self.log_prior,
+            feature_log_prob=self.feature_log_prob.astype(np.float16),
+            ngram_range=np.asarray(self.ngram_range),
+            words=np.asarray(sorted(self.words or []), dtype=str),
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=MODEL_PATH):
+        with np.load(path) as f:
+            return cls(
+                f["classes"].tolist(),
+                f["vocab"].tolist(),
+                f["log_prior"],
+                f["feature_log_prob"].astype(np.float32),
+                f["ngram_range"].tolist(),
+                f["words"].tolist() if "words" in f.files else None,
+            )
+
+
+def train(keluhan, diagnosa, ngram_range=NGRAM_RANGE, alpha=ALPHA):
+    """Latih model dari dua Series sejajar (keluhan, diagnosa)."""
+    pairs = pd.DataFrame({"keluhan": keluhan, "diagnosa": diagnosa}).dropna()
+    pairs = pairs[pairs["keluhan"].map(_normalize) != ""]
+    docs = [char_ngrams(text, ngram_range) for text in pairs["keluhan"]]
+
+    vocab = sorted({gram for grams in docs for gram in grams})
+    index = {gram: i for i, gram in enumerate(vocab)}
+    class_codes, classes = pd.factorize(pairs["diagnosa"].astype(str), sort=True)
+
+    # hitungan n-gram per kelas: (kelas x vocab)
+    class_counts = np.zeros((len(classes), len(vocab)), dtype=np.float64)
+    for code, grams in zip(class_codes, docs):
+        np.add.at(class_counts[code], [index[g] for g in grams], 1)
+
+    smoothed = class_counts + alpha
+    feature_log_prob = np.log(smoothed / smoothed.sum(axis=1, keepdims=True))
+    log_prior = np.log(np.bincount(class_codes) / len(class_codes))
+    words = {w for text in pairs["keluhan"] for w in _normalize(text).split()}
+    return NaiveBayesModel(
+        classes, vocab, log_prior, feature_log_prob, ngram_range, words=words
+    )
+
+
+def train_from_store(path=MODEL_PATH):
+    df = data_store.read_table(TRAIN_TABLE)
+    model = train(df["Keluhan"], df["Diagnosa"].astype(object))
+    model.save(path)
+    return model
+
+
+def load_model(path=MODEL_PATH):
+    """Model dari file (di-cache per proses); None jika belum dilatih."""
+    global _loaded
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    sig = (stat.st_mtime_ns, stat.st_size)
+    with _lock:
+        if _loaded is None or _loaded[0] != sig:
+            _loaded = (sig, NaiveBayesModel.load(path))
+        return _loaded[1]
+
+
+def predict(keluhan, k=3):
+    model = load_model()
+    return model.predict(keluhan, k=k) if model is not None else []
+
+
+def score_history(k=1):
+    """Prediksi model untuk seluruh riwayat diagnosa_masyarakat (mode batch)."""
+    model = load_model()
+    df = data_store.read_table(HISTORY_TABLE)
+    if model is None or df.empty or "Keluhan" not in df.columns:
+        return pd.DataFrame()
+    return pd.concat([df, model.predict_batch(df["Keluhan"], k=k)], axis=1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Latih / jalankan model keluhan -> diagnosa."
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("train", help="latih dari data_pasien_nakes dan simpan model")
+    score = sub.add_parser("score", help="skor seluruh riwayat diagnosa_masyarakat")
+    score.add_argument("-k", type=int, default=1, help="jumlah prediksi per baris")
+    score.add_argument("--output", help="simpan hasil ke CSV ini")
+    args = parser.parse_args()
+
+    if args.command == "train":
+        model = train_from_store()
+        print(
+            f"Model disimpan: {MODEL_PATH} ({len(model.classes)} kelas, "
+            f"{len(model.vocab)} n-gram, {os.path.getsize(MODEL_PATH)} byte)"
+        )
+    else:
+        scored = score_history(k=args.k)
+        if scored.empty:
+            print("Model belum dilatih atau riwayat kosong.")
+        elif args.output:
+            scored.to_csv(args.output, index=False)
+            print(f"{len(scored)} baris disimpan ke {args.output}")
+        else:
+            cols = [
+                c for c in scored.columns if c.startswith(("Prediksi", "Keyakinan"))
+            ]
+            print(scored[["Keluhan", "Diagnosa"] + cols].to_string())
@@ -1,9 +1,10 @@
 import streamlit as st
 import pandas as pd
-import os
 from datetime import datetime
-from io import BytesIO
-import matplotlib.pyplot as plt
+import charts
+import data_store
+import exports
+import timing
 
 
 def show_csr_tracker():
@@ -51,9 +52,7 @@ def show_csr_tracker():
     )
 
     # --- UTILITY: pastikan CSV ada (contoh struktur) ---
-    os.makedirs("data", exist_ok=True)
-    CSR_CSV = "data/csr_log.csv"
-    if not os.path.exists(CSR_CSV):
+    if not data_store.table_exists("csr_log"):
         sample = pd.DataFrame(
             [
                 {
@@ -85,151 +84,178 @@ def show_csr_tracker():
                 },
             ]
         )
-        sample.to_csv(CSR_CSV, index=False)
+        data_store.write_table("csr_log", sample)
 
-    # baca data CSR
-    df_csr = pd.read_csv(CSR_CSV, parse_dates=["tanggal"])
+    # Filter, grafik & tabel sebagai fragment: ganti filter tidak
+    # menjalankan ulang seluruh aplikasi
+    @st.fragment
+    def show_filtered_view():
+        # baca data CSR
+        df_csr = data_store.read_table("csr_log")
 
-    # === HEADER ===
-    st.markdown("# ⭐ CSR Tracker: Aktivitas Sosial Perusahaan")
-    st.markdown(
-        "Pantau riwayat, keaktifan, dan dampak program CSR dari PT di Lingkar Tambang."
-    )
-
-    # === FILTERS BAR ===
-    with st.expander("🔎 Filter & Pilihan Tampilan", expanded=False):
-        colf1, colf2, colf3, colf4 = st.columns([2, 2, 2, 1])
-        perusahaan_filter = colf1.multiselect(
-            "Perusahaan",
-            options=sorted(df_csr["perusahaan"].unique().tolist()),
-            default=sorted(df_csr["perusahaan"].unique().tolist()),
-        )
-        jenis_filter = colf2.multiselect(
-            "Jenis Kegiatan",
-            options=sorted(df_csr["jenis"].unique().tolist()),
-            default=sorted(df_csr["jenis"].unique().tolist()),
-        )
-        periode = colf3.date_input(
-            "Rentang Tanggal",
-            value=(df_csr["tanggal"].min().date(), df_csr["tanggal"].max().date()),
-        )
-        agg_by = colf4.selectbox(
-            "Grafik",
-            ["Bar Per Perusahaan", "Progress (%) per PT", "Tren Bulanan"],
-            index=0,
+        # === HEADER ===
+        st.markdown("# ⭐ CSR Tracker: Aktivitas Sosial Perusahaan")
+        st.markdown(
+            "Pantau riwayat, keaktifan, dan dampak program CSR dari PT di Lingkar Tambang."
         )
 
-    # apply filters
-    start_date, end_date = pd.to_datetime(periode[0]), pd.to_datetime(periode[1])  # type: ignore
-    df_view = df_csr[
-        (df_csr["perusahaan"].isin(perusahaan_filter))
-        & (df_csr["jenis"].isin(jenis_filter))
-        & (df_csr["tanggal"] >= start_date)
-        & (df_csr["tanggal"] <= end_date)
-    ].copy()
-
-    # === SUMMARY CARDS ===
-    total_kegiatan = len(df_view)
-    top_pt = (
-        df_view["perusahaan"].value_counts().idxmax() if total_kegiatan > 0 else "-"
-    )
-    total_penerima = int(df_view["penerima"].sum())
+        # === FILTERS BAR ===
+        with st.expander("🔎 Filter & Pilihan Tampilan", expanded=False):
+            colf1, colf2, colf3, colf4 = st.columns([2, 2, 2, 1])
+            perusahaan_filter = colf1.multiselect(
+                "Perusahaan",
+                options=sorted(df_csr["perusahaan"].unique().tolist()),
+                default=sorted(df_csr["perusahaan"].unique().tolist()),
+            )
+            jenis_filter = colf2.multiselect(
+                "Jenis Kegiatan",
+                options=sorted(df_csr["jenis"].unique().tolist()),
+                default=sorted(df_csr["jenis"].unique().tolist()),
+            )
+            periode = colf3.date_input(
+                "Rentang Tanggal",
+                value=(df_csr["tanggal"].min().date(), df_csr["tanggal"].max().date()),
+            )
+            agg_by = colf4.selectbox(
+                "Grafik",
+                ["Bar Per Perusahaan", "Progress (%) per PT", "Tren Bulanan"],
+                index=0,
+            )
 
-    st.markdown(
-        f"""
-        <div class="summary-row">
-            <div class="card">
-                <h3>{total_kegiatan}</h3>
-                <p>Total Kegiatan (terfilter)</p>
-            </div>
-            <div class="card">
-                <h3>{top_pt}</h3>
-                <p>PT Paling Aktif</p>
-            </div>
-            <div class="card">
-                <h3>{total_penerima}</h3>
-                <p>Total Penerima Manfaat</p>
+        # apply filters
+        start_date, end_date = pd.to_datetime(periode[0]), pd.to_datetime(periode[1])  # type: ignore
+        with timing.section("csr:filter", rows=len(df_csr)):
+            df_view = df_csr[
+                (df_csr["perusahaan"].isin(perusahaan_filter))
+                & (df_csr["jenis"].isin(jenis_filter))
+                & (df_csr["tanggal"] >= start_date)
+                & (df_csr["tanggal"] <= end_date)
+            ].copy()
+            # perusahaan bertipe categorical: buang kategori yang tidak terpilih
+            df_view["perusahaan"] = df_view["perusahaan"].cat.remove_unused_categories()
+
+        # jumlah kegiatan per PT: dihitung sekali, dipakai kartu & grafik
+        with timing.section("csr:value_counts", rows=len(df_view)):
+            cnt = df_view["perusahaan"].value_counts()
+
+        # === SUMMARY CARDS ===
+        total_kegiatan = len(df_view)
+        top_pt = cnt.idxmax() if total_kegiatan > 0 else "-"
+        total_penerima = int(df_view["penerima"].sum())
+
+        st.markdown(
+            f"""
+            <div class="summary-row">
+                <div class="card">
+                    <h3>{total_kegiatan}</h3>
+                    <p>Total Kegiatan (terfilter)</p>
+                </div>
+                <div class="card">
+                    <h3>{top_pt}</h3>
+                    <p>PT Paling Aktif</p>
+                </div>
+                <div class="card">
+                    <h3>{total_penerima}</h3>
+                    <p>Total Penerima Manfaat</p>
+                </div>
             </div>
-        </div>
-        """,
-        unsafe_allow_html=True,
-    )
+            """,
+            unsafe_allow_html=True,
+        )
 
-    # === GRAFIK BESIDE ===
-    col1, col2 = st.columns([1, 1])
+        # === GRAFIK BESIDE ===
+        col1, col2 = st.columns([1, 1])
 
-    # Grafik kiri: Bar per perusahaan
-    with col1:
-        st.subheader("Keaktifan Perusahaan")
-        if df_view.empty:
-            st.info("Tidak ada data sesuai filter.")
-        else:
-            cnt = df_view["perusahaan"].value_counts()
-            fig, ax = plt.subplots(figsize=(5, 3))
-            cnt.plot(kind="bar", ax=ax)
-            ax.set_ylabel("Jumlah Kegiatan")
-            ax.set_xlabel("")
-            ax.set_title("Jumlah Kegiatan per PT")
-            ax.grid(axis="y", linestyle="--", alpha=0.4)
-            st.pyplot(fig)
-
-    # Grafik kanan: Progress (%) vs target (contoh)
-    with col2:
-        st.subheader("Progress Target Tahunan (simulasi)")
-        # Buat target dummy per perusahaan (bisa disimpan di file lain)
-        targets = {
-            pt: 12 for pt in df_view["perusahaan"].unique()
-        }  # target 12 kegiatan/tahun default
-        progress_data = []
-        for pt, t in targets.items():
-            done = df_view[df_view["perusahaan"] == pt].shape[0]
-            pct = int(min(100, (done / t) * 100)) if t > 0 else 0
-            progress_data.append({"pt": pt, "done": done, "target": t, "pct": pct})
-
-        if len(progress_data) == 0:
-            st.info("Tidak ada perusahaan terpilih.")
-        else:
-            for p in progress_data:
-                st.markdown(f"**{p['pt']}** — {p['done']}/{p['target']} kegiatan")
-                st.progress(p["pct"] / 100.0)
-                st.markdown(
-                    f"<div class='muted'>{p['pct']}% dari target tahunan</div>",
-                    unsafe_allow_html=True,
+        # Grafik kiri: Bar per perusahaan
+        with col1:
+            st.subheader("Keaktifan Perusahaan")
+            if df_view.empty:
+                st.info("Tidak ada data sesuai filter.")
+            else:
+                st.image(
+                    charts.bar_chart(
+                        cnt.index,
+                        cnt.values,
+                        title="Jumlah Kegiatan per PT",
+                        ylabel="Jumlah Kegiatan",
+                        figsize=(5, 3),
+                        rotation=90,
+                        grid=True,
+                    ),
+                    use_container_width=True,
                 )
 
-    # === TIMELINE + DETAIL RIWAYAT ===
-    st.markdown("---")
-    st.subheader("Tabel Riwayat (Detail)")
-    st.dataframe(df_view.reset_index(drop=True), use_container_width=True)
-    # Download CSV filtered
-    csv_buffer = BytesIO()
-    df_view.to_csv(csv_buffer, index=False)
-    csv_buffer.seek(0)
-    st.download_button(
-        "📥 Unduh Riwayat (CSV)",
-        data=csv_buffer,
-        file_name="csr_riwayat_filtered.csv",
-        mime="text/csv",
-    )
+        # Grafik kanan: Progress (%) vs target (contoh)
+        with col2:
+            st.subheader("Progress Target Tahunan (simulasi)")
+            # Buat target dummy per perusahaan (bisa disimpan di file lain)
+            targets = {
+                pt: 12 for pt in df_view["perusahaan"].unique()
+            }  # target 12 kegiatan/tahun default
+            progress_data = []
+            for pt, t in targets.items():
+                done = df_view[df_view["perusahaan"] == pt].shape[0]
+                pct = int(min(100, (done / t) * 100)) if t > 0 else 0
+                progress_data.append({"pt": pt, "done": done, "target": t, "pct": pct})
 
-    # === OPTIONAL: Grafk tren bulanan bila dipilih ===
-    if agg_by == "Tren Bulanan" and not df_view.empty:
+            if len(progress_data) == 0:
+                st.info("Tidak ada perusahaan terpilih.")
+            else:
+                for p in progress_data:
+                    st.markdown(f"**{p['pt']}** — {p['done']}/{p['target']} kegiatan")
+                    st.progress(p["pct"] / 100.0)
+                    st.markdown(
+                        f"<div class='muted'>{p['pct']}% dari target tahunan</div>",
+                        unsafe_allow_html=True,
+                    )
+
+        # === TIMELINE + DETAIL RIWAYAT ===
         st.markdown("---")
-        st.subheader("Tren Bulanan Kegiatan (Grafik)")
-        df_view["bulan"] = df_view["tanggal"].dt.to_period("M").astype(str)
-        trend = df_view.groupby(["bulan", "perusahaan"]).size().unstack(fill_value=0)
-        fig2, ax2 = plt.subplots(figsize=(10, 3))
-        trend.plot(ax=ax2)
-        ax2.set_ylabel("Jumlah Kegiatan")
-        ax2.set_xlabel("")
-        ax2.grid(axis="y", linestyle="--", alpha=0.4)
-        st.pyplot(fig2)
-
-    # === FOOTER / INFO ===
-    st.markdown("---")
-    st.markdown(
-        f"<div style='text-align:right; color:#888; font-size:12px;'>Terakhir diperbarui: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</div>",
-        unsafe_allow_html=True,
-    )
+        st.subheader("Tabel Riwayat (Detail)")
+        st.dataframe(df_view.reset_index(drop=True), use_container_width=True)
+        # Download CSV filtered (dibuat saat diminta, di-cache per filter)
+        exports.download_on_demand(
+            label="📥 Unduh Riwayat (CSV)",
+            build=lambda: exports.frame_csv(
+                df_view, "csr_log", perusahaan_filter, jenis_filter, periode
+            ),
+            file_name="csr_riwayat_filtered.csv",
+            mime="text/csv",
+            key="unduh_csr",
+            prepare_label="⚙️ Siapkan Riwayat (CSV)",
+            signature=(
+                data_store.table_signature("csr_log"),
+                perusahaan_filter,
+                jenis_filter,
+                periode,
+            ),
+        )
+
+        # === OPTIONAL: Grafk tren bulanan bila dipilih ===
+        if agg_by == "Tren Bulanan" and not df_view.empty:
+            st.markdown("---")
+            st.subheader("Tren Bulanan Kegiatan (Grafik)")
+            with timing.section("csr:tren_bulanan", rows=len(df_view)):
+                df_view["bulan"] = df_view["tanggal"].dt.to_period("M").astype(str)
+                trend = (
+                    df_view.groupby(["bulan", "perusahaan"], observed=True)
+                    .size()
+                    .unstack(fill_value=0)
+                )
+            st.image(
+                charts.line_chart(
+                    trend, ylabel="Jumlah Kegiatan", figsize=(10, 3), grid=True
+                ),
+                use_container_width=True,
+            )
+
+        # === FOOTER / INFO ===
+        st.markdown("---")
+        st.markdown(
+            f"<div style='text-align:right; color:#888; font-size:12px;'>Terakhir diperbarui: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</div>",
+            unsafe_allow_html=True,
+        )
+
+    show_filtered_view()
 
     # --- END ---
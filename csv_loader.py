@@ -0,0 +1,265 @@
+import argparse
+import csv
+import gzip
+import os
+
+import pandas as pd
+
+import data_store
+import schema
+
+# ===========================================================
+# ========== LOADER CSV BERTAHAP + KARANTINA ================
+# ===========================================================
+# File CSV dibaca per potongan (CHUNK_ROWS baris) sebagai teks, lalu
+# setiap baris dicek terhadap schema.SCHEMAS:
+#   - record yang seluruhnya terbungkus kutip (kolom lain kosong, mis.
+#     '"2025-11-15 22:50:46,0,""..."",Diproses Pemerintah",,,') diurai ulang;
+#   - ID "0.0" -> 0, tanggal diubah ke datetime;
+#   - baris yang tidak bisa diperbaiki (kolom wajib kosong/tidak valid)
+#     dipindah ke data/quarantine/<tabel>.csv beserta alasannya
+#     (tabel berpartisi: data/quarantine/<tabel>.<YYYY-MM>.csv).
+# Index hasil = nomor record di file (0 = baris data pertama), sehingga
+# posisi tetap cocok dengan data_store.read_rows walau ada baris dibuang.
+#
+#     python csv_loader.py repair [tabel ...] [--dry-run]
+
+CHUNK_ROWS = int(os.environ.get("SIPETUALANG_CHUNK_ROWS", "50000"))
+QUARANTINE_DIR = os.path.join(data_store.DATA_DIR, "quarantine")
+REASON_COL = "_alasan"
+ROW_COL = "_baris"
+
+
+def unwrap_records(chunk):
+    """Urai ulang record utuh yang terbungkus kutip di kolom pertama."""
+    if chunk.empty or len(chunk.columns) < 2:
+        return chunk
+    first = chunk.columns[0]
+    rest = chunk.columns[1:]
+    wrapped = chunk[rest].isna().all(axis=1) & chunk[first].str.contains(
+        ",", regex=False, na=False
+    )
+    if not wrapped.any():
+        return chunk
+
+    chunk = chunk.copy()
+    for idx, text in chunk.loc[wrapped, first].items():
+        values = next(csv.reader([text]))
+        if len(values) == len(chunk.columns):
+            chunk.loc[idx] = [v if v != "" else None for v in values]
+    return chunk
+
+
+def validate_chunk(name, chunk):
+    """Perbaiki & validasi satu potongan teks; kembalikan (bersih, ditolak)."""
+    spec = schema.SCHEMAS.get(name, {})
+    chunk = unwrap_records(chunk)
+    reasons = pd.Series("", index=chunk.index)
+
+    def reject(mask, reason):
+        nonlocal reasons
+        reasons = reasons.where(~mask, reasons + reason + "; ")
+
+    required = spec.get("required", [])
+    for col in required:
+        if col in chunk.columns:
+            reject(chunk[col].isna(), f"{col} kosong")
+
+    for col in spec.get("int", []):
+        if col in chunk.columns:
+            numbers = pd.to_numeric(chunk[col], errors="coerce")
+            bad = chunk[col].notna() & (numbers.isna() | (numbers % 1 != 0))
+            reject(bad, f"{col} bukan bilangan bulat")
+
+    for col in spec.get("datetime", []):
+        if col in chunk.columns and col in required:
+            parsed = pd.to_datetime(chunk[col], errors="coerce", format="ISO8601")
+            reject(chunk[col].notna() & parsed.isna(), f"{col} bukan tanggal")
+
+    bad = reasons != ""
+    rejected = chunk[bad].copy()
+    rejected[REASON_COL] = reasons[bad].str.rstrip("; ")
+    return chunk[~bad], rejected
+
+
+def iter_chunks(path, name, chunksize=CHUNK_ROWS):
+    """(bersih, ditolak) per potongan; memori sebanding ukuran potongan.
+
+    File yang hanya berisi header menghasilkan satu potongan kosong
+    (kolom tetap ada).
+    """
+    start = 0
+    with pd.read_csv(path, dtype=str, chunksize=chunksize) as reader:
+        for chunk in reader:
+            chunk.index = pd.RangeIndex(start, start + len(chunk))
+            start += len(chunk)
+            yield validate_chunk(name, chunk)
+    if start == 0:
+        yield validate_chunk(name, pd.read_csv(path, dtype=str, nrows=0))
+
+
+def _write_quarantine(name, rejected, label=None):
+    # Digabung dengan isi lama & tidak pernah dipotong: setelah `repair`
+    # file ini menjadi satu-satunya salinan baris yang dibuang. Baris yang
+    # sama (nomor baris + isi) dari load berikutnya tidak ditulis dua kali.
+    if rejected.empty:
+        return
+    file_name = f"{name}.{label}.csv" if label else f"{name}.csv"
+    path = os.path.join(QUARANTINE_DIR, file_name)
+    os.makedirs(QUARANTINE_DIR, exist_ok=True)
+    out = rejected.astype(object).fillna("")
+    out.insert(0, ROW_COL, (out.index + 2).astype(str))  # nomor baris (header = 1)
+    if os.path.exists(path):
+        old = pd.read_csv(path, dtype=str, keep_default_na=False)
+        out = pd.concat([old, out], ignore_index=True).drop_duplicates()
+        if len(out) == len(old):
+            return
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    out.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+
+def load_counted(name, path=None, label=None):
+    """(DataFrame bertipe, jumlah record di file termasuk yang dikarantina)."""
+    path = path or data_store.table_path(name)
+    clean, rejected = [], []
+    records = 0
+    try:
+        for good, bad in iter_chunks(path, name):
+            clean.append(good)
+            records += len(good) + len(bad)
+            if not bad.empty:
+                rejected.append(bad)
+    except pd.errors.EmptyDataError:
+        return pd.DataFrame(), 0
+
+    try:
+        if rejected:
+            _write_quarantine(name, pd.concat(rejected), label=label)
+    except OSError:
+        pass  # karantina gagal ditulis tidak boleh menggagalkan halaman
+
+    df = pd.concat(clean) if len(clean) > 1 else clean[0]
+    return schema.normalize(name, schema.infer_numeric(df)), records
+
+
+def load(name, path=None, label=None):
+    """Baca seluruh tabel lewat loader bertahap; DataFrame bertipe (schema)."""
+    return load_counted(name, path, label=label)[0]
+
+
+def clean_rows(name, df):
+    """Versi tanpa karantina untuk potongan kecil (data_store.read_rows)."""
+    good, _ = validate_chunk(name, df)
+    return schema.normalize(name, schema.infer_numeric(good))
+
+
+def extend(name, df, raw):
+    """Sambungkan record baru (teks mentah) ke frame hasil load sebelumnya.
+
+    Dipakai pembaca tail-follow data_store: hanya record baru yang
+    divalidasi & diberi tipe. None jika tipe kolom lama tidak bisa
+    dipertahankan (pemanggil lalu membaca ulang penuh).
+    """
+    if df.empty or list(df.columns) != list(raw.columns):
+        return None
+    good, bad = validate_chunk(name, raw)
+    try:
+        _write_quarantine(name, bad)
+    except OSError:
+        pass
+
+    # kolom yang di frame lama numerik harus tetap numerik
+    good = good.copy()
+    for col in good.columns:
+        if pd.api.types.is_numeric_dtype(df[col]):
+            try:
+                good[col] = pd.to_numeric(good[col])
+            except (ValueError, TypeError):
+                return None
+    return schema.concat(df, schema.normalize(name, good))
+
+
+# ===========================================================
+# ========== CLI PERBAIKAN ==================================
+# ===========================================================
+def _coerce_text(name, chunk):
+    # ID ditulis sebagai bilangan bulat ("0.0" -> "0")
+    for col in schema.SCHEMAS.get(name, {}).get("int", []):
+        if col in chunk.columns:
+            numbers = pd.to_numeric(chunk[col], errors="coerce")
+            chunk[col] = numbers.astype("Int64").astype("string")
+    return chunk
+
+
+def repair(name, dry_run=False):
+    """Tulis ulang file bersih secara atomik; baris rusak ke karantina.
+
+    Dibaca & ditulis per potongan (tabel berpartisi: per file partisi),
+    jadi memori tetap kecil untuk file jutaan baris. Mengembalikan
+    (jumlah baris bersih, jumlah dikarantina).
+    """
+    if data_store.is_partitioned(name):
+        import partitions
+
+        totals = [
+            _repair_file(name, path, dry_run, label=key)
+            for key, path in partitions.files(name).items()
+        ]
+        return sum(t[0] for t in totals), sum(t[1] for t in totals)
+
+    path = data_store.table_path(name)
+    if not os.path.exists(path):
+        return 0, 0
+    return _repair_file(name, path, dry_run)
+
+
+def _repair_file(name, path, dry_run, label=None):
+    stat = os.stat(path)
+    sig = (stat.st_mtime_ns, stat.st_size)
+    compressed = path.endswith(".gz")
+    opener = gzip.open if compressed else open
+    with opener(path, "rb") as f:
+        terminator = "\r\n" if f.readline().endswith(b"\r\n") else "\n"
+    tmp_path = f"{path}.{os.getpid()}.repair"
+    kept = quarantined = 0
+    rejected = []
+    header = True
+    with opener(tmp_path, "wt", encoding="utf-8", newline="") as out:
+        for good, bad in iter_chunks(path, name):
+            _coerce_text(name, good).to_csv(
+                out, index=False, header=header, lineterminator=terminator
+            )
+            header = False
+            kept += len(good)
+            quarantined += len(bad)
+            if not bad.empty:
+                rejected.append(bad)
+
+    if dry_run:
+        os.remove(tmp_path)
+        return kept, quarantined
+
+    if rejected:
+        _write_quarantine(name, pd.concat(rejected), label=label)
+    if not data_store.replace_table_file(
+        name, tmp_path, expected_signature=sig, path=path
+    ):
+        os.remove(tmp_path)
+        raise RuntimeError(f"{name} berubah selama perbaikan, coba lagi.")
+    return kept, quarantined
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Perbaiki file CSV di data/ dan pindahkan baris rusak ke karantina."
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+    cmd = sub.add_parser("repair", help="tulis ulang file yang sudah dibersihkan")
+    cmd.add_argument("tables", nargs="*", help="nama tabel (default: semua)")
+    cmd.add_argument("--dry-run", action="store_true", help="hanya laporkan")
+    args = parser.parse_args()
+
+    for table in args.tables or list(data_store.TABLES):
+        kept, quarantined = repair(table, dry_run=args.dry_run)
+        print(f"- {table}: {kept} baris bersih, {quarantined} dikarantina")
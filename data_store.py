@@ -0,0 +1,745 @@
+import csv
+import io
+import itertools
+import os
+import threading
+from contextlib import contextmanager
+
+import pandas as pd
+
+import schema
+import timing
+
+try:
+    import fcntl
+
+    def _lock_file(f):
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+
+    def _unlock_file(f):
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+except ImportError:  # Windows
+    import msvcrt
+
+    def _lock_file(f):
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+
+    def _unlock_file(f):
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+# ===========================================================
+# ========== DATA STORE: AKSES TERPUSAT KE CSV data/ ========
+# ===========================================================
+# Semua halaman membaca & menulis tabel lewat modul ini.
+# Hasil parse disimpan di cache proses (dipakai bersama oleh semua sesi),
+# dengan kunci path + mtime + ukuran file, sehingga rerun Streamlit tidak
+# mem-parse ulang CSV yang tidak berubah.
+
+DATA_DIR = "data"
+
+TABLES = {
+    "diagnosa_masyarakat": os.path.join(DATA_DIR, "diagnosa_masyarakat.csv"),
+    "data_pasien_nakes": os.path.join(DATA_DIR, "data_pasien_nakes.csv"),
+    "komentar_pengunjung": os.path.join(DATA_DIR, "komentar_pengunjung.csv"),
+    "laporan_nakes": os.path.join(DATA_DIR, "laporan_nakes.csv"),
+    "log_pemerintah": os.path.join(DATA_DIR, "log_pemerintah.csv"),
+    "log_pt": os.path.join(DATA_DIR, "log_pt.csv"),
+    "users": os.path.join(DATA_DIR, "users.csv"),
+    "csr_log": os.path.join(DATA_DIR, "csr_log.csv"),
+    "data_penyakit": os.path.join(DATA_DIR, "data_penyakit.csv"),
+    "aturan_diagnosa": os.path.join(DATA_DIR, "aturan_diagnosa.csv"),
+}
+
+# Urutan kolom tiap tabel (dipakai saat file/tabel baru dibuat)
+COLUMNS = {
+    "diagnosa_masyarakat": [
+        "Nama",
+        "NIK",
+        "Umur",
+        "Jenis Kelamin",
+        "Alamat",
+        "Keluhan",
+        "Diagnosa",
+        "Tanggal",
+    ],
+    "data_pasien_nakes": [
+        "Nama",
+        "NIK",
+        "Umur",
+        "Jenis Kelamin",
+        "Alamat",
+        "Keluhan",
+        "Diagnosa",
+        "Tanggal Input",
+    ],
+    "komentar_pengunjung": ["Nama", "Komentar", "Waktu"],
+    "laporan_nakes": [
+        "laporan_id",
+        "timestamp",
+        "desa",
+        "penyakit",
+        "jumlah_kasus",
+        "urgensi",
+        "uraian",
+        "status",
+    ],
+    "log_pemerintah": ["timestamp", "id_laporan", "feedback", "status_baru"],
+    "log_pt": ["timestamp", "id_laporan", "feedback", "status_baru"],
+    "users": ["username", "password", "nama", "kategori"],
+    "csr_log": [
+        "tanggal",
+        "perusahaan",
+        "jenis",
+        "kegiatan",
+        "penerima",
+        "status",
+        "catatan",
+    ],
+    "data_penyakit": ["Tahun", "Bulan", "Penyakit", "Jumlah Kasus"],
+    "aturan_diagnosa": ["prioritas", "diagnosa", "kata_kunci"],
+}
+
+# Tabel bervolume tinggi yang bisa dipartisi per bulan (kolom tanggal).
+# Aktif setelah `python partitions.py migrate` membuat folder data/<tabel>/.
+PARTITION_BY = {
+    "diagnosa_masyarakat": "Tanggal",
+    "data_pasien_nakes": "Tanggal Input",
+}
+
+# Backend penyimpanan: "csv" (default, file di data/) atau "sqlite".
+# Diatur lewat env SIPETUALANG_STORAGE / SIPETUALANG_SQLITE_PATH.
+STORAGE_BACKEND = os.environ.get("SIPETUALANG_STORAGE", "csv")
+SQLITE_PATH = os.environ.get(
+    "SIPETUALANG_SQLITE_PATH", os.path.join(DATA_DIR, "sipetualang.db")
+)
+
+# Kebijakan fsync untuk append: "always" (aman dari crash) atau "never"
+# (serahkan ke OS, lebih cepat). Bisa diatur lewat env SIPETUALANG_FSYNC.
+FSYNC_POLICY = os.environ.get("SIPETUALANG_FSYNC", "always")
+
+_cache = {}  # (nama tabel, ...) -> (signature, hasil)
+_lock = threading.RLock()
+_listeners = {}  # nama tabel -> [callback(rows, sig_sebelum, sig_sesudah)]
+# nama tabel -> {"sig", "offsets" (awal tiap record), "end", "in_quote",
+# "inode", "head" (baris header), "tail" (byte terakhir), "generation"}
+_row_index = {}
+_generations = itertools.count()
+# nama tabel -> (generation _row_index, jumlah record, DataFrame) untuk tail-follow
+_tails = {}
+_derived = {}  # (nama tabel, ...) -> (generation, jumlah record, hasil turunan)
+FINGERPRINT_BYTES = 64
+
+
+def _sqlite():
+    import sqlite_store
+
+    return sqlite_store
+
+
+def _loader():
+    import csv_loader
+
+    return csv_loader
+
+
+def _partitions():
+    import partitions
+
+    return partitions
+
+
+def _use_sqlite():
+    return STORAGE_BACKEND == "sqlite"
+
+
+def table_path(name):
+    return TABLES[name]
+
+
+def partition_dir(name):
+    return os.path.join(DATA_DIR, name)
+
+
+def is_partitioned(name):
+    """True jika tabel CSV ini sudah disimpan per bulan (lihat partitions.py)."""
+    return (
+        not _use_sqlite()
+        and name in PARTITION_BY
+        and os.path.isdir(partition_dir(name))
+    )
+
+
+def table_exists(name):
+    if _use_sqlite():
+        return _sqlite().table_exists(name)
+    return is_partitioned(name) or os.path.exists(TABLES[name])
+
+
+def table_mtime(name):
+    if _use_sqlite():
+        return os.path.getmtime(SQLITE_PATH)
+    if is_partitioned(name):
+        return max(
+            (sig[1] / 1e9 for sig in _partitions().signature(name)),
+            default=os.path.getmtime(partition_dir(name)),
+        )
+    return os.path.getmtime(TABLES[name])
+
+
+def _file_signature(path):
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def table_signature(name):
+    """(mtime, ukuran) sumber tabel; None jika belum ada. Kunci cache turunan.
+
+    SQLite: (inode db, versi tabel), jadi hanya berubah saat tabel ini ditulis.
+    """
+    if _use_sqlite():
+        return _sqlite().signature(name)
+    if is_partitioned(name):
+        return _partitions().signature(name)
+    try:
+        return _file_signature(TABLES[name])
+    except FileNotFoundError:
+        return None
+
+
+def _cached(key, sig, loader):
+    with _lock:
+        hit = _cache.get(key)
+        if hit is not None and hit[0] == sig:
+            return hit[1]
+
+    result = loader()
+
+    with _lock:
+        _cache[key] = (sig, result)
+    return result
+
+
+def read_table(name):
+    """Baca tabel sebagai DataFrame (dibagi antar sesi, jangan diubah in-place).
+
+    Kolom sudah bertipe sesuai schema.SCHEMAS (datetime, categorical, NIK
+    Int64). Jika file belum ada, kembalikan DataFrame kosong. CSV dibaca
+    bertahap lewat csv_loader: index = nomor record di file, baris rusak
+    yang tidak bisa diperbaiki dilewati (dicatat di data/quarantine/).
+    Setelah file bertambah, hanya record baru yang di-parse (tail-follow).
+    """
+    sig = table_signature(name)
+    if sig is None:
+        return pd.DataFrame()
+
+    if _use_sqlite():
+        return _cached(
+            (name,), sig, lambda: _loader().clean_rows(name, _sqlite().read_table(name))
+        )
+    if is_partitioned(name):
+        return _cached((name,), sig, lambda: _partitions().read(name))
+    return _cached((name,), sig, lambda: _read_csv(name))
+
+
+def read_raw(name):
+    """Tabel sebagai teks apa adanya (tanpa validasi/tipe, tidak di-cache).
+
+    Untuk menulis ulang tabel lewat write_table tanpa mengubah kolom lain:
+    NIK & tanggal yang tidak terbaca tetap tertulis seperti aslinya. Sel
+    kosong = NaN (seperti csv_loader), teks lain tidak diubah.
+    """
+    if table_signature(name) is None:
+        return pd.DataFrame()
+    if _use_sqlite():
+        return _sqlite().read_table(name)
+    if is_partitioned(name):
+        return _partitions().read_raw(name)
+    return pd.read_csv(TABLES[name], dtype=str, keep_default_na=False, na_values=[""])
+
+
+def period_keys(name, date_col):
+    """Kunci integer YYYYMM untuk setiap baris read_table(name) (di-cache)."""
+    sig = table_signature(name)
+    if sig is None:
+        return pd.Series(dtype="int32")
+    key = (name, "ym", date_col)
+    return _cached(
+        key,
+        sig,
+        lambda: _extend_derived(
+            key, name, read_table(name), lambda df: schema.period_keys(df, date_col)
+        ),
+    )
+
+
+def _extend_derived(key, name, df, compute):
+    # Turunan per baris dari read_table (mis. kunci YYYYMM): jika `df` hasil
+    # tail-follow, cukup dihitung untuk record baru lalu disambung
+    with _lock:
+        tail = _tails.get(name)
+        old = _derived.get(key)
+    if tail is None or tail[2] is not df:
+        return compute(df)
+
+    generation, records, _ = tail
+    if old is not None and old[0] == generation and old[1] <= records:
+        new = df.iloc[df.index.searchsorted(old[1]) :]
+        result = pd.concat([old[2], compute(new)]) if len(new) else old[2]
+    else:
+        result = compute(df)
+    with _lock:
+        _derived[key] = (generation, records, result)
+    return result
+
+
+def table_periods(name, date_col):
+    """Bulan "YYYY-MM" yang berisi data, urut naik.
+
+    Tabel berpartisi cukup dilihat dari nama file partisinya.
+    """
+    if is_partitioned(name) and PARTITION_BY[name] == date_col:
+        return [k for k in _partitions().files(name) if k != _partitions().NO_DATE]
+    if not table_exists(name):
+        return []
+    keys = sorted(set(period_keys(name, date_col).tolist()) - {0})
+    return [f"{k // 100:04d}-{k % 100:02d}" for k in keys]
+
+
+def invalidate(name=None):
+    with _lock:
+        if name is None:
+            _cache.clear()
+        else:
+            for key in [k for k in _cache if k[0] == name]:
+                del _cache[key]
+
+
+def subscribe(name, callback):
+    """Daftarkan callback(rows, sig_sebelum, sig_sesudah) untuk setiap tulis.
+
+    `rows` berisi baris yang di-append, atau None jika tabel ditulis ulang.
+    Dengan signature sebelum/sesudah, pendengar (mis. rollup) bisa tahu
+    apakah ada penulis lain di antaranya.
+    """
+    with _lock:
+        _listeners.setdefault(name, []).append(callback)
+
+
+def _notify(name, rows, before, after):
+    invalidate(name)
+    if rows is None:
+        # ditulis ulang: indeks offset & frame tail-follow tidak berlaku lagi
+        with _lock:
+            _row_index.pop(name, None)
+            _tails.pop(name, None)
+    for callback in list(_listeners.get(name, [])):
+        callback(rows, before, after)
+
+
+# ===========================================================
+# ========== QUERY TERFILTER ================================
+# ===========================================================
+def _period_bounds(year, month=None):
+    # Rentang string [awal, akhir) untuk kolom tanggal berformat YYYY-MM-DD...
+    if not month:
+        return f"{year}", f"{int(year) + 1:04d}"
+    if int(month) == 12:
+        return f"{year}-12", f"{int(year) + 1:04d}-01"
+    return f"{year}-{month}", f"{year}-{int(month) + 1:02d}"
+
+
+def select_period(name, date_col, year, month=None, umur=None):
+    """Baris dengan `date_col` pada tahun/bulan tertentu (opsional: kelompok umur).
+
+    Backend SQLite memakai indeks tanggal & umur, bukan scan penuh.
+    """
+    sig = table_signature(name)
+    if sig is None:
+        return pd.DataFrame()
+    start, end = _period_bounds(year, month)
+
+    def load():
+        if _use_sqlite():
+            return _loader().clean_rows(
+                name, _sqlite().select_range(name, date_col, start, end, umur=umur)
+            )
+        if is_partitioned(name) and PARTITION_BY[name] == date_col:
+            # hanya partisi bulan/tahun yang diminta yang dibuka
+            keys = _partitions().period_keys_for(year, month)
+            df = _partitions().read(name, keys)
+            if umur and "Umur" in df.columns:
+                return df[df["Umur"] == umur]
+            return df
+        df = read_table(name)
+        if date_col not in df.columns:
+            return df.iloc[0:0]
+        # perbandingan integer pada kunci YYYYMM, tanpa slicing string
+        keys = period_keys(name, date_col)
+        if month:
+            mask = keys == int(year) * 100 + int(month)
+        else:
+            mask = keys // 100 == int(year)
+        if umur and "Umur" in df.columns:
+            mask &= df["Umur"] == umur
+        return df[mask]
+
+    return _cached((name, "period", date_col, start, umur), sig, load)
+
+
+def select_where(name, column, value):
+    """Baris dengan `column == value` (indeks status pada backend SQLite)."""
+    sig = table_signature(name)
+    if sig is None:
+        return pd.DataFrame()
+
+    def load():
+        if _use_sqlite():
+            return _loader().clean_rows(
+                name, _sqlite().select_equals(name, column, value)
+            )
+        df = read_table(name)
+        if column not in df.columns:
+            return df.iloc[0:0]
+        return df[df[column] == value]
+
+    return _cached((name, "where", column, value), sig, load)
+
+
+# ===========================================================
+# ========== AKSES PER HALAMAN (INDEKS OFFSET BARIS) ========
+# ===========================================================
+def _scan_offsets(f, start, in_quote=False):
+    # Offset byte awal setiap record CSV mulai dari `start`. Field berkutip
+    # boleh berisi newline: record baru hanya dimulai di luar tanda kutip.
+    offsets = []
+    pos = start
+    f.seek(start)
+    for line in f:
+        if not in_quote and line.strip():
+            offsets.append(pos)
+        if line.count(b'"') % 2:
+            in_quote = not in_quote
+        pos += len(line)
+    return offsets, pos, in_quote
+
+
+def _fingerprint(f, end):
+    # Byte terakhir sebelum `end`: jika masih sama, isi lama dianggap utuh
+    f.seek(max(end - FINGERPRINT_BYTES, 0))
+    return f.read(min(end, FINGERPRINT_BYTES))
+
+
+def _only_appended(f, entry):
+    # File sama (inode), tidak menyusut, header & byte terakhir yang sudah
+    # dipindai tidak berubah -> cukup pindai byte sesudah entry["end"]
+    stat = os.fstat(f.fileno())
+    if stat.st_ino != entry["inode"] or stat.st_size < entry["end"]:
+        return False
+    f.seek(0)
+    if f.readline() != entry["head"]:
+        return False
+    return _fingerprint(f, entry["end"]) == entry["tail"]
+
+
+def _row_offsets(name):
+    # Indeks dibangun penuh sekali; sesudahnya hanya byte baru yang dipindai
+    # (append lewat append_rows maupun oleh proses lain). Pindai penuh lagi
+    # hanya jika file menyusut, diganti, atau header/isi lamanya berubah.
+    sig = table_signature(name)
+    with _lock:
+        entry = _row_index.get(name)
+    if entry is not None and entry["sig"] == sig:
+        return entry
+
+    with open(TABLES[name], "rb") as f:
+        if entry is not None and _only_appended(f, entry):
+            offsets, end, in_quote = _scan_offsets(f, entry["end"], entry["in_quote"])
+            entry = dict(
+                entry,
+                sig=sig,
+                offsets=entry["offsets"] + offsets,
+                end=end,
+                in_quote=in_quote,
+                tail=_fingerprint(f, end),
+            )
+        else:
+            f.seek(0)
+            head = f.readline()
+            offsets, end, in_quote = _scan_offsets(f, len(head))
+            entry = {
+                "sig": sig,
+                "offsets": offsets,
+                "end": end,
+                "in_quote": in_quote,
+                "inode": os.fstat(f.fileno()).st_ino,
+                "head": head,
+                "tail": _fingerprint(f, end),
+                "generation": next(_generations),
+            }
+    with _lock:
+        _row_index[name] = entry
+    return entry
+
+
+def _extend_row_index(name, f, before, after):
+    # Dipanggil di bawah lock file setelah append: scan hanya byte baru
+    with _lock:
+        entry = _row_index.get(name)
+        if entry is None or entry["sig"] != before:
+            return
+        offsets, end, in_quote = _scan_offsets(f, entry["end"], entry["in_quote"])
+        _row_index[name] = dict(
+            entry,
+            sig=after,
+            offsets=entry["offsets"] + offsets,
+            end=end,
+            in_quote=in_quote,
+            tail=_fingerprint(f, end),
+        )
+
+
+def _parse_records(name, entry, start, stop):
+    # Record ke-[start, stop) sebagai teks mentah (index = nomor record)
+    offsets = entry["offsets"]
+    with open(TABLES[name], "rb") as f:
+        header, _ = _read_header(f)
+        if header is None or start >= stop:
+            return pd.DataFrame(columns=header or [], dtype=str)
+        f.seek(offsets[start])
+        end = offsets[stop] if stop < len(offsets) else entry["end"]
+        chunk = f.read(end - offsets[start])
+    df = pd.read_csv(io.BytesIO(chunk), header=None, names=header, dtype=str)
+    df.index = pd.RangeIndex(start, start + len(df))
+    return df
+
+
+@timing.timed(lambda name: f"baca_csv:{name}")
+def _read_csv(name):
+    # Tail-follow: jika file hanya bertambah sejak terakhir di-parse, cukup
+    # parse record barunya lalu sambungkan ke frame sebelumnya
+    entry = _row_offsets(name)
+    count = len(entry["offsets"])
+    with _lock:
+        tail = _tails.get(name)
+
+    df = None
+    if tail is not None and tail[0] == entry["generation"] and tail[1] <= count:
+        _, records, df = tail
+        if records < count:
+            raw = _parse_records(name, entry, records, count)
+            df = _loader().extend(name, df, raw)
+        records = count
+    if df is None:
+        df, records = _loader().load_counted(name)
+
+    with _lock:
+        if records == count:
+            _tails[name] = (entry["generation"], records, df)
+        else:
+            _tails.pop(name, None)  # file berubah saat dibaca
+    return df
+
+
+def row_count(name):
+    """Jumlah baris data tabel tanpa mem-parse isinya."""
+    if table_signature(name) is None:
+        return 0
+    if _use_sqlite():
+        return _sqlite().row_count(name)
+    if is_partitioned(name):
+        return _partitions().row_count(name)
+    return len(_row_offsets(name)["offsets"])
+
+
+def read_rows(name, start, stop):
+    """Baris ke-[start, stop) sebagai DataFrame bertipe (index = nomor baris).
+
+    Hanya byte baris yang diminta yang dibaca & di-parse, sehingga biaya
+    sebanding ukuran halaman, bukan ukuran tabel.
+    """
+    if table_signature(name) is None:
+        return pd.DataFrame()
+    start = max(int(start), 0)
+    if _use_sqlite():
+        return _loader().clean_rows(
+            name, _sqlite().select_slice(name, start, max(int(stop), start))
+        )
+    if is_partitioned(name):
+        return _partitions().read_rows(name, start, max(int(stop), start))
+
+    entry = _row_offsets(name)
+    stop = min(max(int(stop), start), len(entry["offsets"]))
+    df = _parse_records(name, entry, start, stop)
+    return _loader().clean_rows(name, df)
+
+
+def write_table(name, df):
+    if _use_sqlite():
+        _sqlite().write_table(name, df)
+        _notify(name, None, None, table_signature(name))
+        return
+
+    if is_partitioned(name):
+        with table_lock(name):
+            _partitions().write(name, df)
+        _notify(name, None, None, table_signature(name))
+        return
+
+    # Tulis ulang seluruh file di bawah lock yang sama dengan append_rows,
+    # agar tidak ada baris append yang hilang di tengah penulisan.
+    path = TABLES[name]
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    data = df.to_csv(index=False).encode("utf-8")
+    with _open_locked(path) as f:
+        try:
+            f.seek(0)
+            f.truncate()
+            f.write(data)
+            f.flush()
+            if FSYNC_POLICY == "always":
+                os.fsync(f.fileno())
+        finally:
+            _unlock_file(f)
+    _notify(name, None, None, table_signature(name))
+
+
+def ensure_table(name, columns):
+    if not table_exists(name):
+        write_table(name, pd.DataFrame(columns=columns))
+
+
+def replace_table_file(name, tmp_path, expected_signature=None, path=None):
+    """Ganti file CSV tabel (atau satu partisinya) dengan `tmp_path` secara atomik.
+
+    Dilakukan di bawah lock yang sama dengan append_rows; jika
+    `expected_signature` diberikan dan file sudah berubah sejak itu (ada
+    penulis lain), file tidak diganti dan hasilnya False.
+    """
+    path = path or TABLES[name]
+    with table_lock(name):
+        current = _file_signature(path)
+        if expected_signature is not None and current != tuple(expected_signature):
+            return False
+        os.replace(tmp_path, path)
+    _notify(name, None, None, table_signature(name))
+    return True
+
+
+# ===========================================================
+# ========== APPEND-ONLY: TAMBAH BARIS TANPA REWRITE ========
+# ===========================================================
+def _read_header(f):
+    # Kembalikan (kolom header, akhir baris yang dipakai file)
+    f.seek(0)
+    first_line = f.readline().decode("utf-8-sig")
+    if not first_line.strip():
+        return None, "\n"
+    terminator = "\r\n" if first_line.endswith("\r\n") else "\n"
+    return next(csv.reader([first_line])), terminator
+
+
+def _open_locked(path):
+    # Buka & kunci file. Jika file diganti (replace_table_file) selama
+    # menunggu lock, kunci lama menempel di file yang sudah tidak dipakai:
+    # buka ulang sampai lock didapat pada file yang aktif.
+    while True:
+        f = open(path, "a+b")
+        _lock_file(f)
+        try:
+            if os.fstat(f.fileno()).st_ino == os.stat(path).st_ino:
+                return f
+        except FileNotFoundError:
+            pass
+        _unlock_file(f)
+        f.close()
+
+
+@contextmanager
+def table_lock(name):
+    """Lock eksklusif tabel CSV (sama dengan yang dipakai append_rows).
+
+    Tabel berpartisi memakai file data/<tabel>/.lock.
+    """
+    if is_partitioned(name):
+        path = _partitions().lock_path(name)
+    else:
+        path = TABLES[name]
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    f = _open_locked(path)
+    try:
+        yield f
+    finally:
+        _unlock_file(f)
+        f.close()
+
+
+def append_rows(name, rows, columns=None):
+    """Tambahkan baris (list of dict) ke akhir CSV di bawah lock eksklusif.
+
+    Biaya tidak bergantung pada ukuran file. Header ditulis jika file masih
+    kosong (pakai `columns`, atau urutan key baris pertama). Key yang tidak
+    ada di header diabaikan, kolom header yang tidak ada di baris dikosongkan.
+    """
+    if not rows:
+        return
+    if _use_sqlite():
+        before = table_signature(name)
+        _sqlite().append_rows(name, rows, columns=columns)
+        _notify(name, rows, before, table_signature(name))
+        return
+
+    if is_partitioned(name):
+        # baris yang tidak masuk di akhir urutan global (partisi bulan lama)
+        # menggeser nomor baris: pendengar diberi tahu seperti tulis ulang
+        with table_lock(name):
+            before, after, in_order = _partitions().append_rows(name, rows, columns)
+        _notify(name, rows if in_order else None, before, after)
+        return
+
+    path = TABLES[name]
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    with _open_locked(path) as f:
+        try:
+            stat = os.fstat(f.fileno())
+            before = (stat.st_mtime_ns, stat.st_size)
+            header, terminator = _read_header(f)
+            buf = io.StringIO()
+            writer = csv.writer(buf, lineterminator=terminator)
+
+            if header is None:
+                header = list(columns or COLUMNS.get(name) or rows[0].keys())
+                writer.writerow(header)
+            else:
+                # pastikan baris baru tidak menempel di baris terakhir
+                f.seek(0, os.SEEK_END)
+                if f.tell() > 0:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        buf.write(terminator)
+
+            for row in rows:
+                writer.writerow(
+                    ["" if row.get(col) is None else row.get(col) for col in header]
+                )
+
+            f.seek(0, os.SEEK_END)
+            f.write(buf.getvalue().encode("utf-8"))
+            f.flush()
+            if FSYNC_POLICY == "always":
+                os.fsync(f.fileno())
+            stat = os.fstat(f.fileno())
+            after = (stat.st_mtime_ns, stat.st_size)
+            _extend_row_index(name, f, before, after)
+        finally:
+            _unlock_file(f)
+
+    _notify(name, rows, before, after)
+
+
+def append_row(name, row, columns=None):
+    append_rows(name, [row], columns=columns)
@@ -0,0 +1,156 @@
+import argparse
+import re
+
+import numpy as np
+import pandas as pd
+
+import csv_loader
+import data_store
+
+# ===========================================================
+# ========== MESIN ATURAN "CEK DIAGNOSA DINI" ===============
+# ===========================================================
+# Tabel kata kunci -> diagnosa dibaca dari data/aturan_diagnosa.csv
+# (kolom: prioritas, diagnosa, kata_kunci dipisah ";"). Semua kata kunci
+# dikompilasi menjadi SATU regex dengan named group per aturan, sehingga
+# keluhan cukup dipindai sekali. Jika beberapa aturan cocok, prioritas
+# terkecil yang menang.
+#
+#     python diagnosis_rules.py               # pratinjau reklasifikasi riwayat
+#     python diagnosis_rules.py --apply       # tulis hasil ke diagnosa_masyarakat
+
+RULES_TABLE = "aturan_diagnosa"
+HISTORY_TABLE = "diagnosa_masyarakat"
+DEFAULT_DIAGNOSA = "Belum teridentifikasi (segera periksa ke fasilitas kesehatan)"
+
+_compiled = None  # (signature file aturan, RuleSet)
+
+
+class RuleSet:
+    """Aturan terkompilasi: daftar (prioritas, diagnosa, kata kunci) + regex."""
+
+    def __init__(self, rules):
+        self.rules = sorted(rules, key=lambda rule: rule[0])
+        self.diagnoses = [diagnosa for _, diagnosa, _ in self.rules]
+        self.patterns = [self._alternation(keywords) for _, _, keywords in self.rules]
+
+        # Lookahead: setiap posisi teks diuji terhadap semua aturan, jadi
+        # kata kunci yang tumpang-tindih antar aturan tetap terdeteksi.
+        groups = "|".join(
+            f"(?P<r{i}>{pattern})" for i, pattern in enumerate(self.patterns) if pattern
+        )
+        self.regex = re.compile(f"(?=(?:{groups}))") if groups else None
+
+    @staticmethod
+    def _alternation(keywords):
+        # kata kunci terpanjang dulu agar "darah tinggi" tidak kalah oleh "darah"
+        keywords = sorted({k for k in keywords if k}, key=len, reverse=True)
+        return "|".join(re.escape(k) for k in keywords)
+
+    def classify(self, keluhan):
+        """Diagnosa untuk satu teks keluhan (satu kali pindai)."""
+        if self.regex is None or not isinstance(keluhan, str):
+            return DEFAULT_DIAGNOSA
+        best = None
+        for match in self.regex.finditer(keluhan.lower()):
+            rule = int(match.lastgroup[1:])
+            if best is None or rule < best:
+                best = rule
+                if best == 0:
+                    break
+        return DEFAULT_DIAGNOSA if best is None else self.diagnoses[best]
+
+    def classify_series(self, keluhan):
+        """Diagnosa untuk seluruh Series keluhan (vektor, per nilai unik)."""
+        codes, uniques = pd.factorize(keluhan.astype("string").str.lower())
+        uniques = pd.Series(uniques, dtype="string")
+        masks = [
+            uniques.str.contains(pattern, regex=True).fillna(False).to_numpy(bool)
+            for pattern in self.patterns
+            if pattern
+        ]
+        diagnoses = [d for d, p in zip(self.diagnoses, self.patterns) if p]
+        labels = np.select(masks, diagnoses, default=DEFAULT_DIAGNOSA)
+        labels = np.append(labels, DEFAULT_DIAGNOSA)  # kode -1 = keluhan kosong
+        return pd.Series(labels[codes], index=keluhan.index, dtype=object)
+
+
+def _parse_rules(df):
+    rules = []
+    for row in df.to_dict("records"):
+        keywords = str(row.get("kata_kunci") or "").split(";")
+        rules.append(
+            (
+                int(row.get("prioritas") or 0),
+                str(row["diagnosa"]),
+                [k.strip().lower() for k in keywords],
+            )
+        )
+    return RuleSet(rules)
+
+
+def load_rules():
+    """RuleSet dari tabel aturan_diagnosa (dikompilasi sekali per signature)."""
+    global _compiled
+    sig = data_store.table_signature(RULES_TABLE)
+    if _compiled is None or _compiled[0] != sig:
+        if sig is None:
+            rules = RuleSet([])
+        else:
+            rules = _parse_rules(data_store.read_table(RULES_TABLE))
+        _compiled = (sig, rules)
+    return _compiled[1]
+
+
+def classify(keluhan):
+    return load_rules().classify(keluhan)
+
+
+def reclassify_history(apply=False):
+    """Hitung ulang kolom Diagnosa seluruh riwayat dengan aturan saat ini.
+
+    Mengembalikan DataFrame perubahan (Keluhan, lama, baru). Dengan
+    apply=True tabel ditulis ulang sekali, hanya jika ada yang berubah;
+    dibaca sebagai teks mentah sehingga hanya kolom Diagnosa yang berubah.
+    """
+    # record terbungkus kutip diurai dulu agar keluhannya terbaca
+    df = csv_loader.unwrap_records(data_store.read_raw(HISTORY_TABLE))
+    if df.empty or "Keluhan" not in df.columns:
+        return pd.DataFrame(columns=["Keluhan", "Diagnosa Lama", "Diagnosa Baru"])
+
+    new = load_rules().classify_series(df["Keluhan"])
+    old = df["Diagnosa"].astype(object)
+    changed = old.fillna("") != new
+    changes = pd.DataFrame(
+        {
+            "Keluhan": df.loc[changed, "Keluhan"],
+            "Diagnosa Lama": old[changed],
+            "Diagnosa Baru": new[changed],
+        }
+    )
+
+    if apply and changed.any():
+        out = df.copy()
+        out["Diagnosa"] = new
+        data_store.write_table(HISTORY_TABLE, out)
+    return changes
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Klasifikasi ulang riwayat diagnosa_masyarakat dengan aturan terbaru."
+    )
+    parser.add_argument(
+        "--apply", action="store_true", help="tulis hasil (default: hanya pratinjau)"
+    )
+    args = parser.parse_args()
+
+    changes = reclassify_history(apply=args.apply)
+    if changes.empty:
+        print("Tidak ada diagnosa yang berubah.")
+    else:
+        summary = changes.groupby(
+            ["Diagnosa Lama", "Diagnosa Baru"], observed=True
+        ).size()
+        print(summary.to_string())
+        print(f"{len(changes)} baris {'diperbarui' if args.apply else 'akan berubah'}.")
@@ -0,0 +1,99 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from io import BytesIO
+
+import streamlit as st
+
+import data_store
+import timing
+
+# ===========================================================
+# ========== EKSPOR EXCEL/CSV SESUAI PERMINTAAN =============
+# ===========================================================
+# File unduhan baru dibuat saat pengguna menekan tombol "Siapkan",
+# lalu di-cache per (dataset, signature file) sehingga unduhan berikutnya
+# tidak membangun ulang workbook selama data belum berubah.
+
+XLSX_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+CACHE_SIZE = 8
+
+_cache = OrderedDict()  # kunci -> bytes
+_lock = threading.Lock()
+
+
+def _cached(key, build):
+    with _lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+
+    data = build()
+
+    with _lock:
+        _cache[key] = data
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return data
+
+
+def _python_rows(df):
+    # nilai numpy/pandas -> tipe Python; NaN/NaT/NA -> None (sel kosong)
+    values = df.astype(object).where(df.notna(), None)
+    return values.itertuples(index=False, name=None)
+
+
+@timing.timed("excel")
+def frame_to_excel(df, sheet_name):
+    # workbook write-only: baris ditulis streaming, tanpa menyimpan sel di memori
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(title=sheet_name)
+    ws.append([str(col) for col in df.columns])
+    for row in _python_rows(df):
+        ws.append(list(row))
+
+    buffer = BytesIO()
+    wb.save(buffer)
+    return buffer.getvalue()
+
+
+def table_excel(name, sheet_name):
+    """Bytes .xlsx untuk seluruh tabel, di-cache per signature file."""
+    key = ("xlsx", name, sheet_name, data_store.table_signature(name))
+    return _cached(key, lambda: frame_to_excel(data_store.read_table(name), sheet_name))
+
+
+def frame_csv(df, name, *filters):
+    """Bytes CSV untuk potongan tabel `name`; `filters` ikut jadi kunci cache."""
+    digest = hashlib.sha1(repr(filters).encode("utf-8")).hexdigest()
+    key = ("csv", name, digest, data_store.table_signature(name))
+    return _cached(key, lambda: df.to_csv(index=False).encode("utf-8"))
+
+
+def download_on_demand(
+    label, build, file_name, mime, key, prepare_label=None, signature=True
+):
+    """Tombol unduh yang baru membangun file setelah pengguna memintanya.
+
+    `signature` menandai versi data (mis. data_store.table_signature). File
+    yang disiapkan hanya berlaku untuk versi itu: setelah data berubah,
+    tombol "Siapkan" muncul lagi alih-alih membangun ulang di setiap rerun.
+    """
+    if st.session_state.get(key) != signature:
+        st.button(
+            prepare_label or "⚙️ Siapkan File Unduhan",
+            key=f"{key}_siapkan",
+            on_click=st.session_state.__setitem__,
+            args=(key, signature),
+        )
+        return
+
+    st.download_button(
+        label=label,
+        data=build(),
+        file_name=file_name,
+        mime=mime,
+        key=f"{key}_unduh",
+    )
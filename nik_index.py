@@ -0,0 +1,297 @@
+import hashlib
+import json
+import os
+import secrets
+import threading
+
+import pandas as pd
+
+import data_store
+
+# ===========================================================
+# ========== INDEKS NIK (HASH BERGARAM) =====================
+# ===========================================================
+# Memetakan hash NIK (blake2b berkunci salt) -> nomor baris di kedua
+# sumber (diagnosa_masyarakat & data_pasien_nakes), sehingga cek pasien
+# lama / data ganda cukup satu lookup dict, tanpa scan file. NIK asli
+# tidak disimpan di indeks.
+#
+# Persisten sebagai snapshot (data/nik_index.json) + jurnal append-only
+# (data/nik_index.log): setiap insert menambah satu baris jurnal (O(1)).
+# Jurnal dipadatkan ke snapshot saat terlalu panjang. Jika file sumber
+# berubah di luar aplikasi, indeks sumber tsb dibangun ulang sekali.
+
+INDEX_PATH = os.path.join(data_store.DATA_DIR, "nik_index.json")
+LOG_PATH = os.path.join(data_store.DATA_DIR, "nik_index.log")
+SALT_PATH = os.path.join(data_store.DATA_DIR, ".nik_salt")
+COMPACT_AFTER = 1000  # baris jurnal sebelum dipadatkan ke snapshot
+# Naikkan jika cara menghitung hash berubah (snapshot lama dibangun ulang)
+INDEX_VERSION = 2
+
+# sumber -> (nama tabel, kolom tanggal)
+SOURCES = {
+    "masyarakat": ("diagnosa_masyarakat", "Tanggal"),
+    "nakes": ("data_pasien_nakes", "Tanggal Input"),
+}
+SOURCE_LABELS = {"masyarakat": "Cek Diagnosa Mandiri", "nakes": "Data Pasien Nakes"}
+
+_lock = threading.RLock()
+_state = None  # {"signatures": {}, "counts": {}, "entries": {hash: {sumber: [baris]}}}
+_log_lines = 0
+_salt = None
+
+
+def _get_salt():
+    # Salt dari env SIPETUALANG_NIK_SALT, atau dibuat sekali & disimpan lokal
+    global _salt
+    if _salt is None:
+        env = os.environ.get("SIPETUALANG_NIK_SALT")
+        if env:
+            _salt = env.encode("utf-8")
+        elif os.path.exists(SALT_PATH):
+            with open(SALT_PATH, "rb") as f:
+                _salt = f.read()
+        else:
+            os.makedirs(os.path.dirname(SALT_PATH), exist_ok=True)
+            _salt = secrets.token_bytes(32)
+            with open(SALT_PATH, "wb") as f:
+                f.write(_salt)
+    return _salt
+
+
+def _clean(nik):
+    # Teks NIK seperti tersimpan di file; dipakai sama oleh append & bangun
+    # ulang. Spasi dibuang, ".0" dari Excel dilepas, nol di depan tetap.
+    if nik is None or (isinstance(nik, float) and pd.isna(nik)) or nik is pd.NA:
+        return ""
+    text = "".join(str(nik).split())
+    return text[:-2] if text.endswith(".0") else text
+
+
+def nik_hash(nik):
+    """Hash bergaram untuk satu NIK; string kosong jika NIK kosong."""
+    nik = _clean(nik)
+    if not nik:
+        return ""
+    digest = hashlib.blake2b(nik.encode("utf-8"), key=_get_salt()[:64], digest_size=16)
+    return digest.hexdigest()
+
+
+def _as_sig(sig):
+    return json.loads(json.dumps(sig))
+
+
+def _empty_state():
+    return {"version": INDEX_VERSION, "signatures": {}, "counts": {}, "entries": {}}
+
+
+# ===========================================================
+# ========== BANGUN ULANG & PERSISTENSI =====================
+# ===========================================================
+def _build_source(source):
+    # Satu lintasan: hash per NIK unik, lalu kelompokkan nomor baris
+    table, _ = SOURCES[source]
+    sig = data_store.table_signature(table)
+    # Teks mentah, sama dengan yang dilihat _on_write (read_table sudah
+    # mengubah NIK ke Int64: nol di depan hilang, NIK bukan angka kosong)
+    df = data_store.read_raw(table)
+    if df.empty or "NIK" not in df.columns:
+        return sig, 0, {}
+
+    codes, uniques = pd.factorize(df["NIK"].to_numpy(dtype=object))
+    # kode -1 = NIK kosong -> hash kosong (tidak diindeks)
+    hashes = pd.Series([nik_hash(nik) for nik in uniques] + [""]).to_numpy()[codes]
+    # nomor baris = nomor record di file, bukan posisi
+    records = df.index.to_numpy()
+    groups = pd.Series(records).groupby(hashes).indices
+    entries = {h: records[pos].tolist() for h, pos in groups.items() if h}
+    return sig, data_store.row_count(table), entries
+
+
+def _write_snapshot(state):
+    global _log_lines
+    tmp_path = f"{INDEX_PATH}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp_path, INDEX_PATH)
+    with open(LOG_PATH, "w", encoding="utf-8"):
+        pass
+    _log_lines = 0
+
+
+def _append_log(records):
+    global _log_lines
+    with open(LOG_PATH, "a", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+    _log_lines += len(records)
+
+
+def _apply(state, source, row, digest):
+    if digest:
+        state["entries"].setdefault(digest, {}).setdefault(source, []).append(row)
+
+
+def _load_file():
+    global _log_lines
+    try:
+        with open(INDEX_PATH, encoding="utf-8") as f:
+            state = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+    if state.get("version") != INDEX_VERSION:
+        return None
+
+    _log_lines = 0
+    try:
+        with open(LOG_PATH, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    source, row, digest, sig = json.loads(line)
+                except ValueError:
+                    break  # baris terakhir terpotong (crash saat menulis)
+                if row < state["counts"].get(source, 0):
+                    continue  # sudah ada di snapshot
+                _apply(state, source, row, digest)
+                state["counts"][source] = row + 1
+                state["signatures"][source] = sig
+                _log_lines += 1
+    except FileNotFoundError:
+        pass
+    return state
+
+
+def _current_state():
+    global _state
+    with _lock:
+        if _state is None:
+            _state = _load_file() or _empty_state()
+
+        changed = False
+        for source, (table, _) in SOURCES.items():
+            current = _as_sig(data_store.table_signature(table))
+            if _state["signatures"].get(source) != current:
+                sig, count, entries = _build_source(source)
+                for rows in _state["entries"].values():
+                    rows.pop(source, None)
+                for digest, rows in entries.items():
+                    _state["entries"].setdefault(digest, {})[source] = rows
+                _state["entries"] = {h: v for h, v in _state["entries"].items() if v}
+                _state["signatures"][source] = _as_sig(sig)
+                _state["counts"][source] = count
+                changed = True
+        if changed or _log_lines > COMPACT_AFTER:
+            _write_snapshot(_state)
+        return _state
+
+
+def ensure_loaded():
+    """Muat / segarkan indeks sekarang (dipakai pemanasan saat start)."""
+    _current_state()
+
+
+def rebuild():
+    """Bangun ulang seluruh indeks dari kedua sumber (satu lintasan per tabel)."""
+    global _state
+    with _lock:
+        _state = _empty_state()
+        return _current_state()
+
+
+def _on_write(source):
+    def callback(rows, before, after):
+        with _lock:
+            if _state is None:
+                return
+            if rows is None or _state["signatures"].get(source) != _as_sig(before):
+                # ditulis ulang / ada penulis lain: bangun ulang saat dibaca
+                _state["signatures"][source] = None
+                return
+            start = _state["counts"].get(source, 0)
+            sig = _as_sig(after)
+            records = []
+            for offset, row in enumerate(rows):
+                digest = nik_hash(row.get("NIK"))
+                _apply(_state, source, start + offset, digest)
+                records.append([source, start + offset, digest, sig])
+            _state["counts"][source] = start + len(rows)
+            _state["signatures"][source] = sig
+            _append_log(records)
+
+    return callback
+
+
+for _source, (_table, _) in SOURCES.items():
+    data_store.subscribe(_table, _on_write(_source))
+
+
+# ===========================================================
+# ========== QUERY ==========================================
+# ===========================================================
+def lookup(nik):
+    """{sumber: [nomor baris]} untuk NIK ini (dict kosong jika belum pernah)."""
+    digest = nik_hash(nik)
+    if not digest:
+        return {}
+    state = _current_state()
+    with _lock:
+        return {k: list(v) for k, v in state["entries"].get(digest, {}).items()}
+
+
+def _read_records(table, rows):
+    # Hanya record milik NIK ini: satu read_rows per rentang nomor baris
+    # berurutan, tanpa membaca seluruh tabel
+    runs = []
+    for row in sorted(set(rows)):
+        if runs and row == runs[-1][1]:
+            runs[-1][1] = row + 1
+        else:
+            runs.append([row, row + 1])
+    frames = [data_store.read_rows(table, start, stop) for start, stop in runs]
+    frames = [df for df in frames if not df.empty]
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames) if len(frames) > 1 else frames[0]
+
+
+def history(nik):
+    """Riwayat gabungan NIK dari kedua sumber, terbaru dulu."""
+    frames = []
+    for source, rows in lookup(nik).items():
+        table, date_col = SOURCES[source]
+        part = _read_records(table, rows)
+        if part.empty:
+            continue
+        part = part.rename(columns={date_col: "Tanggal"})
+        part.insert(0, "Sumber", SOURCE_LABELS[source])
+        frames.append(part)
+    if not frames:
+        return pd.DataFrame()
+    combined = pd.concat(frames, ignore_index=True)
+    cols = ["Sumber", "Tanggal", "Nama", "Umur", "Keluhan", "Diagnosa", "Alamat"]
+    combined = combined[[c for c in cols if c in combined.columns]]
+    return combined.sort_values("Tanggal", ascending=False, ignore_index=True)
+
+
+def visit_flags(nik, source, when=None):
+    """(jumlah kunjungan sebelumnya, ada entri di sumber yg sama pada hari ini?)."""
+    found = lookup(nik)
+    total = sum(len(rows) for rows in found.values())
+    if not found.get(source):
+        return total, False
+
+    table, date_col = SOURCES[source]
+    day = pd.Timestamp(when or pd.Timestamp.now()).normalize()
+    df = _read_records(table, found[source])
+    if date_col not in df.columns:
+        return total, False
+    dates = pd.to_datetime(df[date_col], errors="coerce").dt.normalize()
+    return total, bool((dates == day).any())
+
+
+if __name__ == "__main__":
+    state = rebuild()
+    print(
+        f"Indeks NIK dibangun ulang: {len(state['entries'])} NIK unik, "
+        + ", ".join(f"{s}={n} baris" for s, n in state["counts"].items())
+    )
@@ -0,0 +1,91 @@
+import os
+
+import streamlit as st
+
+# ===========================================================
+# ========== DAFTAR HALAMAN =================================
+# ===========================================================
+# Setiap halaman adalah satu skrip di views/. st.navigation hanya
+# menjalankan skrip halaman yang sedang dibuka, sehingga query data dan
+# impor berat (matplotlib, PIL, openpyxl) halaman lain tidak ikut dimuat
+# di setiap rerun.
+
+VIEWS_DIR = "views"
+
+# judul halaman -> (skrip di views/, ikon)
+PUBLIC_PAGES = {
+    "SIPETUALANG": ("landing.py", "🏠"),
+    "Dashboard Publik": ("public_dashboard.py", "📊"),
+    "Cek Diagnosa Dini": ("diagnosis_check.py", "🩺"),
+    "Informasi & Edukasi Kesehatan": ("education.py", "📚"),
+    "Games Sanitary Camp": ("games.py", "🎮"),
+}
+
+PAGES = {
+    "Dashboard Admin": ("admin_dashboard.py", "👩🏻‍⚕️"),
+    "Dashboard Nakes": ("nakes_dashboard.py", "💉"),
+    "Data Pasien": ("patient_data.py", "🧾"),
+    "Laporan Masalah Desa": ("village_reports.py", "📢"),
+    "Dashboard Pemerintah": ("government_dashboard.py", "🏛️"),
+    "Dashboard PT": ("pt_dashboard.py", "🏢"),
+    "CSR Perusahaan": ("csr.py", "⭐"),
+    "Dashboard Publik": ("public_dashboard.py", "📊"),
+    "Diagnostik Kinerja": ("diagnostics.py", "⏱️"),
+}
+
+# === Batasi menu sesuai kategori user ===
+ALLOWED_MENU = {
+    "Developer": [
+        "Dashboard Nakes",
+        "Dashboard Pemerintah",
+        "Dashboard PT",
+        "Dashboard Admin",
+        "Diagnostik Kinerja",
+    ],
+    "Admin": [
+        "Dashboard Admin",
+        "Kelola Pengguna",
+        "Log Aktivitas",
+    ],
+    "Nakes": [
+        "Dashboard Nakes",
+        "Data Pasien",
+        "Laporan Masalah Desa",
+    ],
+    "PT": [
+        "Dashboard PT",
+        "CSR Perusahaan",
+    ],
+    "Pemerintah": [
+        "Dashboard Pemerintah",
+    ],
+}
+FALLBACK_MENU = ["Dashboard Publik"]  # fallback kalau user aneh
+
+
+def allowed_menu(kategori):
+    """Menu yang boleh dibuka kategori user (yang halamannya sudah ada)."""
+    menu = ALLOWED_MENU.get(kategori, FALLBACK_MENU)
+    return [title for title in menu if title in PAGES]
+
+
+def _pages(registry, titles):
+    return [
+        st.Page(
+            os.path.join(VIEWS_DIR, registry[title][0]),
+            title=title,
+            icon=registry[title][1],
+            default=i == 0,
+        )
+        for i, title in enumerate(titles)
+    ]
+
+
+def public_navigation():
+    """Navigasi pengunjung (belum login): halaman publik di bagian atas."""
+    return st.navigation(_pages(PUBLIC_PAGES, list(PUBLIC_PAGES)), position="top")
+
+
+def user_navigation(kategori):
+    """Navigasi sidebar sesuai kategori user yang login."""
+    return st.navigation(_pages(PAGES, allowed_menu(kategori)))
@@ -0,0 +1,458 @@
+import argparse
+import csv
+import gzip
+import io
+import json
+import os
+import re
+import shutil
+import threading
+from datetime import datetime
+
+import pandas as pd
+
+import csv_loader
+import data_store
+import schema
+import timing
+
+# ===========================================================
+# ========== PARTISI BULANAN UNTUK TABEL BESAR ==============
+# ===========================================================
+# Tabel di data_store.PARTITION_BY (setelah dimigrasi) disimpan per bulan:
+#     data/diagnosa_masyarakat/2025-11.csv
+#     data/diagnosa_masyarakat/2024-01.csv.gz   (partisi lama, gzip)
+#     data/diagnosa_masyarakat/0000-00.csv      (tanggal kosong/tidak valid)
+# plus katalog kecil _catalog.json (kolom, jumlah baris & signature tiap
+# partisi). Query per periode hanya membuka partisi bulan tsb; read_table
+# menggabungkan partisi yang di-cache per file, sehingga append hanya
+# mem-parse ulang partisi yang berubah. Nomor baris global = partisi urut
+# kunci, lalu urutan record di dalam file.
+#
+#     python partitions.py migrate [tabel ...]    # CSV tunggal -> partisi
+#     python partitions.py compress [--keep 3]    # gzip partisi lama
+#     python partitions.py status
+
+CATALOG_NAME = "_catalog.json"
+LOCK_NAME = ".lock"
+NO_DATE = "0000-00"  # partisi untuk tanggal kosong/tidak valid
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+# Jumlah bulan terakhir yang dibiarkan tanpa kompresi (env SIPETUALANG_PARTITION_KEEP)
+KEEP_PLAIN = int(os.environ.get("SIPETUALANG_PARTITION_KEEP", "3"))
+
+_FILE_RE = re.compile(r"^(\d{4}-\d{2})\.csv(\.gz)?$")
+_lock = threading.RLock()
+_frames = {}  # (tabel, kunci) -> (signature file, DataFrame, jumlah record)
+
+
+def lock_path(name):
+    return os.path.join(data_store.partition_dir(name), LOCK_NAME)
+
+
+def _catalog_path(name):
+    return os.path.join(data_store.partition_dir(name), CATALOG_NAME)
+
+
+def _file_sig(path):
+    stat = os.stat(path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def partition_keys(values):
+    """Kunci partisi "YYYY-MM" untuk setiap nilai tanggal (NO_DATE jika tidak valid)."""
+    values = pd.Series(values, dtype=object)
+    ts = pd.to_datetime(values, errors="coerce", format="ISO8601")
+    return ts.dt.strftime("%Y-%m").fillna(NO_DATE)
+
+
+def files(name):
+    """{kunci: path} partisi yang ada, urut naik (gzip menang jika keduanya ada)."""
+    try:
+        entries = sorted(os.listdir(data_store.partition_dir(name)))
+    except FileNotFoundError:
+        return {}
+    found = {}
+    for entry in entries:
+        match = _FILE_RE.match(entry)
+        if match:
+            found[match.group(1)] = os.path.join(data_store.partition_dir(name), entry)
+    return found
+
+
+def signature(name):
+    """Signature tabel = (kunci, mtime, ukuran) setiap file partisi."""
+    if not os.path.isdir(data_store.partition_dir(name)):
+        return None
+    return tuple((key, *_file_sig(path)) for key, path in files(name).items())
+
+
+# ===========================================================
+# ========== KATALOG ========================================
+# ===========================================================
+def _read_catalog(name):
+    try:
+        with open(_catalog_path(name), encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {"columns": [], "partitions": {}}
+
+
+def _write_catalog(name, catalog):
+    path = _catalog_path(name)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(catalog, f, ensure_ascii=False, indent=1)
+    os.replace(tmp_path, path)
+
+
+def catalog(name):
+    """{"columns", "partitions": {kunci: {"file", "rows", "sig"}}}.
+
+    Partisi yang diubah di luar aplikasi (signature tidak cocok) dihitung
+    ulang dari isinya; selebihnya cukup dibaca dari _catalog.json.
+    """
+    current = files(name)
+    with _lock:
+        cat = _read_catalog(name)
+        entries = cat["partitions"]
+        changed = set(entries) != set(current)
+        for key in set(entries) - set(current):
+            del entries[key]
+        for key, path in current.items():
+            entry = entries.get(key)
+            sig = _file_sig(path)
+            if entry is None or entry["sig"] != sig:
+                _, records = _load(name, key, path)
+                entries[key] = {
+                    "file": os.path.basename(path),
+                    "rows": records,
+                    "sig": sig,
+                }
+                changed = True
+        if not cat["columns"] and current:
+            cat["columns"] = list(_load(name, *next(iter(current.items())))[0].columns)
+            changed = True
+        if changed:
+            cat["partitions"] = dict(sorted(entries.items()))
+            _write_catalog(name, cat)
+        return cat
+
+
+def _offsets(name):
+    # kunci -> nomor baris global pertama partisi, dan total baris
+    offsets, total = {}, 0
+    for key, entry in catalog(name)["partitions"].items():
+        offsets[key] = total
+        total += entry["rows"]
+    return offsets, total
+
+
+# ===========================================================
+# ========== BACA ===========================================
+# ===========================================================
+def _load(name, key, path):
+    # Satu partisi lewat csv_loader, di-cache per signature file
+    sig = _file_sig(path)
+    with _lock:
+        hit = _frames.get((name, key))
+        if hit is not None and hit[0] == sig:
+            return hit[1], hit[2]
+
+    df, records = csv_loader.load_counted(name, path, label=key)
+
+    with _lock:
+        _frames[(name, key)] = (sig, df, records)
+    return df, records
+
+
+@timing.timed(lambda name, keys=None: f"baca_partisi:{name}")
+def read(name, keys=None):
+    """Gabungan partisi (semua, atau hanya `keys`); index = nomor baris global."""
+    offsets, _ = _offsets(name)
+    frames = []
+    for key, path in files(name).items():
+        if keys is not None and key not in keys:
+            continue
+        df, _ = _load(name, key, path)
+        frames.append(df.set_axis(df.index + offsets.get(key, 0)))
+
+    if not frames:
+        return pd.DataFrame(columns=catalog(name)["columns"])
+    if len(frames) == 1:
+        return frames[0]
+    # kategori tiap partisi berbeda: samakan lagi setelah digabung
+    return schema.normalize(name, pd.concat(frames))
+
+
+def read_raw(name):
+    """Isi semua partisi sebagai teks apa adanya; index = nomor baris global."""
+    offsets, _ = _offsets(name)
+    frames = []
+    for key, path in files(name).items():
+        df = pd.read_csv(path, dtype=str, keep_default_na=False, na_values=[""])
+        frames.append(df.set_axis(df.index + offsets.get(key, 0)))
+    if not frames:
+        return pd.DataFrame(columns=catalog(name)["columns"])
+    return pd.concat(frames)
+
+
+def period_keys_for(year, month=None):
+    """Kunci partisi untuk satu bulan, atau ke-12 bulan dalam satu tahun."""
+    if month:
+        return {f"{int(year):04d}-{int(month):02d}"}
+    return {f"{int(year):04d}-{m:02d}" for m in range(1, 13)}
+
+
+def row_count(name):
+    return _offsets(name)[1]
+
+
+def read_rows(name, start, stop):
+    offsets, total = _offsets(name)
+    bounds = list(offsets.items()) + [(None, total)]
+    keys = {
+        key
+        for (key, first), (_, end) in zip(bounds, bounds[1:])
+        if first < stop and end > start
+    }
+    df = read(name, keys)
+    return df[(df.index >= start) & (df.index < stop)]
+
+
+# ===========================================================
+# ========== TULIS (dipanggil data_store di bawah lock tabel) ==
+# ===========================================================
+def _append_file(path, header, rows):
+    compressed = path.endswith(".gz")
+    file_header, terminator = None, "\n"
+    if os.path.exists(path):
+        with (gzip.open if compressed else open)(path, "rb") as f:
+            first_line = f.readline()
+        if first_line.strip():
+            terminator = "\r\n" if first_line.endswith(b"\r\n") else "\n"
+            file_header = next(csv.reader([first_line.decode("utf-8-sig")]))
+
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator=terminator)
+    if file_header is None:
+        file_header = header
+        writer.writerow(header)
+    for row in rows:
+        writer.writerow(
+            ["" if row.get(col) is None else row.get(col) for col in file_header]
+        )
+    data = buf.getvalue().encode("utf-8")
+
+    with open(path, "a+b") as f:
+        f.seek(0, os.SEEK_END)
+        if compressed:
+            # member gzip baru di akhir file; pembaca gzip menggabungkannya
+            with gzip.GzipFile(fileobj=f, mode="ab") as gz:
+                gz.write(data)
+        else:
+            if f.tell() > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    data = terminator.encode("utf-8") + data
+            f.write(data)
+        f.flush()
+        if data_store.FSYNC_POLICY == "always":
+            os.fsync(f.fileno())
+
+
+def append_rows(name, rows, columns=None):
+    """Tambahkan baris ke partisi bulannya masing-masing.
+
+    Mengembalikan (signature sebelum, sesudah, urut?) — urut berarti semua
+    baris masuk di akhir urutan global (partisi terakhir atau partisi baru
+    setelahnya), sehingga nomor barisnya = jumlah baris lama + offset.
+    """
+    directory = data_store.partition_dir(name)
+    os.makedirs(directory, exist_ok=True)
+    date_col = data_store.PARTITION_BY[name]
+    keys = partition_keys([row.get(date_col) for row in rows]).tolist()
+
+    before = signature(name)
+    cat = catalog(name)
+    header = cat["columns"] or list(
+        columns or data_store.COLUMNS.get(name) or rows[0].keys()
+    )
+    existing = files(name)
+    last = max(existing, default=NO_DATE)
+
+    for key in dict.fromkeys(keys):
+        path = existing.get(key) or os.path.join(directory, f"{key}.csv")
+        part = [row for row, k in zip(rows, keys) if k == key]
+        _append_file(path, header, part)
+        entry = cat["partitions"].get(key, {"rows": 0})
+        cat["partitions"][key] = {
+            "file": os.path.basename(path),
+            "rows": entry["rows"] + len(part),
+            "sig": _file_sig(path),
+        }
+    cat["columns"] = header
+    cat["partitions"] = dict(sorted(cat["partitions"].items()))
+    _write_catalog(name, cat)
+
+    in_order = len(set(keys)) == 1 and keys[0] >= last
+    return before, signature(name), in_order
+
+
+def _as_text(df):
+    # Kolom tanggal bertipe ditulis dengan format aplikasi, bukan format
+    # bawaan pandas (yang membuang jam jika semua nilai tepat tengah malam)
+    out = df.copy()
+    for col in out.columns:
+        if pd.api.types.is_datetime64_any_dtype(out[col]):
+            out[col] = out[col].dt.strftime(DATE_FORMAT)
+    return out
+
+
+def _write_frame(path, df):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    compression = "gzip" if path.endswith(".gz") else None
+    _as_text(df).to_csv(tmp_path, index=False, compression=compression)
+    os.replace(tmp_path, path)
+
+
+def write(name, df):
+    """Tulis ulang seluruh tabel ke partisi (partisi gzip tetap gzip).
+
+    Berikan teks mentah (data_store.read_raw), bukan hasil read_table:
+    nilai yang gagal diberi tipe sudah kosong di frame bertipe.
+    """
+    directory = data_store.partition_dir(name)
+    os.makedirs(directory, exist_ok=True)
+    date_col = data_store.PARTITION_BY[name]
+    existing = files(name)
+
+    cat = {"columns": [str(c) for c in df.columns], "partitions": {}}
+    if len(df) and date_col in df.columns:
+        keys = partition_keys(df[date_col]).to_numpy()
+        for key, part in df.groupby(keys, sort=True):
+            path = existing.pop(key, None) or os.path.join(directory, f"{key}.csv")
+            _write_frame(path, part)
+            cat["partitions"][key] = {
+                "file": os.path.basename(path),
+                "rows": len(part),
+                "sig": _file_sig(path),
+            }
+    for path in existing.values():
+        os.remove(path)
+    _write_catalog(name, cat)
+
+
+# ===========================================================
+# ========== MIGRASI & KOMPRESI =============================
+# ===========================================================
+def migrate(name):
+    """Pecah data/<tabel>.csv menjadi partisi bulanan (dibaca per potongan).
+
+    Partisi disusun di folder sementara lalu dipindah sekaligus; file lama
+    disimpan sebagai <file>.bak. Jalankan saat aplikasi tidak sedang
+    dipakai. Mengembalikan jumlah partisi, atau None jika dilewati.
+    """
+    source = data_store.table_path(name)
+    if data_store.is_partitioned(name) or not os.path.exists(source):
+        return None
+
+    date_col = data_store.PARTITION_BY[name]
+    directory = data_store.partition_dir(name)
+    staging = f"{directory}.{os.getpid()}.migrasi"
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+
+    with data_store.table_lock(name):
+        header = list(pd.read_csv(source, dtype=str, nrows=0).columns)
+        counts = {}
+        with pd.read_csv(source, dtype=str, chunksize=csv_loader.CHUNK_ROWS) as reader:
+            for chunk in reader:
+                # record terbungkus kutip diurai dulu agar tanggalnya terbaca
+                chunk = csv_loader.unwrap_records(chunk)
+                keys = partition_keys(chunk[date_col]).to_numpy()
+                for key, part in chunk.groupby(keys, sort=False):
+                    path = os.path.join(staging, f"{key}.csv")
+                    part.to_csv(
+                        path,
+                        mode="a",
+                        index=False,
+                        header=key not in counts,
+                    )
+                    counts[key] = counts.get(key, 0) + len(part)
+
+        cat = {"columns": header, "partitions": {}}
+        for key in sorted(counts):
+            path = os.path.join(staging, f"{key}.csv")
+            cat["partitions"][key] = {
+                "file": os.path.basename(path),
+                "rows": counts[key],
+                "sig": _file_sig(path),
+            }
+        with open(os.path.join(staging, CATALOG_NAME), "w", encoding="utf-8") as f:
+            json.dump(cat, f, ensure_ascii=False, indent=1)
+
+        os.replace(staging, directory)
+        os.replace(source, f"{source}.bak")
+    data_store.invalidate(name)
+    return len(counts)
+
+
+def compress(name, keep=KEEP_PLAIN, now=None):
+    """Gzip partisi yang lebih lama dari `keep` bulan terakhir; kembalikan kuncinya."""
+    cutoff = (pd.Period(now or datetime.now(), "M") - (keep - 1)).strftime("%Y-%m")
+    done = []
+    with data_store.table_lock(name):
+        for key, path in files(name).items():
+            plain = os.path.join(data_store.partition_dir(name), f"{key}.csv")
+            if path.endswith(".gz"):
+                # sisa kompresi yang terputus: salinan gzip sudah lengkap
+                if os.path.exists(plain):
+                    os.remove(plain)
+                continue
+            if key >= cutoff:
+                continue
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(path, "rb") as src, gzip.open(tmp_path, "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            os.replace(tmp_path, f"{path}.gz")
+            os.remove(path)
+            done.append(key)
+    if done:
+        catalog(name)
+        data_store.invalidate(name)
+    return done
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Kelola partisi bulanan tabel diagnosa/pasien."
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+    cmd = sub.add_parser("migrate", help="pecah CSV tunggal menjadi partisi bulanan")
+    cmd.add_argument("tables", nargs="*", help="nama tabel (default: semua)")
+    cmd = sub.add_parser("compress", help="gzip partisi lama")
+    cmd.add_argument("tables", nargs="*", help="nama tabel (default: semua)")
+    cmd.add_argument(
+        "--keep", type=int, default=KEEP_PLAIN, help="bulan terakhir tanpa gzip"
+    )
+    cmd = sub.add_parser("status", help="tampilkan katalog partisi")
+    cmd.add_argument("tables", nargs="*", help="nama tabel (default: semua)")
+    args = parser.parse_args()
+
+    for table in args.tables or list(data_store.PARTITION_BY):
+        if args.command == "migrate":
+            count = migrate(table)
+            print(
+                f"- {table}: "
+                + ("dilewati" if count is None else f"{count} partisi dibuat")
+            )
+        elif args.command == "compress":
+            done = compress(table, keep=args.keep)
+            print(f"- {table}: {len(done)} partisi dikompres {done}")
+        elif data_store.is_partitioned(table):
+            parts = catalog(table)["partitions"]
+            print(f"- {table}: {sum(p['rows'] for p in parts.values())} baris")
+            for key, entry in parts.items():
+                print(f"    {entry['file']:<16} {entry['rows']:>8} baris")
+        else:
+            print(f"- {table}: belum dipartisi")
@@ -0,0 +1,240 @@
+import os
+import re
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+import data_store
+import schema
+
+# ===========================================================
+# ========== IMPOR MASSAL DATA PASIEN (EXCEL/CSV) ===========
+# ===========================================================
+# Berkas unggahan dipetakan ke skema data_pasien_nakes, divalidasi
+# secara vektor (tanpa loop per baris), lalu semua baris valid disimpan
+# dengan SATU kali append. Baris yang ditolak dilaporkan beserta nomor
+# barisnya di berkas asal.
+
+TABLE = "data_pasien_nakes"
+COLUMNS = data_store.COLUMNS[TABLE]
+REQUIRED = ["Nama", "NIK", "Diagnosa"]
+
+# nama kolom berkas (dinormalisasi) -> kolom skema
+COLUMN_ALIASES = {
+    "nama": "Nama",
+    "nama pasien": "Nama",
+    "nik": "NIK",
+    "no ktp": "NIK",
+    "umur": "Umur",
+    "usia": "Umur",
+    "kelompok umur": "Umur",
+    "jenis kelamin": "Jenis Kelamin",
+    "jk": "Jenis Kelamin",
+    "l p": "Jenis Kelamin",
+    "alamat": "Alamat",
+    "alamat pasien": "Alamat",
+    "keluhan": "Keluhan",
+    "keluhan utama": "Keluhan",
+    "diagnosa": "Diagnosa",
+    "diagnosa medis": "Diagnosa",
+    "diagnosis": "Diagnosa",
+    "tanggal": "Tanggal Input",
+    "tanggal input": "Tanggal Input",
+    "tanggal periksa": "Tanggal Input",
+}
+
+# Format tanggal aplikasi; berkas Excel dengan sel tanggal juga terbaca begini
+DATE_FORMATS = ["%Y-%m-%d %H:%M:%S", "%Y-%m-%d"]
+
+
+def _header_key(name):
+    return " ".join(re.sub(r"[^0-9a-z]+", " ", str(name).lower()).split())
+
+
+def read_upload(uploaded):
+    """Baca berkas .xlsx/.csv unggahan sebagai teks (NIK tidak jadi float)."""
+    name = getattr(uploaded, "name", str(uploaded)).lower()
+    if name.endswith((".xlsx", ".xls")):
+        return pd.read_excel(uploaded, dtype=str)
+    return pd.read_csv(uploaded, dtype=str, keep_default_na=False)
+
+
+def map_columns(raw):
+    """Petakan kolom berkas ke skema; kolom skema yang tidak ada diisi kosong."""
+    mapping = {}
+    for col in raw.columns:
+        target = COLUMN_ALIASES.get(_header_key(col))
+        if target and target not in mapping.values():
+            mapping[col] = target
+
+    df = raw[list(mapping)].rename(columns=mapping)
+    for col in COLUMNS:
+        if col not in df.columns:
+            df[col] = ""
+    df = df[COLUMNS].fillna("").astype(str)
+    for col in COLUMNS:
+        df[col] = df[col].str.strip()
+    return df, mapping
+
+
+def _existing_keys():
+    existing = data_store.read_table(TABLE)
+    if existing.empty:
+        return pd.Index([])
+    return pd.MultiIndex.from_arrays(
+        [
+            existing["NIK"].astype("string").fillna(""),
+            existing["Diagnosa"].astype("string").fillna("").str.lower(),
+            existing["Tanggal Input"].dt.strftime("%Y-%m-%d").fillna(""),
+        ]
+    )
+
+
+def parse_dates(values):
+    """(tanggal, ambigu): format aplikasi dulu, sisanya dibaca hari-dulu.
+
+    Nilai yang terbaca berbeda sebagai hari/bulan dan bulan/hari
+    (mis. 05/03/2024) tidak ditebak: tanggal NaT dan ambigu True.
+    """
+    tanggal = pd.to_datetime(values, errors="coerce", format=DATE_FORMATS[0])
+    for fmt in DATE_FORMATS[1:]:
+        tanggal = tanggal.fillna(pd.to_datetime(values, errors="coerce", format=fmt))
+
+    rest = values[tanggal.isna() & (values != "")]
+    day_first = pd.to_datetime(
+        rest, errors="coerce", format="mixed", dayfirst=True
+    ).reindex(values.index)
+    month_first = pd.to_datetime(
+        rest, errors="coerce", format="mixed", dayfirst=False
+    ).reindex(values.index)
+    ambiguous = day_first.notna() & month_first.notna() & (day_first != month_first)
+    tanggal = tanggal.fillna(day_first.where(~ambiguous))
+    return tanggal, ambiguous
+
+
+def validate(df, now=None):
+    """Validasi vektor; kembalikan (baris valid, laporan kesalahan per baris)."""
+    now = now or datetime.now()
+    df = df.copy()
+    errors = pd.DataFrame(index=df.index)
+
+    for col in REQUIRED:
+        errors[f"{col} kosong"] = df[col] == ""
+
+    # NIK: 16 digit (Excel kadang menambah ".0" di belakang angka)
+    df["NIK"] = df["NIK"].str.replace(r"\.0$", "", regex=True).str.replace(" ", "")
+    errors["NIK bukan 16 digit"] = (df["NIK"] != "") & ~df["NIK"].str.fullmatch(
+        r"\d{16}"
+    )
+
+    # Kelompok umur harus salah satu kategori baku (boleh kosong seperti di form)
+    errors["Kelompok umur tidak dikenal"] = (df["Umur"] != "") & ~df["Umur"].isin(
+        schema.KATEGORI_UMUR
+    )
+
+    jk = df["Jenis Kelamin"].map(schema.JENIS_KELAMIN)
+    errors["Jenis kelamin tidak dikenal"] = jk.isna()
+    df["Jenis Kelamin"] = jk.fillna(df["Jenis Kelamin"])
+
+    tanggal, ambiguous = parse_dates(df["Tanggal Input"])
+    errors["Tanggal ambigu (hari/bulan)"] = ambiguous
+    errors["Tanggal tidak valid"] = (
+        (df["Tanggal Input"] != "") & tanggal.isna() & ~ambiguous
+    )
+    tanggal = tanggal.fillna(pd.Timestamp(now))
+    df["Tanggal Input"] = tanggal.dt.strftime("%Y-%m-%d %H:%M:%S")
+
+    # Duplikat: NIK + diagnosa + hari yang sama, di dalam berkas atau di data lama
+    keys = pd.MultiIndex.from_arrays(
+        [df["NIK"], df["Diagnosa"].str.lower(), tanggal.dt.strftime("%Y-%m-%d")]
+    )
+    errors["Duplikat di berkas"] = keys.duplicated(keep="first")
+    errors["Sudah tercatat"] = keys.isin(_existing_keys())
+
+    bad = errors.any(axis=1)
+    messages = pd.Series("", index=df.index)
+    for col in errors.columns:
+        messages = messages.where(~errors[col], messages + col + ", ")
+    report = pd.DataFrame(
+        {
+            "Baris": df.index[bad] + 2,  # +1 header, +1 penomoran mulai 1
+            "Nama": df.loc[bad, "Nama"],
+            "NIK": df.loc[bad, "NIK"],
+            "Kesalahan": messages[bad].str.rstrip(", "),
+        }
+    )
+    return df[~bad], report
+
+
+def commit(valid):
+    """Simpan semua baris valid dengan satu kali tulis."""
+    data_store.append_rows(TABLE, valid.to_dict("records"), columns=COLUMNS)
+    return len(valid)
+
+
+# ===========================================================
+# ========== UI =============================================
+# ===========================================================
+def show_bulk_import(key="impor_pasien"):
+    st.subheader("📤 Impor Massal Data Pasien (Excel/CSV)")
+    st.caption(
+        "Kolom yang dikenali: "
+        + ", ".join(COLUMNS)
+        + ". Tanggal kosong diisi waktu impor; tanggal yang bisa dibaca "
+        "hari/bulan maupun bulan/hari (mis. 05/03/2024) ditolak, "
+        "gunakan format YYYY-MM-DD."
+    )
+    uploaded = st.file_uploader(
+        "Pilih berkas data pasien", type=["xlsx", "csv"], key=f"{key}_berkas"
+    )
+    if uploaded is None:
+        return
+
+    # validasi sekali per berkas, hasilnya disimpan di session state
+    state = st.session_state.get(key)
+    if state is None or state["file_id"] != uploaded.file_id:
+        try:
+            df, mapping = map_columns(read_upload(uploaded))
+        except Exception as exc:
+            st.error(f"❌ Berkas tidak dapat dibaca: {exc}")
+            return
+        valid, report = validate(df)
+        state = {
+            "file_id": uploaded.file_id,
+            "mapping": mapping,
+            "valid": valid,
+            "report": report,
+            "saved": False,
+        }
+        st.session_state[key] = state
+
+    missing = [c for c in REQUIRED if c not in state["mapping"].values()]
+    if missing:
+        st.error("❌ Kolom wajib tidak ditemukan: " + ", ".join(missing))
+        return
+
+    valid, report = state["valid"], state["report"]
+    col1, col2 = st.columns(2)
+    col1.metric("Baris valid", len(valid))
+    col2.metric("Baris ditolak", len(report))
+
+    if len(report):
+        st.warning("⚠️ Baris berikut tidak akan disimpan:")
+        st.dataframe(report, use_container_width=True, hide_index=True)
+        st.download_button(
+            "📥 Unduh Laporan Kesalahan (CSV)",
+            data=report.to_csv(index=False).encode("utf-8"),
+            file_name=f"laporan_impor_{os.path.splitext(uploaded.name)[0]}.csv",
+            mime="text/csv",
+            key=f"{key}_laporan",
+        )
+
+    if state["saved"]:
+        st.success(f"✅ {len(valid)} data pasien berhasil diimpor.")
+    elif len(valid) and st.button(
+        f"💾 Simpan {len(valid)} Data Pasien Valid", key=f"{key}_simpan"
+    ):
+        commit(valid)
+        state["saved"] = True
+        st.success(f"✅ {len(valid)} data pasien berhasil diimpor.")
@@ -0,0 +1,29 @@
+import streamlit as st
+
+import data_store
+
+# ===========================================================
+# ========== TABEL DATA PER BULAN ===========================
+# ===========================================================
+# Tabel admin/nakes menampilkan satu bulan secara default, sehingga untuk
+# tabel berpartisi hanya file bulan itu yang dibuka. "Semua" tetap ada
+# untuk melihat seluruh data.
+
+ALL_PERIODS = "Semua"
+
+
+def show_period_table(name, date_col, key):
+    """Pilihan bulan + st.dataframe; kembalikan DataFrame yang ditampilkan."""
+    periods = data_store.table_periods(name, date_col)[::-1]  # terbaru dulu
+    choice = st.selectbox(
+        "🗓️ Tampilkan Bulan",
+        periods + [ALL_PERIODS],
+        key=key,
+    )
+    if choice == ALL_PERIODS:
+        df = data_store.read_table(name)
+    else:
+        year, month = choice.split("-")
+        df = data_store.select_period(name, date_col, year, month)
+    st.dataframe(df, use_container_width=True)
+    return df
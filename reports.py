@@ -0,0 +1,407 @@
+import json
+import os
+import threading
+from datetime import datetime
+
+import pandas as pd
+
+import data_store
+
+# ===========================================================
+# ========== REPOSITORI LAPORAN MASALAH DESA ================
+# ===========================================================
+# laporan_nakes hanya di-append: setiap laporan mendapat laporan_id
+# stabil (naik monoton). Perubahan status dicatat sebagai event di
+# log_pemerintah / log_pt, TIDAK lagi dengan menulis ulang laporan_nakes.
+#
+# Status terkini dimaterialisasi (id -> status, status -> daftar id,
+# id -> posisi event) sebagai snapshot data/laporan_status.json + jurnal
+# append-only data/laporan_status.log, seperti rollup & nik_index: setiap
+# append lewat data_store.subscribe menambah satu baris jurnal, bukan
+# menulis ulang seluruh state. Riwayat satu laporan dibaca hanya dari
+# baris event miliknya (data_store.read_rows).
+
+STATUS_PATH = os.path.join(data_store.DATA_DIR, "laporan_status.json")
+LOG_PATH = os.path.join(data_store.DATA_DIR, "laporan_status.log")
+COMPACT_AFTER = 1000  # baris jurnal sebelum dipadatkan ke snapshot
+# Penanda migrate() sudah dijalankan (lintas proses & restart server)
+MIGRATED_PATH = os.path.join(data_store.DATA_DIR, "laporan_migrasi.json")
+REPORT_TABLE = "laporan_nakes"
+STATUS_AWAL = "Menunggu Pemerintah"
+# Naikkan jika cara membangun state berubah (file lama dibangun ulang)
+STATE_VERSION = 3
+
+# aktor -> tabel event
+EVENT_TABLES = {"pemerintah": "log_pemerintah", "pt": "log_pt"}
+ACTORS = {name: actor for actor, name in EVENT_TABLES.items()}
+
+_lock = threading.RLock()
+_state = None  # lihat _empty_state()
+_by_status = None  # status -> set(id), turunan dari _state
+_log_lines = 0
+_migrated = False
+
+
+def _empty_state():
+    return {
+        "version": STATE_VERSION,
+        "signatures": {},
+        "reports": {},  # id -> {"row", "status", "updated"}
+        "events": {},  # id -> [[aktor, baris], ...]
+        "counts": {},  # tabel -> jumlah baris yang sudah diproses
+    }
+
+
+def _as_sig(sig):
+    return json.loads(json.dumps(sig))
+
+
+def _as_id(value):
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def _text_time(value):
+    if value is None or pd.isna(value):
+        return ""
+    return str(pd.Timestamp(value))
+
+
+def _text(value):
+    if value is None or pd.isna(value):
+        return None
+    return str(value)
+
+
+# ===========================================================
+# ========== MATERIALISASI ==================================
+# ===========================================================
+def _add_report(state, row, laporan_id, status, updated):
+    state["reports"][str(laporan_id)] = {
+        "row": row,
+        "status": status or STATUS_AWAL,
+        "updated": updated,
+    }
+
+
+def _add_event(state, actor, row, laporan_id, status, timestamp):
+    key = str(laporan_id)
+    state["events"].setdefault(key, []).append([actor, row])
+    report = state["reports"].get(key)
+    if report is not None and status:
+        report["status"] = status
+        report["updated"] = timestamp
+
+
+def _record(name, rec):
+    # [id, status, waktu] satu baris tabel; bentuk yang disimpan di jurnal
+    if name == REPORT_TABLE:
+        raw_id, status = rec.get("laporan_id"), rec.get("status")
+    else:
+        raw_id, status = rec.get("id_laporan"), rec.get("status_baru")
+    return [_as_id(raw_id), _text(status), _text_time(rec.get("timestamp"))]
+
+
+def _apply(state, name, records):
+    """Terapkan record baru `name` (urut file); kembalikan [(id, lama, baru)]."""
+    actor = ACTORS.get(name)
+    start = state["counts"].get(name, 0)
+    changes = []
+    for offset, (laporan_id, status, ts) in enumerate(records):
+        row = start + offset
+        if actor is None:
+            laporan_id = row if laporan_id is None else laporan_id
+        elif laporan_id is None:
+            continue
+
+        key = str(laporan_id)
+        old = state["reports"].get(key, {}).get("status")
+        if actor is None:
+            _add_report(state, row, laporan_id, status, ts)
+        else:
+            _add_event(state, actor, row, laporan_id, status, ts)
+        new = state["reports"].get(key, {}).get("status")
+        if old != new:
+            changes.append((laporan_id, old, new))
+    state["counts"][name] = start + len(records)
+    return changes
+
+
+def _build():
+    state = _empty_state()
+    for name in [REPORT_TABLE, *EVENT_TABLES.values()]:
+        state["signatures"][name] = _as_sig(data_store.table_signature(name))
+
+    # baris = nomor record di file (index read_table), tetap benar walau
+    # ada baris rusak yang dikarantina csv_loader
+    reports = data_store.read_table(REPORT_TABLE)
+    for row, rec in zip(reports.index, reports.to_dict("records")):
+        # laporan lama tanpa laporan_id memakai nomor barisnya (sama dengan
+        # index DataFrame yang dulu dipakai sebagai ID)
+        laporan_id, status, ts = _record(REPORT_TABLE, rec)
+        row = int(row)
+        _add_report(state, row, row if laporan_id is None else laporan_id, status, ts)
+    state["counts"][REPORT_TABLE] = data_store.row_count(REPORT_TABLE)
+
+    # event diterapkan urut waktu agar status terakhir yang menang
+    events = []
+    for actor, name in EVENT_TABLES.items():
+        log = data_store.read_table(name)
+        state["counts"][name] = data_store.row_count(name)
+        for row, rec in zip(log.index, log.to_dict("records")):
+            laporan_id, status, ts = _record(name, rec)
+            if laporan_id is not None:
+                events.append((ts, actor, int(row), laporan_id, status))
+    for ts, actor, row, laporan_id, status in sorted(events, key=lambda e: e[:3]):
+        _add_event(state, actor, row, laporan_id, status, ts)
+    return state
+
+
+def _write_snapshot(state):
+    global _log_lines
+    tmp_path = f"{STATUS_PATH}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False)
+    os.replace(tmp_path, STATUS_PATH)
+    with open(LOG_PATH, "w", encoding="utf-8"):
+        pass
+    _log_lines = 0
+
+
+def _append_log(record):
+    global _log_lines
+    with open(LOG_PATH, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    _log_lines += 1
+
+
+def _load_file():
+    global _log_lines
+    try:
+        with open(STATUS_PATH, encoding="utf-8") as f:
+            state = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+    if state.get("version") != STATE_VERSION:
+        return None
+
+    # Jurnal: [tabel, sig sebelum, sig sesudah, [[id, status, waktu], ...]].
+    # Hanya record yang menyambung dari signature saat ini yang diterapkan.
+    _log_lines = 0
+    try:
+        with open(LOG_PATH, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    name, before, after, records = json.loads(line)
+                except ValueError:
+                    break  # baris terakhir terpotong (crash saat menulis)
+                _log_lines += 1
+                if state["signatures"].get(name) != before:
+                    continue
+                _apply(state, name, records)
+                state["signatures"][name] = after
+    except FileNotFoundError:
+        pass
+    return state
+
+
+def _reindex(state):
+    global _by_status
+    by_status = {}
+    for key, report in state["reports"].items():
+        by_status.setdefault(report["status"], set()).add(int(key))
+    _by_status = by_status
+
+
+def _current_state():
+    global _state
+    with _lock:
+        if _state is None:
+            _state = _load_file() or _empty_state()
+            _reindex(_state)
+
+        tables = [REPORT_TABLE, *EVENT_TABLES.values()]
+        current = {n: _as_sig(data_store.table_signature(n)) for n in tables}
+        if any(_state["signatures"].get(n) != current[n] for n in tables):
+            _state = _build()
+            _reindex(_state)
+            _write_snapshot(_state)
+        elif _log_lines > COMPACT_AFTER:
+            _write_snapshot(_state)
+        return _state
+
+
+def _on_write(name):
+    def callback(rows, before, after):
+        with _lock:
+            if _state is None:
+                return
+            stored = _state["signatures"].get(name)
+            if rows is None or stored != _as_sig(before):
+                _state["signatures"][name] = None  # bangun ulang saat dibaca
+                return
+            records = [_record(name, rec) for rec in rows]
+            for laporan_id, old, new in _apply(_state, name, records):
+                _by_status.get(old, set()).discard(laporan_id)
+                if new is not None:
+                    _by_status.setdefault(new, set()).add(laporan_id)
+            _state["signatures"][name] = _as_sig(after)
+            _append_log([name, stored, _as_sig(after), records])
+
+    return callback
+
+
+for _name in [REPORT_TABLE, *EVENT_TABLES.values()]:
+    data_store.subscribe(_name, _on_write(_name))
+
+
+# ===========================================================
+# ========== API ============================================
+# ===========================================================
+def ids(status=None):
+    """Daftar laporan_id (urut naik), opsional hanya dengan status tertentu."""
+    state = _current_state()
+    with _lock:
+        if status is None:
+            return sorted(int(k) for k in state["reports"])
+        return sorted(_by_status.get(status, ()))
+
+
+def status_of(laporan_id):
+    state = _current_state()
+    report = state["reports"].get(str(laporan_id))
+    return report["status"] if report else None
+
+
+def table(status=None):
+    """laporan_nakes dengan status terkini, index = laporan_id."""
+    state = _current_state()
+    df = data_store.read_table(REPORT_TABLE)
+    if df.empty:
+        return df
+    selected = ids(status)
+    with _lock:
+        rows = [state["reports"][str(i)]["row"] for i in selected]
+        statuses = [state["reports"][str(i)]["status"] for i in selected]
+    out = df.loc[rows].copy()
+    out["laporan_id"] = selected
+    out["status"] = statuses
+    return out.set_index("laporan_id", drop=False).rename_axis(None)
+
+
+def create(report):
+    """Simpan laporan baru dengan laporan_id berikutnya; kembalikan id-nya."""
+    with _lock:
+        state = _current_state()
+        existing = [int(k) for k in state["reports"]]
+        laporan_id = max(existing, default=-1) + 1
+        row = {"laporan_id": laporan_id, "status": STATUS_AWAL, **report}
+        data_store.append_row(REPORT_TABLE, row)
+    return laporan_id
+
+
+def record_event(actor, laporan_id, feedback, status_baru):
+    """Catat perubahan status oleh `actor` ("pemerintah"/"pt") tanpa rewrite laporan."""
+    data_store.append_row(
+        EVENT_TABLES[actor],
+        {
+            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "id_laporan": int(laporan_id),
+            "feedback": feedback,
+            "status_baru": status_baru,
+        },
+    )
+
+
+def history(laporan_id):
+    """{aktor: DataFrame event} untuk satu laporan, dibaca per baris event."""
+    state = _current_state()
+    with _lock:
+        positions = list(state["events"].get(str(laporan_id), []))
+    out = {}
+    for actor, name in EVENT_TABLES.items():
+        rows = [row for a, row in positions if a == actor]
+        frames = [data_store.read_rows(name, row, row + 1) for row in rows]
+        frames = [f for f in frames if not f.empty]
+        out[actor] = pd.concat(frames) if frames else pd.DataFrame()
+    return out
+
+
+def _source_actor(state, logs, laporan_id, status):
+    # Aktor dari log sumber: event terakhir laporan ini yang mencatat
+    # status tsb; jika tidak ada, aktor event terakhirnya (atau pemerintah,
+    # yang pertama menangani laporan)
+    events = state["events"].get(str(laporan_id), [])
+    for actor, row in reversed(events):
+        log = logs[actor]
+        if row in log.index and log.at[row, "status_baru"] == status:
+            return actor
+    return events[-1][0] if events else "pemerintah"
+
+
+def migrate():
+    """Isi laporan_id yang kosong & samakan status lama dengan event log.
+
+    Dulu status disimpan dengan menulis ulang laporan_nakes; beberapa
+    laporan statusnya tidak cocok dengan event terakhirnya. Untuk laporan
+    seperti itu dicatat satu event sinkronisasi, lalu laporan_nakes ditulis
+    ulang SEKALI dengan laporan_id terisi. Tidak melakukan apa-apa jika
+    semua laporan sudah punya ID.
+    """
+    df = data_store.read_table(REPORT_TABLE)
+    if df.empty or ("laporan_id" in df.columns and df["laporan_id"].notna().all()):
+        return 0
+
+    state = _build()
+    logs = {actor: data_store.read_table(name) for actor, name in EVENT_TABLES.items()}
+    fixed = 0
+    for row, rec in zip(df.index, df.to_dict("records")):
+        laporan_id = _as_id(rec.get("laporan_id"))
+        laporan_id = row if laporan_id is None else laporan_id
+        status = rec.get("status")
+        current = state["reports"][str(laporan_id)]["status"]
+        if status and not pd.isna(status) and status != current:
+            actor = _source_actor(state, logs, laporan_id, status)
+            record_event(actor, laporan_id, "Sinkronisasi status (migrasi)", status)
+            fixed += 1
+
+    out = df.copy()
+    out["laporan_id"] = [
+        row if _as_id(v) is None else _as_id(v)
+        for row, v in zip(out.index, out.get("laporan_id", [None] * len(out)))
+    ]
+    data_store.write_table(REPORT_TABLE, out)
+    return fixed
+
+
+def migrate_once():
+    """migrate() sekali saja; setelahnya hanya memeriksa penanda (dipanggil app.py)."""
+    global _migrated
+    if _migrated:
+        return 0
+    with _lock:
+        if _migrated or os.path.exists(MIGRATED_PATH):
+            _migrated = True
+            return 0
+        fixed = migrate()
+        with open(MIGRATED_PATH, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "waktu": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                    "disinkronkan": fixed,
+                },
+                f,
+            )
+        _migrated = True
+    return fixed
+
+
+if __name__ == "__main__":
+    fixed = migrate()
+    state = _current_state()
+    print(
+        f"{len(state['reports'])} laporan, {fixed} status disinkronkan. "
+        + ", ".join(f"{s}: {len(i)}" for s, i in sorted(_by_status.items()))
+    )
@@ -0,0 +1,246 @@
+import json
+import os
+import threading
+
+import pandas as pd
+
+import data_store
+import schema
+
+# ===========================================================
+# ========== ROLLUP DIAGNOSA UNTUK DASHBOARD PUBLIK =========
+# ===========================================================
+# Kubus hitungan (tahun, bulan, kelompok umur, jenis kelamin, sumber,
+# diagnosa) -> jumlah kasus. Diperbarui O(1) setiap ada baris baru lewat
+# data_store.append_rows.
+#
+# Persisten sebagai snapshot (data/rollup_diagnosa.json) + jurnal
+# append-only (data/rollup_diagnosa.log), seperti nik_index: setiap tulis
+# menambah satu baris jurnal berisi sel yang bertambah, bukan menulis
+# ulang seluruh kubus. Jurnal dipadatkan ke snapshot saat terlalu panjang.
+# Jika file sumber berubah di luar aplikasi (signature tidak cocok),
+# kubus dibangun ulang sekali dari tabel lengkap.
+
+ROLLUP_PATH = os.path.join(data_store.DATA_DIR, "rollup_diagnosa.json")
+LOG_PATH = os.path.join(data_store.DATA_DIR, "rollup_diagnosa.log")
+COMPACT_AFTER = 1000  # baris jurnal sebelum dipadatkan ke snapshot
+
+# sumber -> (nama tabel, kolom tanggal)
+SOURCES = {
+    "nakes": ("data_pasien_nakes", "Tanggal Input"),
+    "masyarakat": ("diagnosa_masyarakat", "Tanggal"),
+}
+
+_lock = threading.RLock()
+_state = None  # {"signatures": {sumber: sig}, "cells": {(sumber, th, bl): {(umur, jk, diag): n}}}
+_log_lines = 0
+
+
+def _text(value):
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return ""
+    return str(value)
+
+
+def _cell_key(row, date_col):
+    tanggal = _text(row.get(date_col))
+    try:
+        year, month = int(tanggal[:4]), int(tanggal[5:7])
+    except ValueError:
+        return None, None
+    jk = _text(row.get("Jenis Kelamin"))
+    return (year, month), (
+        _text(row.get("Umur")),
+        schema.JENIS_KELAMIN.get(jk, jk),
+        _text(row.get("Diagnosa")),
+    )
+
+
+def _build_source(source):
+    table, date_col = SOURCES[source]
+    sig = data_store.table_signature(table)
+    df = data_store.read_table(table)
+    cells = {}
+    if df.empty or date_col not in df.columns or "Diagnosa" not in df.columns:
+        return sig, cells
+
+    # kolom sudah bertipe (lihat schema.py): kunci YYYYMM + categorical
+    def column(col):
+        if col not in df.columns:
+            return pd.Series("", index=df.index)
+        return df[col].astype(object).fillna("")
+
+    keys = pd.DataFrame(
+        {
+            "ym": data_store.period_keys(table, date_col),
+            "umur": column("Umur"),
+            "jk": column("Jenis Kelamin"),
+            "diagnosa": column("Diagnosa"),
+        }
+    )
+    keys = keys[keys["ym"] > 0]
+
+    counts = keys.groupby(["ym", "umur", "jk", "diagnosa"]).size()
+    for (ym, umur, jk_val, diagnosa), n in counts.items():
+        period = cells.setdefault((source, int(ym) // 100, int(ym) % 100), {})
+        period[(umur, jk_val, diagnosa)] = int(n)
+    return sig, cells
+
+
+def _write_snapshot(state):
+    global _log_lines
+    payload = {
+        "signatures": state["signatures"],
+        "cells": [
+            [source, year, month, umur, jk, diagnosa, n]
+            for (source, year, month), period in state["cells"].items()
+            for (umur, jk, diagnosa), n in period.items()
+        ],
+    }
+    tmp_path = f"{ROLLUP_PATH}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False)
+    os.replace(tmp_path, ROLLUP_PATH)
+    with open(LOG_PATH, "w", encoding="utf-8"):
+        pass
+    _log_lines = 0
+
+
+def _append_log(record):
+    global _log_lines
+    with open(LOG_PATH, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    _log_lines += 1
+
+
+def _add(cells, source, year, month, key, n):
+    period = cells.setdefault((source, year, month), {})
+    period[key] = period.get(key, 0) + n
+
+
+def _load_file():
+    global _log_lines
+    try:
+        with open(ROLLUP_PATH, encoding="utf-8") as f:
+            payload = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+    cells = {}
+    for source, year, month, umur, jk, diagnosa, n in payload.get("cells", []):
+        cells.setdefault((source, year, month), {})[(umur, jk, diagnosa)] = n
+    state = {"signatures": payload.get("signatures", {}), "cells": cells}
+
+    # Jurnal: [sumber, sig sebelum, sig sesudah, [[th, bl, umur, jk, diag, n]]].
+    # Hanya record yang menyambung dari signature saat ini yang diterapkan
+    # (record yang sudah masuk snapshot dilewati).
+    _log_lines = 0
+    try:
+        with open(LOG_PATH, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    source, before, after, deltas = json.loads(line)
+                except ValueError:
+                    break  # baris terakhir terpotong (crash saat menulis)
+                _log_lines += 1
+                if _as_sig(state["signatures"].get(source)) != before:
+                    continue
+                for year, month, umur, jk, diagnosa, n in deltas:
+                    _add(cells, source, year, month, (umur, jk, diagnosa), n)
+                state["signatures"][source] = after
+    except FileNotFoundError:
+        pass
+    return state
+
+
+def _as_sig(sig):
+    # signature SQLite berupa tuple bersarang; samakan bentuk setelah JSON
+    return json.loads(json.dumps(sig))
+
+
+def _current_state():
+    # Pastikan kubus sesuai dengan file sumber saat ini
+    global _state
+    with _lock:
+        if _state is None:
+            _state = _load_file() or {"signatures": {}, "cells": {}}
+
+        changed = False
+        for source, (table, _) in SOURCES.items():
+            current = _as_sig(data_store.table_signature(table))
+            if _as_sig(_state["signatures"].get(source)) != current:
+                sig, cells = _build_source(source)
+                _state["cells"] = {
+                    k: v for k, v in _state["cells"].items() if k[0] != source
+                }
+                _state["cells"].update(cells)
+                _state["signatures"][source] = _as_sig(sig)
+                changed = True
+        if changed or _log_lines > COMPACT_AFTER:
+            _write_snapshot(_state)
+        return _state
+
+
+def _on_write(source):
+    date_col = SOURCES[source][1]
+
+    def callback(rows, before, after):
+        with _lock:
+            if _state is None:
+                return
+            stored = _as_sig(_state["signatures"].get(source))
+            if rows is None or stored != _as_sig(before):
+                # ditulis ulang / ada penulis lain: bangun ulang saat dibaca
+                _state["signatures"][source] = None
+                return
+            deltas = {}
+            for row in rows:
+                period, key = _cell_key(row, date_col)
+                if period is None:
+                    continue
+                deltas[period + key] = deltas.get(period + key, 0) + 1
+            for (year, month, *key), n in deltas.items():
+                _add(_state["cells"], source, year, month, tuple(key), n)
+            _state["signatures"][source] = _as_sig(after)
+            _append_log(
+                [
+                    source,
+                    stored,
+                    _as_sig(after),
+                    [list(cell) + [n] for cell, n in deltas.items()],
+                ]
+            )
+
+    return callback
+
+
+for _source, (_table, _) in SOURCES.items():
+    data_store.subscribe(_table, _on_write(_source))
+
+
+# ===========================================================
+# ========== QUERY ==========================================
+# ===========================================================
+def years():
+    state = _current_state()
+    return sorted({str(year) for (_, year, _) in state["cells"]})
+
+
+def top_diagnoses(source, periods, umur=None, limit=10):
+    """Diagnosa terbanyak untuk satu sumber pada daftar (tahun, bulan).
+
+    Biaya sebanding jumlah sel kubus pada periode tsb, bukan jumlah baris.
+    Mengembalikan DataFrame kolom ["Diagnosa", "Jumlah Kasus"].
+    """
+    state = _current_state()
+    totals = {}
+    with _lock:
+        for year, month in periods:
+            period = state["cells"].get((source, int(year), int(month)), {})
+            for (umur_key, _, diagnosa), n in period.items():
+                if umur and umur_key != umur:
+                    continue
+                totals[diagnosa] = totals.get(diagnosa, 0) + n
+
+    top = sorted(totals.items(), key=lambda item: (-item[1], item[0]))[:limit]
+    return pd.DataFrame(top, columns=["Diagnosa", "Jumlah Kasus"])
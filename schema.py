@@ -0,0 +1,162 @@
+import pandas as pd
+
+# ===========================================================
+# ========== SKEMA BERTIPE UNTUK SETIAP TABEL ===============
+# ===========================================================
+# Dipakai data_store saat memuat tabel: tanggal jadi datetime64, kolom
+# berkardinalitas rendah jadi categorical, NIK jadi integer 64-bit.
+# Filter tahun/bulan memakai kunci integer YYYYMM (lihat period_keys).
+# "int" = ID/angka bulat (Int64, "0.0" -> 0); "required" = kolom yang wajib
+# terisi, baris tanpa kolom ini dikarantina oleh csv_loader.
+
+KATEGORI_UMUR = [
+    "Ibu Hamil",
+    "Bayi/Balita (0–5 tahun)",
+    "Anak-anak (6–11 tahun)",
+    "Remaja (12–18 tahun)",
+    "PUS/WUS (19–49 tahun)",
+    "Lansia (50+ tahun)",
+]
+
+JENIS_KELAMIN = {
+    "L": "Laki-laki",
+    "Laki-laki": "Laki-laki",
+    "P": "Perempuan",
+    "Perempuan": "Perempuan",
+}
+
+STATUS_LAPORAN = [
+    "Menunggu Pemerintah",
+    "Diproses Pemerintah",
+    "Diteruskan ke PT",
+    "Diproses PT",
+    "Selesai",
+]
+
+URGENSI = ["Rendah", "Sedang", "Tinggi"]
+
+# Kategori yang selalu tersedia (agar nilai baru dari form bisa di-set
+# tanpa error "new category"); nilai lain di data tetap ditambahkan.
+KNOWN_CATEGORIES = {
+    "Umur": KATEGORI_UMUR,
+    "Jenis Kelamin": ["Laki-laki", "Perempuan"],
+    "status": STATUS_LAPORAN,
+    "status_baru": STATUS_LAPORAN,
+    "urgensi": URGENSI,
+}
+
+SCHEMAS = {
+    "diagnosa_masyarakat": {
+        "datetime": ["Tanggal"],
+        "category": ["Umur", "Jenis Kelamin", "Diagnosa"],
+        "nik": ["NIK"],
+    },
+    "data_pasien_nakes": {
+        "datetime": ["Tanggal Input"],
+        "category": ["Umur", "Jenis Kelamin", "Diagnosa"],
+        "nik": ["NIK"],
+    },
+    "komentar_pengunjung": {"datetime": ["Waktu"]},
+    "laporan_nakes": {
+        "datetime": ["timestamp"],
+        "category": ["desa", "penyakit", "urgensi", "status"],
+        "int": ["laporan_id", "jumlah_kasus"],
+        "required": ["timestamp"],
+    },
+    "log_pemerintah": {
+        "datetime": ["timestamp"],
+        "category": ["status_baru"],
+        "int": ["id_laporan"],
+        "required": ["timestamp", "id_laporan"],
+    },
+    "log_pt": {
+        "datetime": ["timestamp"],
+        "category": ["status_baru"],
+        "int": ["id_laporan"],
+        "required": ["timestamp", "id_laporan"],
+    },
+    "csr_log": {
+        "datetime": ["tanggal"],
+        "category": ["perusahaan", "jenis", "status"],
+    },
+    "users": {"category": ["kategori"]},
+}
+
+
+def _categorical(series, known):
+    values = series.astype(object).where(series.notna(), None)
+    known_set = set(known)
+    extra = {v for v in values.dropna().unique() if v not in known_set}
+    categories = list(known) + sorted(extra, key=str)
+    return pd.Categorical(values, categories=categories)
+
+
+def infer_numeric(df):
+    """Kolom teks yang seluruhnya angka jadi numerik (seperti pd.read_csv)."""
+    df = df.copy()
+    for col in df.columns[df.dtypes == object]:
+        try:
+            df[col] = pd.to_numeric(df[col])
+        except (ValueError, TypeError):
+            pass
+    return df
+
+
+def normalize(name, df):
+    """Ubah DataFrame mentah (hasil CSV/SQLite) ke tipe sesuai SCHEMAS."""
+    spec = SCHEMAS.get(name)
+    if spec is None or (df.empty and len(df.columns) == 0):
+        return df
+
+    df = df.copy()
+    for col in spec.get("datetime", []):
+        if col in df.columns:
+            df[col] = pd.to_datetime(df[col], errors="coerce", format="ISO8601")
+
+    for col in spec.get("nik", []):
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype("Int64")
+
+    for col in spec.get("int", []):
+        if col in df.columns:
+            numbers = pd.to_numeric(df[col], errors="coerce")
+            df[col] = numbers.where(numbers % 1 == 0).astype("Int64")
+
+    for col in spec.get("category", []):
+        if col in df.columns:
+            values = df[col]
+            if col == "Jenis Kelamin":
+                values = values.map(lambda v: JENIS_KELAMIN.get(v, v))
+            df[col] = _categorical(values, KNOWN_CATEGORIES.get(col, []))
+    return df
+
+
+def concat(df, new):
+    """Sambung `new` ke `df` (keduanya sudah dinormalisasi) tanpa mengubah tipe.
+
+    Kategori yang belum ada ditambahkan ke kolom categorical, sehingga
+    tidak perlu normalize ulang seluruh frame.
+    """
+    if new.empty:
+        return df
+    columns = {}
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            known = df[col].cat.categories
+            values = new[col].astype(object)
+            extra = [v for v in values.dropna().unique() if v not in known]
+            left = df[col].cat.add_categories(extra) if extra else df[col]
+            right = pd.Categorical(values, categories=left.cat.categories)
+            columns[col] = (left, pd.Series(right, index=new.index))
+    if columns:
+        df = df.assign(**{col: left for col, (left, _) in columns.items()})
+        new = new.assign(**{col: right for col, (_, right) in columns.items()})
+    return pd.concat([df, new])
+
+
+def period_keys(df, date_col):
+    """Kunci integer YYYYMM per baris (0 jika tanggal kosong/tidak valid)."""
+    if date_col not in df.columns:
+        return pd.Series(0, index=df.index, dtype="int32")
+    ts = df[date_col]
+    return (ts.dt.year * 100 + ts.dt.month).fillna(0).astype("int32")
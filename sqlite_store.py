@@ -0,0 +1,292 @@
+import argparse
+import os
+import sqlite3
+import threading
+
+import pandas as pd
+
+import csv_loader
+import data_store
+
+# ===========================================================
+# ========== BACKEND SQLITE UNTUK DATA STORE ================
+# ===========================================================
+# Tabel yang sama dengan CSV di data/, disimpan dalam satu file SQLite
+# (mode WAL) dengan indeks untuk filter dashboard. Aktifkan dengan
+# SIPETUALANG_STORAGE=sqlite, lalu jalankan sekali:
+#
+#     python sqlite_store.py            # impor semua CSV di data/
+#     python sqlite_store.py --replace  # timpa tabel yang sudah terisi
+#
+# Impor memakai csv_loader (record terbungkus diurai ulang, baris rusak ke
+# data/quarantine/) dan rowid = nomor record di file + 1, sehingga indeks
+# baris DataFrame (rowid - 1) sama dengan backend CSV. Hasil baca berupa
+# teks; data_store memvalidasi & memberi tipe lewat csv_loader.clean_rows.
+
+INDEXES = {
+    "diagnosa_masyarakat": ["Tanggal", "Diagnosa", "Umur"],
+    "data_pasien_nakes": ["Tanggal Input", "Diagnosa", "Umur"],
+    "laporan_nakes": ["status"],
+    "log_pemerintah": ["id_laporan"],
+    "log_pt": ["id_laporan"],
+}
+
+# Versi per tabel, dinaikkan di transaksi yang sama dengan tulisannya
+VERSIONS_TABLE = "_versi_tabel"
+
+_local = threading.local()
+
+
+def _q(identifier):
+    return '"' + str(identifier).replace('"', '""') + '"'
+
+
+def connect():
+    # Satu koneksi per thread (tiap sesi Streamlit berjalan di thread sendiri)
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        db_dir = os.path.dirname(data_store.SQLITE_PATH)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        conn = sqlite3.connect(data_store.SQLITE_PATH, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "PRAGMA synchronous="
+            + ("FULL" if data_store.FSYNC_POLICY == "always" else "NORMAL")
+        )
+        _local.conn = conn
+    return conn
+
+
+def signature(name):
+    # (inode file db, versi tabel): tulisan ke tabel lain tidak mengubahnya,
+    # sehingga cache & indeks turunan tabel ini tetap berlaku
+    try:
+        inode = os.stat(data_store.SQLITE_PATH).st_ino
+    except FileNotFoundError:
+        return None
+    try:
+        row = (
+            connect()
+            .execute(f"SELECT versi FROM {_q(VERSIONS_TABLE)} WHERE nama = ?", (name,))
+            .fetchone()
+        )
+    except sqlite3.OperationalError:  # db lama tanpa tabel versi
+        row = None
+    return (inode, row[0] if row else 0)
+
+
+def _bump_version(conn, name):
+    conn.execute(
+        f"CREATE TABLE IF NOT EXISTS {_q(VERSIONS_TABLE)} "
+        "(nama TEXT PRIMARY KEY, versi INTEGER NOT NULL)"
+    )
+    conn.execute(
+        f"INSERT INTO {_q(VERSIONS_TABLE)} (nama, versi) VALUES (?, 1) "
+        "ON CONFLICT(nama) DO UPDATE SET versi = versi + 1",
+        (name,),
+    )
+
+
+def table_exists(name):
+    if not os.path.exists(data_store.SQLITE_PATH):
+        return False
+    row = (
+        connect()
+        .execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (name,))
+        .fetchone()
+    )
+    return row is not None
+
+
+def _table_columns(conn, name):
+    return [r[1] for r in conn.execute(f"PRAGMA table_info({_q(name)})")]
+
+
+def _ensure_table(conn, name, columns):
+    existing = _table_columns(conn, name)
+    if not existing:
+        cols = ", ".join(_q(c) for c in columns)
+        conn.execute(f"CREATE TABLE IF NOT EXISTS {_q(name)} ({cols})")
+        existing = list(columns)
+    else:
+        for col in columns:
+            if col not in existing:
+                conn.execute(f"ALTER TABLE {_q(name)} ADD COLUMN {_q(col)}")
+                existing.append(col)
+
+    for col in INDEXES.get(name, []):
+        if col in existing:
+            index_name = f"idx_{name}_{col}".replace(" ", "_").lower()
+            conn.execute(
+                f"CREATE INDEX IF NOT EXISTS {_q(index_name)} ON {_q(name)} ({_q(col)})"
+            )
+    return existing
+
+
+def _select(name, where="", params=(), limit=""):
+    conn = connect()
+    if not _table_columns(conn, name):
+        return pd.DataFrame()
+    df = pd.read_sql_query(
+        f"SELECT rowid - 1 AS _row, * FROM {_q(name)} {where} ORDER BY rowid {limit}",
+        conn,
+        params=params,
+    )
+    df = df.set_index("_row")
+    df.index.name = None
+    return _as_text(df)
+
+
+def _as_text(df):
+    # Nilai sebagai teks seperti pd.read_csv(dtype=str), agar validasi &
+    # inferensi tipe csv_loader berlaku sama dengan backend CSV
+    return df.apply(lambda s: s.astype("string").astype(object).where(s.notna(), None))
+
+
+def read_table(name):
+    return _select(name)
+
+
+def select_range(name, date_col, start, end, umur=None):
+    where = f"WHERE {_q(date_col)} >= ? AND {_q(date_col)} < ?"
+    params = [start, end]
+    if umur:
+        where += ' AND "Umur" = ?'
+        params.append(umur)
+    return _select(name, where, params)
+
+
+def select_equals(name, column, value):
+    return _select(name, f"WHERE {_q(column)} = ?", (value,))
+
+
+def row_count(name):
+    # Nomor record terakhir + 1, seperti jumlah record file CSV (termasuk
+    # record yang dikarantina saat impor)
+    conn = connect()
+    if not _table_columns(conn, name):
+        return 0
+    return conn.execute(f"SELECT COALESCE(MAX(rowid), 0) FROM {_q(name)}").fetchone()[0]
+
+
+def select_slice(name, start, stop):
+    # Record ke-[start, stop) menurut nomor record (index), bukan posisi
+    return _select(name, "WHERE rowid > ? AND rowid <= ?", (start, stop))
+
+
+def _frame_rows(df):
+    # Ubah nilai numpy/pandas ke tipe Python yang bisa di-bind sqlite3
+    out = df.copy()
+    for col in out.columns:
+        if pd.api.types.is_datetime64_any_dtype(out[col]):
+            out[col] = out[col].astype(str).where(out[col].notna(), None)
+    out = out.astype(object).where(out.notna(), None)
+    return list(out.itertuples(index=False, name=None))
+
+
+def append_rows(name, rows, columns=None):
+    conn = connect()
+    with conn:
+        table_cols = _ensure_table(
+            conn, name, list(columns or data_store.COLUMNS.get(name) or rows[0].keys())
+        )
+        placeholders = ", ".join("?" for _ in table_cols)
+        conn.executemany(
+            f"INSERT INTO {_q(name)} ({', '.join(_q(c) for c in table_cols)}) "
+            f"VALUES ({placeholders})",
+            [tuple(row.get(col) for col in table_cols) for row in rows],
+        )
+        _bump_version(conn, name)
+
+
+def _insert(conn, name, df, keep_index=False):
+    if not len(df):
+        return
+    columns = list(df.columns)
+    rows = _frame_rows(df)
+    if keep_index:
+        # rowid = index + 1 (nomor record file CSV)
+        columns = ["rowid"] + columns
+        rows = [(int(i) + 1,) + row for i, row in zip(df.index, rows)]
+    cols = ", ".join(c if c == "rowid" else _q(c) for c in columns)
+    placeholders = ", ".join("?" for _ in columns)
+    conn.executemany(f"INSERT INTO {_q(name)} ({cols}) VALUES ({placeholders})", rows)
+
+
+def write_table(name, df, keep_index=False):
+    conn = connect()
+    with conn:
+        _ensure_table(conn, name, list(df.columns))
+        conn.execute(f"DELETE FROM {_q(name)}")
+        _insert(conn, name, df, keep_index=keep_index)
+        _bump_version(conn, name)
+
+
+def _import_csv(name, path):
+    # Per potongan lewat csv_loader, dalam satu transaksi
+    conn = connect()
+    rows = 0
+    rejected = []
+    with conn:
+        for i, (good, bad) in enumerate(csv_loader.iter_chunks(path, name)):
+            if i == 0:
+                _ensure_table(conn, name, list(good.columns))
+                conn.execute(f"DELETE FROM {_q(name)}")
+            _insert(conn, name, good, keep_index=True)
+            rows += len(good)
+            if not bad.empty:
+                rejected.append(bad)
+        _bump_version(conn, name)
+    if rejected:
+        csv_loader._write_quarantine(name, pd.concat(rejected))
+    return rows, sum(len(bad) for bad in rejected)
+
+
+# ===========================================================
+# ========== MIGRASI SEKALI JALAN: CSV -> SQLITE ============
+# ===========================================================
+def migrate(replace=False):
+    for name, path in data_store.TABLES.items():
+        partitioned = data_store.is_partitioned(name)
+        if not partitioned and not os.path.exists(path):
+            print(f"- {name}: {path} tidak ada, dilewati")
+            continue
+
+        conn = connect()
+        if table_exists(name) and not replace:
+            count = conn.execute(f"SELECT COUNT(*) FROM {_q(name)}").fetchone()[0]
+            if count:
+                print(f"- {name}: sudah berisi {count} baris, dilewati (--replace)")
+                continue
+
+        if partitioned:
+            import partitions
+
+            # partitions.read sudah lewat csv_loader; index = nomor baris global
+            df = partitions.read(name)
+            write_table(name, df, keep_index=True)
+            rows, quarantined = len(df), 0
+        else:
+            rows, quarantined = _import_csv(name, path)
+        print(
+            f"- {name}: {rows} baris diimpor"
+            + (f", {quarantined} dikarantina" if quarantined else "")
+        )
+
+    connect().execute("ANALYZE")
+    data_store.invalidate()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Impor semua CSV di data/ ke database SQLite SIPETUALANG."
+    )
+    parser.add_argument("--db", default=data_store.SQLITE_PATH)
+    parser.add_argument(
+        "--replace", action="store_true", help="timpa tabel yang sudah berisi data"
+    )
+    args = parser.parse_args()
+
+    data_store.SQLITE_PATH = args.db
+    migrate(replace=args.replace)
@@ -0,0 +1,352 @@
+import argparse
+import os
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+import data_store
+import diagnosis_rules
+import schema
+
+# ===========================================================
+# ========== GENERATOR DATA SINTETIS (SKALA KABUPATEN) ======
+# ===========================================================
+# Membuat tabel diagnosa_masyarakat, data_pasien_nakes, laporan_nakes,
+# log_pemerintah, log_pt, csr_log dan komentar_pengunjung berukuran
+# besar (10 ribu s.d. 10 juta baris) untuk uji beban & benchmark.
+# Kosakata diambil dari data contoh: kelompok umur (schema), diagnosa &
+# kata kunci keluhan (aturan_diagnosa, data_pasien_nakes), nama desa,
+# perusahaan & kegiatan CSR. Baris ditulis bertahap per CHUNK_ROWS dengan
+# tanggal naik (seperti data yang di-append), NIK diambil dari satu pool
+# sehingga ada pasien yang kembali & tercatat di kedua sumber.
+#
+#     python synth_data.py --rows 1000000 --out /tmp/sipetualang/data
+#
+# Hanya file tabel yang ditulis; arahkan --out ke folder data/ salinan
+# aplikasi (benchmark.py melakukannya otomatis), bukan data/ asli.
+
+CHUNK_ROWS = 200_000
+DEFAULT_MONTHS = 24
+RETURNING_RATIO = 3  # rata-rata kunjungan per NIK
+
+FALLBACK_VILLAGES = ["Desa A", "Desa B", "Desa C", "Dusun 1", "Dusun 2"]
+FALLBACK_DIAGNOSES = ["ISPA", "Demam", "Hipertensi", "Diare", "Penyakit Kulit"]
+
+
+# ===========================================================
+# ========== KOSAKATA DARI DATA CONTOH ======================
+# ===========================================================
+def _values(source_dir, table, col):
+    path = os.path.join(source_dir, f"{table}.csv")
+    try:
+        values = pd.read_csv(path, dtype=str, usecols=[col])[col]
+    except (FileNotFoundError, ValueError):
+        return []
+    values = values.dropna().str.strip()
+    return sorted(values[values != ""].unique())
+
+
+def _pairs(source_dir, table, cols):
+    # Pasangan nilai unik satu baris (mis. Keluhan & Diagnosa yang sama-sama terisi)
+    path = os.path.join(source_dir, f"{table}.csv")
+    try:
+        frame = pd.read_csv(path, dtype=str, usecols=cols)[cols]
+    except (FileNotFoundError, ValueError):
+        return []
+    frame = frame.dropna().apply(lambda col: col.str.strip())
+    frame = frame[(frame != "").all(axis=1)].drop_duplicates()
+    return sorted(frame.itertuples(index=False, name=None))
+
+
+def vocabulary(source_dir=data_store.DATA_DIR):
+    """Nilai nyata dari data contoh di `source_dir` (dengan cadangan)."""
+    rules = []
+    path = os.path.join(source_dir, "aturan_diagnosa.csv")
+    if os.path.exists(path):
+        for rec in pd.read_csv(path, dtype=str).dropna().to_dict("records"):
+            keywords = [k.strip() for k in rec["kata_kunci"].split(";") if k.strip()]
+            if keywords:
+                rules.append((rec["diagnosa"], keywords))
+    if not rules:
+        rules = [(d, [d.lower()]) for d in FALLBACK_DIAGNOSES]
+
+    # Keluhan = 1-2 kata kunci satu aturan -> diagnosa aturan tsb
+    keluhan, diagnosa = [], []
+    for label, keywords in rules:
+        for i, first in enumerate(keywords):
+            keluhan.append(first)
+            diagnosa.append(label)
+            for second in keywords[i + 1 :]:
+                keluhan.append(f"{first} dan {second}")
+                diagnosa.append(label)
+    # Sebagian keluhan tidak cocok aturan mana pun
+    for generic in ["lemas", "pusing", "susah tidur", "nyeri sendi"]:
+        keluhan.append(generic)
+        diagnosa.append(diagnosis_rules.DEFAULT_DIAGNOSA)
+
+    # Keluhan & diagnosa nakes berpasangan seperti di data contoh
+    nakes = _pairs(source_dir, "data_pasien_nakes", ["Keluhan", "Diagnosa"]) or [
+        (d.lower(), d) for d in FALLBACK_DIAGNOSES
+    ]
+
+    villages = sorted(
+        set(_values(source_dir, "laporan_nakes", "desa"))
+        | set(_values(source_dir, "diagnosa_masyarakat", "Alamat"))
+    )
+    return {
+        "keluhan": np.array(keluhan, dtype=object),
+        "diagnosa": np.array(diagnosa, dtype=object),
+        "nakes_keluhan": np.array([k for k, _ in nakes], dtype=object),
+        "nakes_diagnosa": np.array([d for _, d in nakes], dtype=object),
+        "desa": np.array(villages or FALLBACK_VILLAGES, dtype=object),
+        "perusahaan": _values(source_dir, "csr_log", "perusahaan") or ["PT ABC"],
+        "jenis": _values(source_dir, "csr_log", "jenis") or ["Kesehatan"],
+        "kegiatan": _values(source_dir, "csr_log", "kegiatan") or ["Bakti sosial"],
+        "status_csr": _values(source_dir, "csr_log", "status") or ["Selesai"],
+        "komentar": _values(source_dir, "komentar_pengunjung", "Komentar")
+        or ["Terima kasih, datanya sangat membantu."],
+        "pengomentar": _values(source_dir, "komentar_pengunjung", "Nama") or ["Warga"],
+    }
+
+
+# ===========================================================
+# ========== PEMBANGKIT KOLOM ===============================
+# ===========================================================
+def _timestamps(start, end, offset, n, total, rng, fmt="%Y-%m-%d %H:%M:%S"):
+    # Tanggal naik: baris ke-i jatuh di slot ke-i dari rentang [start, end)
+    slot = (end - start).total_seconds() / max(total, 1)
+    seconds = (offset + np.arange(n) + rng.random(n)) * slot
+    stamps = np.datetime64(start, "s") + seconds.astype("timedelta64[s]")
+    text = pd.Series(np.datetime_as_string(stamps, unit="s")).str.replace(
+        "T", " ", regex=False
+    )
+    if fmt == "%Y-%m-%d":
+        text = text.str.slice(0, 10)
+    return text
+
+
+def _numbered(prefix, start, n):
+    return prefix + pd.Series(np.arange(start + 1, start + n + 1)).astype(str)
+
+
+def _visits(vocab, offset, n, total, nik_pool, start, end, rng, source):
+    if source == "masyarakat":
+        pick = rng.integers(len(vocab["keluhan"]), size=n)
+        keluhan, diagnosa = vocab["keluhan"][pick], vocab["diagnosa"][pick]
+        name_prefix, gender = "Warga ", ["Laki-laki", "Perempuan"]
+    else:
+        pick = rng.integers(len(vocab["nakes_keluhan"]), size=n)
+        keluhan, diagnosa = vocab["nakes_keluhan"][pick], vocab["nakes_diagnosa"][pick]
+        name_prefix, gender = "Pasien ", ["L", "P"]
+    nik = 3500000000000000 + rng.integers(nik_pool, size=n, dtype=np.int64)
+    return {
+        "Nama": _numbered(name_prefix, offset, n),
+        "NIK": nik.astype(str),
+        "Umur": np.array(schema.KATEGORI_UMUR, dtype=object)[
+            rng.integers(len(schema.KATEGORI_UMUR), size=n)
+        ],
+        "Jenis Kelamin": np.array(gender, dtype=object)[rng.integers(2, size=n)],
+        "Alamat": vocab["desa"][rng.integers(len(vocab["desa"]), size=n)],
+        "Keluhan": keluhan,
+        "Diagnosa": diagnosa,
+        "date": _timestamps(start, end, offset, n, total, rng),
+    }
+
+
+def _write(path, columns, frames):
+    rows = 0
+    for i, frame in enumerate(frames):
+        frame[columns].to_csv(
+            path, mode="w" if i == 0 else "a", header=i == 0, index=False
+        )
+        rows += len(frame)
+    if rows == 0:
+        pd.DataFrame(columns=columns).to_csv(path, index=False)
+    return rows
+
+
+def _visit_table(
+    path, columns, date_col, rows, nik_pool, start, end, vocab, rng, source
+):
+    def frames():
+        for offset in range(0, rows, CHUNK_ROWS):
+            n = min(CHUNK_ROWS, rows - offset)
+            data = _visits(vocab, offset, n, rows, nik_pool, start, end, rng, source)
+            data[date_col] = data.pop("date")
+            yield pd.DataFrame(data)
+
+    return _write(path, columns, frames())
+
+
+def _reports(n, start, end, vocab, rng):
+    desa = vocab["desa"][rng.integers(len(vocab["desa"]), size=n)]
+    penyakit = vocab["nakes_diagnosa"][
+        rng.integers(len(vocab["nakes_diagnosa"]), size=n)
+    ]
+    reports = pd.DataFrame(
+        {
+            "laporan_id": np.arange(n),
+            "timestamp": _timestamps(start, end, 0, n, n, rng),
+            "desa": desa,
+            "penyakit": penyakit,
+            "jumlah_kasus": rng.integers(1, 60, size=n),
+            "urgensi": np.array(schema.URGENSI, dtype=object)[
+                rng.integers(len(schema.URGENSI), size=n)
+            ],
+            "uraian": "Peningkatan kasus " + pd.Series(penyakit) + " di " + desa,
+            "status": "Menunggu Pemerintah",
+        }
+    )
+
+    # ~70% laporan ditanggapi pemerintah; yang diteruskan ditanggapi PT
+    reported = pd.to_datetime(reports["timestamp"])
+    handled = rng.random(n) < 0.7
+    gov_status = np.array(
+        ["Diproses Pemerintah", "Diteruskan ke PT", "Selesai"], dtype=object
+    )[rng.integers(3, size=int(handled.sum()))]
+    gov = pd.DataFrame(
+        {
+            "timestamp": (reported[handled] + timedelta(hours=2)).dt.strftime(
+                "%Y-%m-%d %H:%M:%S"
+            ),
+            "id_laporan": reports["laporan_id"][handled].to_numpy(),
+            "feedback": "Laporan diterima dan sedang ditindaklanjuti.",
+            "status_baru": gov_status,
+        }
+    )
+    forwarded = gov[gov["status_baru"] == "Diteruskan ke PT"]
+    pt = pd.DataFrame(
+        {
+            "timestamp": (
+                pd.to_datetime(forwarded["timestamp"]) + timedelta(days=1)
+            ).dt.strftime("%Y-%m-%d %H:%M:%S"),
+            "id_laporan": forwarded["id_laporan"].to_numpy(),
+            "feedback": "Perusahaan menindaklanjuti laporan di lapangan.",
+            "status_baru": np.array(["Diproses PT", "Selesai"], dtype=object)[
+                rng.integers(2, size=len(forwarded))
+            ],
+        }
+    )
+    return reports, gov.sort_values("timestamp"), pt.sort_values("timestamp")
+
+
+def _csr(n, start, end, vocab, rng):
+    def pick(key):
+        values = np.array(vocab[key], dtype=object)
+        return values[rng.integers(len(values), size=n)]
+
+    return pd.DataFrame(
+        {
+            "tanggal": _timestamps(start, end, 0, n, n, rng, fmt="%Y-%m-%d"),
+            "perusahaan": pick("perusahaan"),
+            "jenis": pick("jenis"),
+            "kegiatan": pick("kegiatan"),
+            "penerima": rng.integers(0, 300, size=n),
+            "status": pick("status_csr"),
+            "catatan": "",
+        }
+    )
+
+
+def _comments(n, start, end, vocab, rng):
+    return pd.DataFrame(
+        {
+            "Nama": np.array(vocab["pengomentar"], dtype=object)[
+                rng.integers(len(vocab["pengomentar"]), size=n)
+            ],
+            "Komentar": np.array(vocab["komentar"], dtype=object)[
+                rng.integers(len(vocab["komentar"]), size=n)
+            ],
+            "Waktu": _timestamps(start, end, 0, n, n, rng),
+        }
+    )
+
+
+# ===========================================================
+# ========== API ============================================
+# ===========================================================
+def table_sizes(rows):
+    """Jumlah baris per tabel untuk skala `rows` (diagnosa & pasien nakes)."""
+    return {
+        "diagnosa_masyarakat": rows,
+        "data_pasien_nakes": rows,
+        "laporan_nakes": max(rows // 1000, 20),
+        "csr_log": max(rows // 1000, 20),
+        "komentar_pengunjung": max(rows // 100, 50),
+    }
+
+
+def generate(out_dir, rows, seed=0, months=DEFAULT_MONTHS, source_dir=None, now=None):
+    """Tulis semua tabel sintetis ke `out_dir`; kembalikan {tabel: jumlah baris}."""
+    vocab = vocabulary(source_dir or data_store.DATA_DIR)
+    rng = np.random.default_rng(seed)
+    end = (now or datetime.now()).replace(microsecond=0)
+    start = end - timedelta(days=30 * months)
+    sizes = table_sizes(rows)
+    nik_pool = max(rows // RETURNING_RATIO, 1)
+    os.makedirs(out_dir, exist_ok=True)
+
+    def path(name):
+        return os.path.join(out_dir, f"{name}.csv")
+
+    written = {}
+    for name, date_col, source in [
+        ("diagnosa_masyarakat", "Tanggal", "masyarakat"),
+        ("data_pasien_nakes", "Tanggal Input", "nakes"),
+    ]:
+        written[name] = _visit_table(
+            path(name),
+            data_store.COLUMNS[name],
+            date_col,
+            sizes[name],
+            nik_pool,
+            start,
+            end,
+            vocab,
+            rng,
+            source,
+        )
+
+    reports, gov, pt = _reports(sizes["laporan_nakes"], start, end, vocab, rng)
+    for name, frame in [
+        ("laporan_nakes", reports),
+        ("log_pemerintah", gov),
+        ("log_pt", pt),
+        ("csr_log", _csr(sizes["csr_log"], start, end, vocab, rng)),
+        (
+            "komentar_pengunjung",
+            _comments(sizes["komentar_pengunjung"], start, end, vocab, rng),
+        ),
+    ]:
+        written[name] = _write(path(name), data_store.COLUMNS[name], [frame])
+    return written
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Buat data sintetis berskala besar untuk uji beban."
+    )
+    parser.add_argument("--rows", type=int, required=True)
+    parser.add_argument("--out", required=True, help="folder tujuan (data/ salinan)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--months", type=int, default=DEFAULT_MONTHS)
+    parser.add_argument(
+        "--overwrite",
+        action="store_true",
+        help="izinkan menimpa folder data/ aplikasi ini",
+    )
+    args = parser.parse_args()
+
+    if (
+        os.path.abspath(args.out) == os.path.abspath(data_store.DATA_DIR)
+        and not args.overwrite
+    ):
+        parser.error("--out menunjuk data/ asli; tambahkan --overwrite jika disengaja")
+
+    t0 = time.perf_counter()
+    written = generate(args.out, args.rows, seed=args.seed, months=args.months)
+    for name, n in written.items():
+        print(f"- {name}: {n} baris")
+    print(f"Selesai dalam {time.perf_counter() - t0:.1f} detik -> {args.out}")
@@ -0,0 +1,55 @@
+import os
+
+import pandas as pd
+import pytest
+
+import complaint_model
+
+MODEL_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    complaint_model.MODEL_PATH,
+)
+
+# Keluhan dengan kata yang tidak ada di data latih nakes
+OUT_OF_VOCABULARY = ["sakit gigi", "patah tulang kaki", "luka bakar", "mata minus"]
+
+
+@pytest.fixture(scope="module")
+def model():
+    keluhan = pd.Series(
+        ["batuk pilek", "pilek", "demam tinggi", "demam", "sakit perut", "mual"] * 3
+    )
+    diagnosa = pd.Series(
+        ["Common Cold", "Common Cold", "DBD", "Demam", "Gastritis", "Gastritis"] * 3
+    )
+    return complaint_model.train(keluhan, diagnosa)
+
+
+@pytest.mark.parametrize("keluhan", OUT_OF_VOCABULARY)
+def test_out_of_vocabulary_below_threshold(model, keluhan):
+    for _, p in model.predict(keluhan):
+        assert p < complaint_model.MIN_CONFIDENCE
+
+
+@pytest.mark.parametrize("keluhan", OUT_OF_VOCABULARY)
+def test_shipped_model_out_of_vocabulary(keluhan):
+    shipped = complaint_model.NaiveBayesModel.load(MODEL_PATH)
+    for _, p in shipped.predict(keluhan):
+        assert p < complaint_model.MIN_CONFIDENCE
+
+
+def test_known_complaint_is_confident(model):
+    label, p = model.predict("batuk pilek", k=1)[0]
+    assert label == "Common Cold"
+    assert p >= complaint_model.MIN_CONFIDENCE
+
+
+def test_batch_matches_single(model):
+    texts = pd.Series(["batuk pilek", "sakit gigi", ""])
+    batch = model.predict_batch(texts)
+    assert batch["Prediksi"].iloc[0] == "Common Cold"
+    assert batch["Keyakinan"].iloc[0] == pytest.approx(
+        model.predict("batuk pilek", k=1)[0][1], abs=1e-3
+    )
+    assert batch["Keyakinan"].iloc[1] < complaint_model.MIN_CONFIDENCE
+    assert batch["Prediksi"].iloc[2] is None
@@ -0,0 +1,75 @@
+import pytest
+
+import data_store
+import nik_index
+
+TABLE = "diagnosa_masyarakat"
+HEADER = "Nama,NIK,Umur,Jenis Kelamin,Alamat,Keluhan,Diagnosa,Tanggal\n"
+NIKS = [
+    "3500000000000001",
+    " 3500000000000002 ",
+    "0350000000000003",
+    "3500000000000004.0",
+    "35.000.000",
+    "bukan angka",
+    "",
+]
+
+
+def _line(i, nik):
+    return f"Pengguna {i},{nik},,L,Desa A,batuk,ISPA,2025-01-{i + 1:02d} 08:00:00\n"
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(data_store, "STORAGE_BACKEND", "csv")
+    monkeypatch.setattr(nik_index, "_state", None)
+    monkeypatch.setattr(nik_index, "_salt", b"garam-tes")
+    (tmp_path / "data").mkdir()
+    text = HEADER + "".join(_line(i, nik) for i, nik in enumerate(NIKS))
+    (tmp_path / "data" / f"{TABLE}.csv").write_text(text, encoding="utf-8")
+    (tmp_path / "data" / "data_pasien_nakes.csv").write_text(
+        "Nama,NIK,Umur,Jenis Kelamin,Alamat,Keluhan,Diagnosa,Tanggal Input\n",
+        encoding="utf-8",
+    )
+    data_store.invalidate()
+    yield tmp_path
+    data_store.invalidate()
+
+
+def test_append_and_rebuild_hash_the_same(data_dir):
+    nik_index.ensure_loaded()
+    data_store.append_rows(
+        TABLE,
+        [
+            {"Nama": f"Baru {i}", "NIK": nik, "Tanggal": "2025-02-01 08:00:00"}
+            for i, nik in enumerate(NIKS)
+        ],
+    )
+    appended = {h: dict(v) for h, v in nik_index._current_state()["entries"].items()}
+    rebuilt = nik_index.rebuild()["entries"]
+    assert appended == rebuilt
+
+    n = len(NIKS)
+    assert nik_index.lookup("0350000000000003") == {"masyarakat": [2, n + 2]}
+    assert nik_index.lookup("3500000000000002") == {"masyarakat": [1, n + 1]}
+    assert nik_index.lookup("3500000000000004") == {"masyarakat": [3, n + 3]}
+    assert nik_index.lookup("bukan angka") == {"masyarakat": [5, n + 5]}
+
+
+def test_journal_replay_matches_live_index(data_dir, monkeypatch):
+    nik_index.ensure_loaded()
+    data_store.append_rows(
+        TABLE,
+        [{"Nama": "Baru", "NIK": "3500000000000001", "Tanggal": "2025-02-01"}],
+    )
+    live = nik_index.lookup("3500000000000001")
+
+    monkeypatch.setattr(nik_index, "_state", None)
+
+    def no_build(source):
+        raise AssertionError("indeks dibangun ulang")
+
+    monkeypatch.setattr(nik_index, "_build_source", no_build)
+    assert nik_index.lookup("3500000000000001") == live == {"masyarakat": [0, 7]}
@@ -0,0 +1,85 @@
+import pandas as pd
+import pytest
+
+import data_store
+import diagnosis_rules
+import partitions
+
+TABLE = "diagnosa_masyarakat"
+HISTORY = """Nama,NIK,Umur,Jenis Kelamin,Alamat,Keluhan,Diagnosa,Tanggal
+Pengguna 1,3500000000000000,,Perempuan,Dusun 1,batuk,ISPA,2025-01-31 07:14:30
+Pengguna 2,35.000.000,,Laki-laki,Desa B,mencret,ISPA,31/01/2025
+Pengguna 3,3500000000000003,,Laki-laki,Desa A,pusing,ISPA,2025-02-03 00:00:00
+Pengguna 4,3500000000000004,,Laki-laki,Desa A,batuk,ISPA,2025-02-04 00:00:00
+"""
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(data_store, "STORAGE_BACKEND", "csv")
+    monkeypatch.setattr(diagnosis_rules, "_compiled", None)
+    (tmp_path / "data").mkdir()
+    (tmp_path / "data" / f"{TABLE}.csv").write_text(HISTORY, encoding="utf-8")
+    (tmp_path / "data" / "aturan_diagnosa.csv").write_text(
+        "diagnosa,kata_kunci\nISPA,batuk\nDiare,mencret\n", encoding="utf-8"
+    )
+    data_store.invalidate()
+    yield tmp_path
+    data_store.invalidate()
+
+
+def _partition_text(data_dir):
+    return {
+        key: (data_dir / path).read_text(encoding="utf-8")
+        for key, path in partitions.files(TABLE).items()
+    }
+
+
+def test_migrate_keeps_rows(data_dir):
+    expected = data_store.read_table(TABLE)
+    assert partitions.migrate(TABLE) == 3
+    data_store.invalidate()
+    assert data_store.is_partitioned(TABLE)
+    # nomor baris global mengikuti urutan partisi, isinya harus sama
+    pd.testing.assert_frame_equal(
+        data_store.read_table(TABLE).sort_values("Nama").reset_index(drop=True),
+        expected.sort_values("Nama").reset_index(drop=True),
+        check_categorical=False,
+    )
+    assert data_store.row_count(TABLE) == 4
+
+
+def test_append_goes_to_its_month(data_dir):
+    partitions.migrate(TABLE)
+    data_store.append_rows(
+        TABLE,
+        [
+            {
+                "Nama": "Pengguna 5",
+                "NIK": "3500000000000005",
+                "Tanggal": "2025-03-01 08:00:00",
+            }
+        ],
+    )
+    assert "2025-03" in partitions.files(TABLE)
+    df = data_store.read_table(TABLE)
+    assert df.loc[data_store.row_count(TABLE) - 1, "Nama"] == "Pengguna 5"
+
+
+def test_write_back_keeps_raw_text(data_dir):
+    partitions.migrate(TABLE)
+    diagnosis_rules.reclassify_history(apply=True)
+    raw = data_store.read_raw(TABLE).set_index("Nama")
+    assert raw.loc["Pengguna 2", "NIK"] == "35.000.000"
+    assert raw.loc["Pengguna 2", "Tanggal"] == "31/01/2025"
+    assert raw.loc["Pengguna 2", "Diagnosa"] == "Diare"
+    assert raw.loc["Pengguna 3", "Tanggal"] == "2025-02-03 00:00:00"
+
+
+def test_typed_frame_keeps_time_of_day(data_dir):
+    partitions.migrate(TABLE)
+    typed = data_store.read_table(TABLE)
+    midnight = typed[typed["Tanggal"].dt.month == 2]
+    partitions.write(TABLE, midnight)
+    assert "2025-02-03 00:00:00" in _partition_text(data_dir)["2025-02"]
@@ -0,0 +1,54 @@
+import pandas as pd
+import pytest
+
+import patient_import
+
+
+@pytest.fixture(autouse=True)
+def no_existing_rows(monkeypatch):
+    monkeypatch.setattr(patient_import, "_existing_keys", lambda: pd.Index([]))
+
+
+def _upload(tanggal):
+    n = len(tanggal)
+    return pd.DataFrame(
+        {
+            "Nama": [f"Pasien {i}" for i in range(n)],
+            "NIK": [f"35000000000000{i:02d}" for i in range(n)],
+            "Umur": [""] * n,
+            "Jenis Kelamin": ["L"] * n,
+            "Alamat": [""] * n,
+            "Keluhan": ["demam"] * n,
+            "Diagnosa": ["Demam"] * n,
+            "Tanggal Input": tanggal,
+        }
+    )
+
+
+def test_app_format_is_not_read_month_first():
+    valid, report = patient_import.validate(_upload(["2024-03-05 10:00:00"]))
+    assert report.empty
+    assert valid["Tanggal Input"].tolist() == ["2024-03-05 10:00:00"]
+
+
+def test_day_first_only_for_values_that_fail():
+    valid, report = patient_import.validate(
+        _upload(["2024-03-05", "25/03/2024", "25-03-2024 08:30"])
+    )
+    assert report.empty
+    assert valid["Tanggal Input"].tolist() == [
+        "2024-03-05 00:00:00",
+        "2024-03-25 00:00:00",
+        "2024-03-25 08:30:00",
+    ]
+
+
+def test_ambiguous_dates_are_rejected():
+    valid, report = patient_import.validate(_upload(["05/03/2024", "05/05/2024"]))
+    assert valid["Tanggal Input"].tolist() == ["2024-05-05 00:00:00"]
+    assert report["Kesalahan"].tolist() == ["Tanggal ambigu (hari/bulan)"]
+
+
+def test_invalid_date_is_not_reported_as_ambiguous():
+    _, report = patient_import.validate(_upload(["bukan tanggal"]))
+    assert report["Kesalahan"].tolist() == ["Tanggal tidak valid"]
@@ -0,0 +1,41 @@
+import pandas as pd
+import pytest
+
+import csv_loader
+import data_store
+
+HEADER = "timestamp,id_laporan,feedback,status_baru\n"
+GOOD = "2025-11-15 22:54:29,0,Evaluasi lapangan.,Diteruskan ke PT\n"
+
+
+@pytest.fixture
+def table(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "data").mkdir()
+    path = tmp_path / "data" / "log_pemerintah.csv"
+    path.write_text(HEADER + GOOD + ",1,no timestamp A,Selesai\n", encoding="utf-8")
+    data_store.invalidate()
+    yield path
+    data_store.invalidate()
+
+
+def _quarantined():
+    path = f"{csv_loader.QUARANTINE_DIR}/log_pemerintah.csv"
+    return pd.read_csv(path, dtype=str)["feedback"].tolist()
+
+
+def test_repair_then_new_bad_row_keeps_old_quarantine(table):
+    csv_loader.repair("log_pemerintah")
+    assert _quarantined() == ["no timestamp A"]
+    assert "no timestamp A" not in table.read_text(encoding="utf-8")
+
+    with open(table, "a", encoding="utf-8") as f:
+        f.write(",2,no timestamp B,Selesai\n")
+    csv_loader.load("log_pemerintah")
+    assert _quarantined() == ["no timestamp A", "no timestamp B"]
+
+
+def test_reload_does_not_duplicate_quarantine(table):
+    csv_loader.load("log_pemerintah")
+    csv_loader.load("log_pemerintah")
+    assert _quarantined() == ["no timestamp A"]
@@ -0,0 +1,43 @@
+import pandas as pd
+import pytest
+
+import data_store
+import diagnosis_rules
+
+RULES = "diagnosa,kata_kunci\nISPA,batuk;pilek\nDiare,mencret\n"
+HISTORY = """Nama,NIK,Umur,Jenis Kelamin,Alamat,Keluhan,Diagnosa,Tanggal
+Pengguna 1,3500000000000000,,Perempuan,Dusun 1,batuk,Belum teridentifikasi (segera periksa ke fasilitas kesehatan),2025-01-31 07:14:30
+Pengguna 2,35.000.000,,Laki-laki,Desa B,mencret,Belum teridentifikasi (segera periksa ke fasilitas kesehatan),31/01/2025
+Pengguna 3,,,Laki-laki,Desa A,pusing,Belum teridentifikasi (segera periksa ke fasilitas kesehatan),2025-02-03
+"""
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(data_store, "STORAGE_BACKEND", "csv")
+    monkeypatch.setattr(diagnosis_rules, "_compiled", None)
+    (tmp_path / "data").mkdir()
+    (tmp_path / "data" / "aturan_diagnosa.csv").write_text(RULES, encoding="utf-8")
+    (tmp_path / "data" / "diagnosa_masyarakat.csv").write_text(
+        HISTORY, encoding="utf-8"
+    )
+    data_store.invalidate()
+    yield tmp_path
+    data_store.invalidate()
+
+
+def test_apply_only_changes_diagnosa(data_dir):
+    changes = diagnosis_rules.reclassify_history(apply=True)
+    assert changes["Diagnosa Baru"].tolist() == ["ISPA", "Diare"]
+
+    before = pd.read_csv(pd.io.common.StringIO(HISTORY), dtype=str)
+    after = pd.read_csv(data_dir / "data" / "diagnosa_masyarakat.csv", dtype=str)
+    assert after["Diagnosa"].tolist() == [
+        "ISPA",
+        "Diare",
+        diagnosis_rules.DEFAULT_DIAGNOSA,
+    ]
+    pd.testing.assert_frame_equal(
+        after.drop(columns="Diagnosa"), before.drop(columns="Diagnosa")
+    )
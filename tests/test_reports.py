@@ -0,0 +1,107 @@
+import os
+
+import pytest
+
+import data_store
+import reports
+
+FIXTURE = {
+    "laporan_nakes": """laporan_id,timestamp,desa,penyakit,jumlah_kasus,urgensi,uraian,status
+0,2025-11-15 22:49:30,Desa X,ISPA,18,Tinggi,Batuk,Menunggu Pemerintah
+1,2025-11-16 06:47:05,Desa Y,Demam,14,Sedang,Demam,Menunggu Pemerintah
+""",
+    "log_pemerintah": """timestamp,id_laporan,feedback,status_baru
+2025-11-15 22:51:35,0,Diteruskan.,Diteruskan ke PT
+""",
+    "log_pt": """timestamp,id_laporan,feedback,status_baru
+2025-11-15 22:53:48,0,Evaluasi lapangan.,Diproses PT
+""",
+}
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(data_store, "STORAGE_BACKEND", "csv")
+    monkeypatch.setattr(reports, "_state", None)
+    monkeypatch.setattr(reports, "_by_status", None)
+    monkeypatch.setattr(reports, "_migrated", False)
+    (tmp_path / "data").mkdir()
+    for name, text in FIXTURE.items():
+        (tmp_path / "data" / f"{name}.csv").write_text(text, encoding="utf-8")
+    data_store.invalidate()
+    yield tmp_path
+    data_store.invalidate()
+
+
+def _reload(monkeypatch):
+    # proses baru: state dibaca dari snapshot + jurnal, tanpa membangun ulang
+    monkeypatch.setattr(reports, "_state", None)
+    monkeypatch.setattr(reports, "_by_status", None)
+
+    def no_build():
+        raise AssertionError("state dibangun ulang")
+
+    monkeypatch.setattr(reports, "_build", no_build)
+
+
+def test_event_appends_journal_not_snapshot(data_dir):
+    assert reports.status_of(0) == "Diproses PT"
+    snapshot = os.stat(reports.STATUS_PATH).st_mtime_ns
+
+    reports.record_event("pemerintah", 1, "Ditangani.", "Diproses Pemerintah")
+    reports.record_event("pt", 0, "Selesai.", "Selesai")
+    assert reports.status_of(1) == "Diproses Pemerintah"
+    assert os.stat(reports.STATUS_PATH).st_mtime_ns == snapshot
+    with open(reports.LOG_PATH, encoding="utf-8") as f:
+        assert len(f.readlines()) == 2
+
+
+def test_journal_replay_matches_live_state(data_dir, monkeypatch):
+    reports.ids()
+    reports.record_event("pemerintah", 1, "Ditangani.", "Diproses Pemerintah")
+    laporan_id = reports.create({"desa": "Desa Z", "penyakit": "Diare"})
+    reports.record_event("pt", 0, "Selesai.", "Selesai")
+    live = {i: reports.status_of(i) for i in reports.ids()}
+
+    _reload(monkeypatch)
+    assert {i: reports.status_of(i) for i in reports.ids()} == live
+    assert reports.ids("Selesai") == [0]
+    assert reports.status_of(laporan_id) == reports.STATUS_AWAL
+
+
+def test_outside_change_rebuilds(data_dir):
+    reports.ids()
+    with open(data_dir / "data" / "log_pt.csv", "a", encoding="utf-8") as f:
+        f.write("2025-11-16 08:00:00,1,Langsung ke PT.,Diproses PT\n")
+    data_store.invalidate()
+    assert reports.status_of(1) == "Diproses PT"
+
+
+def test_migrate_credits_status_to_its_source_log(data_dir):
+    # laporan lama tanpa ID, statusnya tertinggal dari event terakhir
+    (data_dir / "data" / "laporan_nakes.csv").write_text(
+        """laporan_id,timestamp,desa,penyakit,jumlah_kasus,urgensi,uraian,status
+,2025-11-15 22:49:30,Desa X,ISPA,18,Tinggi,Batuk,Diteruskan ke PT
+""",
+        encoding="utf-8",
+    )
+    data_store.invalidate()
+    assert reports.migrate() == 1
+
+    log = data_store.read_table("log_pemerintah")
+    assert log["status_baru"].tolist() == ["Diteruskan ke PT", "Diteruskan ke PT"]
+    assert len(data_store.read_table("log_pt")) == 1
+    assert data_store.read_table("laporan_nakes")["laporan_id"].tolist() == [0]
+
+
+def test_migrate_once_is_persisted(data_dir, monkeypatch):
+    calls = []
+    monkeypatch.setattr(reports, "migrate", lambda: calls.append(1) or 0)
+    reports.migrate_once()
+    reports.migrate_once()
+    # proses baru: penanda di disk yang mencegah migrasi ulang
+    monkeypatch.setattr(reports, "_migrated", False)
+    reports.migrate_once()
+    assert calls == [1]
+    assert os.path.exists(reports.MIGRATED_PATH)
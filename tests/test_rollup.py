@@ -0,0 +1,98 @@
+import os
+
+import pytest
+
+import data_store
+import rollup
+
+TABLE = "diagnosa_masyarakat"
+HISTORY = """Nama,NIK,Umur,Jenis Kelamin,Alamat,Keluhan,Diagnosa,Tanggal
+Pengguna 1,3500000000000001,Lansia (50+ tahun),L,Desa A,batuk,ISPA,2025-01-05 08:00:00
+Pengguna 2,3500000000000002,Lansia (50+ tahun),P,Desa A,mencret,Diare,2025-01-06 08:00:00
+"""
+JANUARI = [("2025", "01")]
+
+
+def _row(diagnosa, tanggal="2025-01-07 08:00:00"):
+    return {
+        "Nama": "Baru",
+        "NIK": "3500000000000009",
+        "Umur": "Lansia (50+ tahun)",
+        "Jenis Kelamin": "L",
+        "Diagnosa": diagnosa,
+        "Tanggal": tanggal,
+    }
+
+
+def _top(source="masyarakat"):
+    top = rollup.top_diagnoses(source, JANUARI)
+    return dict(zip(top["Diagnosa"], top["Jumlah Kasus"]))
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(data_store, "STORAGE_BACKEND", "csv")
+    monkeypatch.setattr(rollup, "_state", None)
+    (tmp_path / "data").mkdir()
+    (tmp_path / "data" / f"{TABLE}.csv").write_text(HISTORY, encoding="utf-8")
+    (tmp_path / "data" / "data_pasien_nakes.csv").write_text(
+        "Nama,NIK,Umur,Jenis Kelamin,Alamat,Keluhan,Diagnosa,Tanggal Input\n",
+        encoding="utf-8",
+    )
+    data_store.invalidate()
+    yield tmp_path
+    data_store.invalidate()
+
+
+def _reload(monkeypatch):
+    # proses baru: kubus dari snapshot + jurnal, tanpa membaca tabel
+    monkeypatch.setattr(rollup, "_state", None)
+
+    def no_build(source):
+        raise AssertionError("kubus dibangun ulang")
+
+    monkeypatch.setattr(rollup, "_build_source", no_build)
+
+
+def test_append_journals_deltas(data_dir):
+    assert _top() == {"ISPA": 1, "Diare": 1}
+    snapshot = os.stat(rollup.ROLLUP_PATH).st_mtime_ns
+
+    data_store.append_rows(TABLE, [_row("ISPA"), _row("ISPA")])
+    data_store.append_rows(TABLE, [_row("Diare", "2025-02-01 08:00:00")])
+    assert _top() == {"ISPA": 3, "Diare": 1}
+    assert os.stat(rollup.ROLLUP_PATH).st_mtime_ns == snapshot
+    with open(rollup.LOG_PATH, encoding="utf-8") as f:
+        assert len(f.readlines()) == 2
+
+
+def test_journal_replay_matches_live_cube(data_dir, monkeypatch):
+    rollup.years()
+    data_store.append_rows(TABLE, [_row("ISPA")])
+    data_store.append_rows(TABLE, [_row("Diare")])
+    live = _top()
+
+    _reload(monkeypatch)
+    assert _top() == live == {"ISPA": 2, "Diare": 2}
+
+
+def test_outside_change_rebuilds_source(data_dir):
+    rollup.years()
+    with open(data_dir / "data" / f"{TABLE}.csv", "a", encoding="utf-8") as f:
+        f.write(
+            "Luar,3500000000000010,Lansia (50+ tahun),L,Desa B,gatal,"
+            "Penyakit Kulit,2025-01-20 08:00:00\n"
+        )
+    data_store.invalidate()
+    assert _top() == {"ISPA": 1, "Diare": 1, "Penyakit Kulit": 1}
+
+
+def test_stale_journal_records_are_skipped(data_dir, monkeypatch):
+    rollup.years()
+    data_store.append_rows(TABLE, [_row("ISPA")])
+    # file ditulis ulang di luar aplikasi: jurnal lama tidak lagi menyambung
+    (data_dir / "data" / f"{TABLE}.csv").write_text(HISTORY, encoding="utf-8")
+    data_store.invalidate()
+    monkeypatch.setattr(rollup, "_state", None)
+    assert _top() == {"ISPA": 1, "Diare": 1}
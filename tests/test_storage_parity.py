@@ -0,0 +1,110 @@
+import shutil
+import threading
+
+import pandas as pd
+import pytest
+
+import data_store
+import sqlite_store
+
+# Salinan kecil data contoh, termasuk record log yang terbungkus kutip,
+# ID "0.0" dan baris tanpa tanggal (dikarantina)
+FIXTURE = {
+    "log_pemerintah": """timestamp,id_laporan,feedback,status_baru
+"2025-11-15 22:50:46,0,""Laporan diterima, akan ditindaklanjuti."",Diproses Pemerintah",,,
+"2025-11-15 22:51:35,0,""Diteruskan ke perusahaan."",Diteruskan ke PT",,,
+2025-11-15 22:54:29,0.0,Evaluasi lapangan.,Diteruskan ke PT
+"2025-11-16 06:48:13,1,""Penyuluhan kesehatan."",Diproses Pemerintah",,,
+,1.0,tanpa tanggal,Selesai
+2025-11-16 07:12:36,1.0,a,Selesai
+""",
+    "laporan_nakes": """laporan_id,timestamp,desa,penyakit,jumlah_kasus,urgensi,uraian,status
+0.0,2025-11-15 22:49:30,Desa X,ISPA,18,Tinggi,"Batuk, demam",Selesai
+1.0,2025-11-16 06:47:05,Desa Y,Demam,14,Sedang,Stok obat terbatas,Selesai
+2,2025-11-17 16:12:00,Desa Merapi,ISPA,20,Sedang,keterangan,Diproses PT
+""",
+    "diagnosa_masyarakat": """Nama,NIK,Umur,Jenis Kelamin,Alamat,Keluhan,Diagnosa,Tanggal
+Pengguna 1,3500000000000000,Anak-anak (6–11 tahun),Perempuan,Dusun 1,gatal-gatal,Penyakit Kulit,2025-01-31 07:14:30
+Pengguna 2,3500000000000001,Remaja (12–18 tahun),P,Desa B,tenggorokan sakit,Belum teridentifikasi,2025-01-02 07:14:30
+Pengguna 3,,Lansia (50+ tahun),L,Desa A,batuk,ISPA,2025-02-03 08:00:00
+""",
+}
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "data").mkdir()
+    for name, text in FIXTURE.items():
+        (tmp_path / "data" / f"{name}.csv").write_text(text, encoding="utf-8")
+    # koneksi sqlite per thread menunjuk ke db folder kerja ini
+    monkeypatch.setattr(sqlite_store, "_local", threading.local())
+    data_store.invalidate()
+    yield tmp_path
+    data_store.invalidate()
+
+
+def _load(backend, monkeypatch):
+    monkeypatch.setattr(data_store, "STORAGE_BACKEND", backend)
+    data_store.invalidate()
+    return {name: data_store.read_table(name) for name in FIXTURE}
+
+
+def test_sqlite_frames_equal_csv(data_dir, monkeypatch):
+    csv_frames = _load("csv", monkeypatch)
+    monkeypatch.setattr(data_store, "STORAGE_BACKEND", "sqlite")
+    sqlite_store.migrate()
+    sqlite_frames = _load("sqlite", monkeypatch)
+
+    for name in FIXTURE:
+        pd.testing.assert_frame_equal(sqlite_frames[name], csv_frames[name])
+
+    # record terbungkus diurai ulang: laporan 0 & 1 punya riwayat lengkap
+    log = sqlite_frames["log_pemerintah"]
+    assert log["id_laporan"].tolist() == [0, 0, 0, 1, 1]
+    assert log["timestamp"].notna().all()
+
+
+def test_sqlite_pages_match_csv(data_dir, monkeypatch):
+    monkeypatch.setattr(data_store, "STORAGE_BACKEND", "csv")
+    expected = data_store.read_rows("log_pemerintah", 2, 6)
+    count = data_store.row_count("log_pemerintah")
+
+    monkeypatch.setattr(data_store, "STORAGE_BACKEND", "sqlite")
+    sqlite_store.migrate()
+    data_store.invalidate()
+    pd.testing.assert_frame_equal(
+        data_store.read_rows("log_pemerintah", 2, 6), expected
+    )
+    assert data_store.row_count("log_pemerintah") == count
+
+
+def test_migrate_quarantines_like_csv(data_dir, monkeypatch):
+    monkeypatch.setattr(data_store, "STORAGE_BACKEND", "sqlite")
+    sqlite_store.migrate()
+    quarantine = pd.read_csv(data_dir / "data" / "quarantine" / "log_pemerintah.csv")
+    assert quarantine["feedback"].tolist() == ["tanpa tanggal"]
+    shutil.rmtree(data_dir / "data" / "quarantine")
+
+
+def test_sqlite_signature_changes_only_for_written_table(data_dir, monkeypatch):
+    monkeypatch.setattr(data_store, "STORAGE_BACKEND", "sqlite")
+    sqlite_store.migrate()
+    before = data_store.table_signature("diagnosa_masyarakat")
+    data_store.append_rows(
+        "log_pt",
+        [
+            {
+                "timestamp": "2025-11-20 08:00:00",
+                "id_laporan": 2,
+                "status_baru": "Selesai",
+            }
+        ],
+    )
+    assert data_store.table_signature("diagnosa_masyarakat") == before
+
+    data_store.append_rows(
+        "diagnosa_masyarakat",
+        [{"Nama": "Pengguna 4", "NIK": "3500000000000004", "Diagnosa": "ISPA"}],
+    )
+    assert data_store.table_signature("diagnosa_masyarakat") != before
@@ -0,0 +1,61 @@
+import pandas as pd
+import pytest
+from streamlit.testing.v1 import AppTest
+
+import data_store
+import write_queue
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(data_store, "STORAGE_BACKEND", "csv")
+    (tmp_path / "data").mkdir()
+    data_store.invalidate()
+    yield tmp_path
+    write_queue.flush(5)
+    data_store.invalidate()
+
+
+def test_submitted_rows_are_written(data_dir):
+    tickets = [
+        write_queue.submit(
+            "komentar_pengunjung",
+            {"Nama": f"Warga {i}", "Komentar": "ok", "Waktu": "2025-11-20 08:00:00"},
+        )
+        for i in range(3)
+    ]
+    assert write_queue.flush(5)
+    assert all(t.ok for t in tickets)
+    df = pd.read_csv(data_dir / "data" / "komentar_pengunjung.csv", dtype=str)
+    assert df["Nama"].tolist() == ["Warga 0", "Warga 1", "Warga 2"]
+
+
+def test_failed_write_finishes_ticket_with_error(data_dir):
+    ticket = write_queue.submit("tabel_tidak_ada", {"a": 1})
+    assert write_queue.flush(5)
+    assert ticket.done and not ticket.ok
+    assert ticket.error is not None
+
+
+def _status_page():
+    import write_queue
+
+    write_queue.show_status("tiket", "✅ Tersimpan")
+
+
+def test_show_status_pending_then_confirmed():
+    ticket = write_queue.Ticket("komentar_pengunjung", {})
+    at = AppTest.from_function(_status_page)
+    at.session_state["tiket"] = ticket
+    at.run()
+    assert [i.value for i in at.info] == ["⏳ Data diterima dan sedang disimpan..."]
+    assert not at.success
+
+    ticket._finish()
+    at.run()
+    assert [s.value for s in at.success] == ["✅ Tersimpan"]
+    assert "tiket" not in at.session_state
+
+    at.run()
+    assert not at.success and not at.info
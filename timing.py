@@ -0,0 +1,157 @@
+import collections
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+
+# ===========================================================
+# ========== INSTRUMENTASI WAKTU PER BAGIAN =================
+# ===========================================================
+# Pengukuran ringan untuk bagian-bagian rerun (baca CSV, filter, grafik,
+# Excel, encoding gambar, satu halaman penuh). Setiap pengukuran (waktu,
+# jumlah baris, jumlah byte) masuk ke ring buffer di memori yang dibagi
+# antar sesi; halaman Developer "Diagnostik Kinerja" menampilkan p50/p95
+# per bagian dan mengekspornya sebagai JSONL.
+#
+#     with timing.section("csr:filter") as span:
+#         df_view = ...
+#         span.rows = len(df_view)
+#
+#     @timing.timed("excel")            # rows/bytes diisi dari hasil
+#     def frame_to_excel(df, sheet_name): ...
+#
+# Diatur lewat env SIPETUALANG_TIMING_BUFFER (jumlah rekaman, default
+# 5000); SIPETUALANG_TIMING=0 mematikan pencatatan.
+
+BUFFER_SIZE = int(os.environ.get("SIPETUALANG_TIMING_BUFFER", "5000"))
+ENABLED = os.environ.get("SIPETUALANG_TIMING", "1") != "0"
+
+_records = collections.deque(maxlen=BUFFER_SIZE)
+_lock = threading.Lock()
+
+
+class Span:
+    """Data satu pengukuran; `rows` / `nbytes` boleh diisi di dalam blok."""
+
+    __slots__ = ("name", "rows", "nbytes")
+
+    def __init__(self, name, rows=None, nbytes=None):
+        self.name = name
+        self.rows = rows
+        self.nbytes = nbytes
+
+
+def _record(span, elapsed, error):
+    record = {
+        "ts": round(time.time(), 3),
+        "section": span.name,
+        "ms": round(elapsed * 1000, 3),
+        "rows": span.rows,
+        "bytes": span.nbytes,
+        "thread": threading.current_thread().name,
+    }
+    if error:
+        record["error"] = error
+    with _lock:
+        _records.append(record)
+
+
+@contextmanager
+def section(name, rows=None, nbytes=None):
+    """Ukur waktu blok `with` sebagai bagian `name`; yield Span."""
+    span = Span(name, rows, nbytes)
+    if not ENABLED:
+        yield span
+        return
+    start = time.perf_counter()
+    error = None
+    try:
+        yield span
+    except Exception as exc:
+        error = type(exc).__name__
+        raise
+    finally:
+        _record(span, time.perf_counter() - start, error)
+
+
+def _measure(span, result):
+    if isinstance(result, (bytes, bytearray, str)):
+        span.nbytes = len(result)
+    elif hasattr(result, "shape"):
+        span.rows = len(result)
+
+
+def timed(name):
+    """Dekorator: ukur setiap panggilan fungsi.
+
+    `name` berupa string, atau fungsi (argumen yang sama) -> string. Jumlah
+    baris (DataFrame) / byte (bytes, str) diambil dari nilai kembalian.
+    """
+
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            label = name(*args, **kwargs) if callable(name) else name
+            with section(label) as span:
+                result = func(*args, **kwargs)
+                _measure(span, result)
+            return result
+
+        return wrapper
+
+    return decorate
+
+
+# ===========================================================
+# ========== LAPORAN ========================================
+# ===========================================================
+def records():
+    """Salinan isi ring buffer (terlama dulu)."""
+    with _lock:
+        return list(_records)
+
+
+def clear():
+    with _lock:
+        _records.clear()
+
+
+def summary():
+    """p50/p95/max per bagian, diurutkan dari total waktu terbesar."""
+    df = pd.DataFrame(records(), columns=["section", "ms", "rows", "bytes"])
+    df[["rows", "bytes"]] = df[["rows", "bytes"]].apply(pd.to_numeric)
+    if df.empty:
+        return pd.DataFrame(
+            columns=[
+                "section",
+                "n",
+                "p50_ms",
+                "p95_ms",
+                "max_ms",
+                "total_ms",
+                "rows",
+                "bytes",
+            ]
+        )
+    grouped = df.groupby("section")
+    out = pd.DataFrame(
+        {
+            "n": grouped["ms"].size(),
+            "p50_ms": grouped["ms"].quantile(0.5),
+            "p95_ms": grouped["ms"].quantile(0.95),
+            "max_ms": grouped["ms"].max(),
+            "total_ms": grouped["ms"].sum(),
+            "rows": grouped["rows"].sum(min_count=1),
+            "bytes": grouped["bytes"].sum(min_count=1),
+        }
+    ).round(2)
+    return out.sort_values("total_ms", ascending=False).reset_index()
+
+
+def to_jsonl():
+    """Isi ring buffer sebagai JSON Lines (satu rekaman per baris)."""
+    return "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records())
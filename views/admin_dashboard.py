@@ -0,0 +1,118 @@
+import os
+
+import streamlit as st
+
+from period_table import show_period_table
+import assets
+import data_store
+import exports
+import write_queue
+
+ANNOUNCE_PATH = "data/pengumuman.txt"
+
+# ===========================================================
+# ========== DASHBOARD ADMIN ================================
+# ===========================================================
+st.header("👩🏻‍⚕️ Dashboard Admin")
+st.warning("Halaman ini hanya untuk pengelola data.")
+
+# --- Upload Banner Gambar ---
+st.subheader("🖼️ Unggah Banner Gambar")
+uploaded_banner = st.file_uploader(
+    "Pilih file banner (JPG/PNG)", type=["jpg", "jpeg", "png"]
+)
+if uploaded_banner:
+    # proses sekali per file unggahan, bukan di setiap rerun
+    if st.session_state.get("banner_upload_id") != uploaded_banner.file_id:
+        assets.save_banner(uploaded_banner)
+        st.session_state["banner_upload_id"] = uploaded_banner.file_id
+    st.success(
+        "✅ Banner berhasil diperbarui! Coba buka Informaasi dan Edukasi Kesehatan untuk melihat hasilnya."
+    )
+    st.image(
+        assets.asset_path("banner", width=1600),
+        caption="Banner Baru",
+        use_container_width=True,
+    )
+
+st.markdown("---")
+
+# --- 📢 Fitur Pengumuman ---
+st.subheader("📢 Atur Pengumuman Desa")
+os.makedirs("data", exist_ok=True)
+
+current_announcement = ""
+if os.path.exists(ANNOUNCE_PATH):
+    with open(ANNOUNCE_PATH, "r", encoding="utf-8") as f:
+        current_announcement = f.read()
+
+new_announcement = st.text_area(
+    "Tulis pengumuman (misal: Posyandu minggu depan di Balai Desa!)",
+    value=current_announcement,
+    height=100,
+)
+if st.button("💾 Simpan Pengumuman"):
+    with open(ANNOUNCE_PATH, "w", encoding="utf-8") as f:
+        f.write(new_announcement.strip())
+    st.success("📢 Pengumuman berhasil disimpan! Akan tampil di Dashboard Publik.")
+
+st.markdown("---")
+
+# ===========================================================
+# ========== TAMBAHAN: DATA DIAGNOSA MASYARAKAT =============
+# ===========================================================
+st.subheader("🩺 Data Diagnosa Masyarakat")
+
+if data_store.table_exists("diagnosa_masyarakat"):
+    total_diagnosa = data_store.row_count("diagnosa_masyarakat")
+    st.write(f"Total data diagnosa masyarakat: **{total_diagnosa}**")
+    show_period_table("diagnosa_masyarakat", "Tanggal", key="bulan_diagnosa_admin")
+
+    # Tombol Unduh Data Diagnosa (file dibuat saat diminta)
+    exports.download_on_demand(
+        label="📥 Unduh Data Diagnosa (Excel)",
+        build=lambda: exports.table_excel("diagnosa_masyarakat", "Data_Diagnosa"),
+        file_name="Data_Diagnosa_Masyarakat.xlsx",
+        mime=exports.XLSX_MIME,
+        key="unduh_diagnosa_admin",
+        prepare_label="⚙️ Siapkan Data Diagnosa (Excel)",
+        signature=data_store.table_signature("diagnosa_masyarakat"),
+    )
+
+else:
+    st.info("⚠️ Belum ada data diagnosa masyarakat yang masuk.")
+
+with st.expander("📊 Antrian Penulisan Form Publik"):
+    antrian = write_queue.metrics()
+    kolom_antrian = st.columns(4)
+    kolom_antrian[0].metric("Menunggu", antrian["depth"])
+    kolom_antrian[1].metric("Tertulis", antrian["written"])
+    kolom_antrian[2].metric("Latensi p50 (ms)", antrian["latency_p50_ms"])
+    kolom_antrian[3].metric("Latensi p95 (ms)", antrian["latency_p95_ms"])
+    st.caption(
+        f"{antrian['batches']} batch, terbesar {antrian['max_batch']} baris, "
+        f"{antrian['failed']} gagal."
+    )
+
+# ===========================================================
+# ========== TAMBAHAN: DATA PASIEN NAKES ====================
+# ===========================================================
+st.markdown("---")
+st.subheader("💊 Data Pasien dari Tenaga Kesehatan (Nakes)")
+
+if data_store.table_exists("data_pasien_nakes"):
+    total_nakes = data_store.row_count("data_pasien_nakes")
+    st.write(f"Total data pasien dari nakes: **{total_nakes}**")
+    show_period_table("data_pasien_nakes", "Tanggal Input", key="bulan_nakes_admin")
+
+    exports.download_on_demand(
+        label="📥 Unduh Data Pasien Nakes (Excel)",
+        build=lambda: exports.table_excel("data_pasien_nakes", "Data_Pasien_Nakes"),
+        file_name="Data_Pasien_Oleh_Nakes.xlsx",
+        mime=exports.XLSX_MIME,
+        key="unduh_nakes_admin",
+        prepare_label="⚙️ Siapkan Data Pasien Nakes (Excel)",
+        signature=data_store.table_signature("data_pasien_nakes"),
+    )
+else:
+    st.info("📭 Belum ada data dari Tenaga Kesehatan yang masuk.")
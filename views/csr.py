@@ -0,0 +1,3 @@
+from csr_tracker_page import show_csr_tracker
+
+show_csr_tracker()
@@ -0,0 +1,136 @@
+from datetime import datetime
+
+import streamlit as st
+
+import complaint_model
+import data_store
+import diagnosis_rules
+import nik_index
+import write_queue
+
+# ===========================================================
+# ========== FITUR CEK DIAGNOSA DINI ========================
+# ===========================================================
+st.header("🩺 Cek Diagnosa Dini Berdasarkan Keluhan")
+
+st.markdown("""
+Isi form di bawah ini untuk mendapatkan perkiraan diagnosa awal berdasarkan keluhan Anda.  
+⚠️ *Hasil ini bukan pengganti pemeriksaan medis, segera periksa ke fasilitas kesehatan terdekat untuk kepastian diagnosis.*
+""")
+
+
+@st.fragment
+def diagnosis_form():
+    # --- Form Input Data Masyarakat ---
+    with st.form("form_diagnosa"):
+        st.markdown(
+            """
+            <div style="text-align:center;">
+            """,
+            unsafe_allow_html=True,
+        )
+
+        col1, col2 = st.columns(2)
+        with col1:
+            submitted = st.form_submit_button("📸 Scan Kartu Tanda Penduduk (KTP)")
+            st.markdown("Scan KTP untuk isi data otomatis, atau isi formulir di bawah.")
+            nama = st.text_input("👤 Nama Pasien")
+            nik = st.text_input("🆔 NIK")
+            usia = st.selectbox(
+                "🎂 Kelompok Umur",
+                [
+                    "",
+                    "Ibu Hamil",
+                    "Bayi/Balita (0–5 tahun)",
+                    "Anak-anak (6–11 tahun)",
+                    "Remaja (12–18 tahun)",
+                    "PUS/WUS (19–49 tahun)",
+                    "Lansia (50+ tahun)",
+                ],
+            )
+
+        with col2:
+            jenis_kelamin = st.selectbox("🚻 Jenis Kelamin", ["Laki-laki", "Perempuan"])
+            alamat = st.text_area("🏠 Alamat")
+            keluhan = st.text_area(
+                "💬 Keluhan Utama (contoh: batuk, pilek, tenggorokan sakit)"
+            )
+
+        # --- Tambahan: tombol & total data sejajar ---
+        col1, col2 = st.columns([2, 1])
+
+        with col1:
+            submitted = st.form_submit_button("🔍 Cek Diagnosa")
+
+        with col2:
+            # Tampilkan total data diagnosa di samping tombol
+            total_data = data_store.row_count("diagnosa_masyarakat")
+            st.markdown(
+                f"""
+                <p style='text-align:right; color:#333; margin-top:8px;'>
+                    Total data diagnosa: {total_data}
+                </p>
+                """,
+                unsafe_allow_html=True,
+            )
+
+    if submitted:
+        if not nama or not nik or not keluhan:
+            st.error(
+                "⚠️ Mohon isi minimal **Nama**, **NIK**, dan **Keluhan** untuk melanjutkan."
+            )
+        else:
+            # --- Analisis Diagnosa Berdasarkan Kata Kunci ---
+            diagnosa = diagnosis_rules.classify(keluhan)
+
+            # --- Saran model (dilatih dari diagnosa nakes) ---
+            # Hanya ditampilkan; kolom Diagnosa tetap hasil aturan kata kunci
+            saran = [
+                (label, p)
+                for label, p in complaint_model.predict(keluhan, k=3)
+                if p >= complaint_model.MIN_CONFIDENCE
+            ]
+
+            # --- Tampilkan Hasil Diagnosa ---
+            st.success(f"🩺 **Hasil Analisis:** {diagnosa}")
+            if saran:
+                st.caption(
+                    "Saran model (dari diagnosa nakes, bukan hasil analisis): "
+                    + ", ".join(f"{label} ({p:.0%})" for label, p in saran)
+                )
+            st.info(
+                "💡 Segera lakukan pemeriksaan ke fasilitas kesehatan terdekat untuk memastikan diagnosa dan mendapatkan pengobatan yang tepat."
+            )
+
+            # --- Cek riwayat NIK (indeks hash, tanpa scan file) ---
+            kunjungan, ganda = nik_index.visit_flags(nik, "masyarakat")
+
+            # --- Simpan ke CSV ---
+            tanggal = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+            st.session_state["tiket_diagnosa"] = write_queue.submit(
+                "diagnosa_masyarakat",
+                {
+                    "Nama": nama,
+                    "NIK": nik,
+                    "Umur": usia,
+                    "Jenis Kelamin": jenis_kelamin,
+                    "Alamat": alamat,
+                    "Keluhan": keluhan,
+                    "Diagnosa": diagnosa,
+                    "Tanggal": tanggal,
+                },
+            )
+            write_queue.show_status(
+                "tiket_diagnosa",
+                "✅ Data berhasil disimpan dan akan dianalisis di Dashboard Admin.",
+            )
+            if ganda:
+                st.warning(
+                    "⚠️ NIK ini sudah melakukan cek diagnosa hari ini, data mungkin ganda."
+                )
+            elif kunjungan:
+                st.info(f"🔁 NIK ini sudah tercatat {kunjungan} kali sebelumnya.")
+
+
+diagnosis_form()
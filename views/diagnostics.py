@@ -0,0 +1,53 @@
+import pandas as pd
+import streamlit as st
+
+import exports
+import timing
+import warmup
+import write_queue
+
+# ===========================================================
+# ========== DIAGNOSTIK KINERJA (DEVELOPER) =================
+# ===========================================================
+st.header("⏱️ Diagnostik Kinerja")
+st.info(
+    f"Waktu per bagian rerun dari {len(timing.records())} rekaman terakhir "
+    f"(buffer maksimum {timing.BUFFER_SIZE}, dibagi semua sesi)."
+)
+
+ringkasan = timing.summary()
+if ringkasan.empty:
+    st.info("Belum ada rekaman waktu. Buka halaman lain lalu kembali ke sini.")
+else:
+    st.dataframe(ringkasan, use_container_width=True, hide_index=True)
+
+with st.expander("🧾 Rekaman Terbaru"):
+    terbaru = pd.DataFrame(timing.records()[-200:][::-1])
+    st.dataframe(terbaru, use_container_width=True, hide_index=True)
+
+col1, col2 = st.columns(2)
+with col1:
+    exports.download_on_demand(
+        label="📥 Unduh Rekaman (JSONL)",
+        build=lambda: timing.to_jsonl().encode("utf-8"),
+        file_name="sipetualang_timing.jsonl",
+        mime="application/jsonl",
+        key="unduh_timing",
+        prepare_label="⚙️ Siapkan Rekaman (JSONL)",
+    )
+with col2:
+    if st.button("🧹 Kosongkan Rekaman"):
+        timing.clear()
+        st.rerun()
+
+st.markdown("---")
+st.subheader("🔥 Pemanasan Saat Start")
+status = warmup.status()
+if status["ready"]:
+    st.success("Pemanasan selesai.")
+else:
+    st.warning("Pemanasan belum selesai.")
+st.json(status["steps"])
+
+st.subheader("📝 Antrian Tulis Form Publik")
+st.json(write_queue.metrics())
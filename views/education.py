@@ -0,0 +1,149 @@
+import os
+
+import streamlit as st
+
+import assets
+
+# ===========================================================
+# ============ Informasi & Edukasi Kesehatan ================
+# ===========================================================
+DATA_DIR = "data"  # folder tempat file disimpan
+BANNER_PATH = os.path.join(DATA_DIR, "banner.jpg")
+ANNOUNCE_PATH = os.path.join(DATA_DIR, "pengumuman.txt")
+
+# st.image("data/banner.jpg")
+
+# st.markdown(
+#     f"<div class='banner'>📢 <b>Pengumuman:</b> Posyandu Hari Minggu Di Balai Desa X</div>",
+#     unsafe_allow_html=True,
+# )
+
+# ============================================================
+# 1) INFORMASI
+# ============================================================
+st.subheader("📰 INFORMASI")
+
+# Pengumuman
+if os.path.exists(ANNOUNCE_PATH):
+    pengumuman = open(ANNOUNCE_PATH, "r", encoding="utf-8").read().strip()
+    if pengumuman:
+        st.markdown(
+            """
+            <div style="
+                padding:15px;
+                border-radius:10px;
+                background:#FFF4D6;
+                border-left:10px solid #FFBB33;
+                margin-bottom:15px;">
+                <span style="font-size:20px;">📢</span> 
+                <b>Pengumuman:</b> """
+            + pengumuman
+            + """
+            </div>
+            """,
+            unsafe_allow_html=True,
+        )
+
+# Banner
+if os.path.exists(BANNER_PATH):
+    st.image(assets.asset_path("banner", width=1600), use_container_width=True)
+else:
+    st.info("📸 Belum ada banner. Unggah dari menu admin.")
+
+# ============================================================
+# 2) EDUKASI KESEHATAN (GRID + CARD)
+# ============================================================
+st.subheader("📘 EDUKASI KESEHATAN")
+
+daftar_buku = [
+    {
+        "icon": "buku_profil",
+        "judul": "Profil Kesehatan Masyarakat",
+        "deskripsi": "Profil Kesehatan Masyarakat Lingkar Tambang Kabupaten Lahat 2025.",
+        "link": "https://heyzine.com/flip-book/f8c084b932.html",
+    },
+    {
+        "icon": "buku_saku",
+        "judul": "Masyarakat Sehat Lingkar Tambang",
+        "deskripsi": "Panduan ringkas untuk masyarakat sekitar tambang.",
+        "link": "https://heyzine.com/flip-book/e01487ccf7.html",
+    },
+    {
+        "icon": "buku_anak",
+        "judul": "Suara Kecilku Di Bumi Batu Bara",
+        "deskripsi": "Buku ajar untuk anak-anak di lingkar tambang.",
+        "link": "https://heyzine.com/flip-book/e2b1493dcd.html",
+    },
+]
+
+# Grid 2 kolom otomatis responsif
+cols = st.columns(3)
+
+for i, buku in enumerate(daftar_buku):
+
+    # Icon dari URL statis (di-cache browser)
+    try:
+        icon_src = assets.image_src(buku["icon"])
+        img_html = f'<img src="{icon_src}" style="width:140px; height:180px; border-radius:0px;">'
+    except:
+        img_html = "<div style='font-size:50px;'>📘</div>"
+
+    with cols[i]:
+        st.markdown(
+            f"""
+            <div style="
+                background:white;
+                border-radius:15px;
+                padding:15px;
+                margin-bottom:20px;
+                border:1px solid #E0E0E0;
+                box-shadow:0 2px 6px rgba(0,0,0,0.05);
+                text-align:center;
+                height: 400px;
+            ">
+                {img_html}
+                <h5 style="margin-top:10px;">{buku['judul']}</h5>
+                <p style="color:#555; font-size:12px; height:50px;">{buku['deskripsi']}</p>
+                <a href="{buku['link']}" target="_blank">
+                    <button style="
+                        background:#4A90E2;
+                        color:white;
+                        padding:6px 14px;
+                        border:none;
+                        border-radius:8px;
+                        cursor:pointer;
+                        font-size:15px;
+                    ">🔗 Buka Buku</button>
+                </a>
+            </div>
+            """,
+            unsafe_allow_html=True,
+        )
+
+# ============================================================
+# 3) KORAN ONLINE (CARD STYLE)
+# ============================================================
+st.subheader("🗞️ KORAN SIPETUALANG")
+
+st.markdown(
+    """
+    <div style="
+        background:#E3F2FD;
+        padding:20px;
+        border-radius:12px;
+        border:1px solid #90CAF9;
+    ">
+        <span style="font-size:35px;">📰</span>
+        <b>PT ABC Salurkan Bantuan untuk Masyarakat Lingkar Tambang</b>
+        <p style="margin-top:10px;color:#333;">
+            Lahat — Sebagai perusahaan tambang yang beroperasi di wilayah lingkar tambang, PT ABC kembali menunjukkan komitmennya dalam meningkatkan kesejahteraan masyarakat sekitar. Melalui program tanggung jawab sosial perusahaan (CSR), PT ABC menyalurkan berbagai bentuk bantuan yang menyasar kebutuhan kesehatan, pendidikan, dan lingkungan.
+        </p>
+        <a href="#" style="
+            text-decoration:none;
+            color:#0D47A1;
+            font-weight:bold;
+        ">Baca selengkapnya…</a>
+    </div>
+    """,
+    unsafe_allow_html=True,
+)
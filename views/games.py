@@ -0,0 +1,60 @@
+import os
+
+import streamlit as st
+
+import assets
+
+st.header("🎮 Games Sanitary Camp")
+
+st.markdown(
+    """
+    <p style='color:#444; font-size:16px;'>
+        Nikmati permainan edukasi interaktif yang dirancang untuk memberikan pengetahuan kesehatan 
+        dengan cara yang menyenangkan. Klik pada gambar untuk mulai bermain!
+    </p>
+    """,
+    unsafe_allow_html=True,
+)
+
+st.markdown(
+    """
+    <style>
+        .game-card {
+            background: #ffffff;
+            border-radius: 12px;
+            padding: 15px;
+            box-shadow: 0 4px 12px rgba(0,0,0,0.1);
+            transition: 0.2s;
+        }
+        .game-card:hover {
+            transform: scale(1.02);
+            box-shadow: 0 6px 16px rgba(0,0,0,0.18);
+        }
+        .game-img {
+            border-radius: 10px;
+            width: 100%;
+            height: auto;
+            cursor: pointer;
+        }
+    </style>
+    """,
+    unsafe_allow_html=True,
+)
+
+img_path = assets.asset_path("game_preview", width=1200)
+
+if os.path.exists(img_path):
+    img_src = assets.image_src("game_preview", width=1200)
+
+    st.markdown(
+        f"""
+        <a href="https://sanitary-camp.berandadigital.net" target="_blank">
+            <div class="game-card">
+                <img src="{img_src}" class="game-img"/>
+            </div>
+        </a>
+        """,
+        unsafe_allow_html=True,
+    )
+else:
+    st.error("❌ Gambar preview game tidak ditemukan di folder data/")
@@ -0,0 +1,53 @@
+import streamlit as st
+
+import reports
+
+# ===========================================================
+# =============== DASHBOARD PEMERINTAH ======================
+# ===========================================================
+st.title("Dashboard Pemerintah")
+
+
+@st.fragment
+def government_feedback_panel():
+    df = reports.table()
+
+    if df.empty:
+        st.info("Belum ada laporan dari nakes.")
+    else:
+        st.dataframe(df)
+
+        idx = st.selectbox("Pilih ID Laporan", df.index)
+
+        feedback = st.text_area("Feedback / Tindakan Pemerintah")
+
+        status_baru = st.selectbox(
+            "Status Laporan", ["Diproses Pemerintah", "Diteruskan ke PT", "Selesai"]
+        )
+
+        if st.button("Kirim Feedback"):
+            # simpan feedback sebagai event; status terkini ikut diperbarui
+            reports.record_event("pemerintah", idx, feedback, status_baru)
+
+            st.success("Tindakan pemerintah disimpan!")
+
+        st.markdown("### 🗂️ Riwayat Tindakan Laporan")
+
+        # Riwayat hanya dari baris event milik laporan yang dipilih
+        riwayat = reports.history(idx)
+        riwayat_pem = riwayat["pemerintah"]
+        riwayat_pt = riwayat["pt"]
+
+        if riwayat_pem.empty and riwayat_pt.empty:
+            st.info("Belum ada riwayat tindakan untuk laporan ini.")
+        else:
+            if not riwayat_pem.empty:
+                st.markdown("#### 🏛️ Riwayat Tindakan")
+                st.dataframe(riwayat_pem, use_container_width=True)
+
+            if not riwayat_pt.empty:
+                st.markdown("#### 🏢 Feedback dari PT")
+                st.dataframe(riwayat_pt, use_container_width=True)
+
+
+government_feedback_panel()
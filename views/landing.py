@@ -0,0 +1,13 @@
+import streamlit as st
+
+import assets
+
+st.image(assets.asset_path("landing", width=1600))
+st.markdown(
+    f"""
+<div style='text-align:center; color:#888; font-size:13px; margin-top:0px;'>
+    © 2025 <b>SIPETUALANG</b>. All rights reserved.
+</div>
+""",
+    unsafe_allow_html=True,
+)
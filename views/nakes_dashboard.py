@@ -0,0 +1,9 @@
+import streamlit as st
+
+# ===========================================================
+# ========== DASHBOARD NAKES ================================
+# ===========================================================
+st.header("💉 Dashboard Tenaga Kesehatan (Nakes)")
+st.info(
+    "Halaman ini digunakan oleh tenaga kesehatan untuk mencatat data pasien berdasarkan pemeriksaan langsung."
+)
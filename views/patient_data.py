@@ -0,0 +1,111 @@
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+from patient_import import show_bulk_import
+from period_table import show_period_table
+import data_store
+import exports
+import nik_index
+
+tab1, tab2 = st.tabs(["🧾 Input Data Pasien", "📋 Tabel Data Pasien"])
+
+with tab1:
+    # ===========================================================
+    # ========== TAB 1: INPUT DATA PASIEN =======================
+    # ===========================================================
+    st.subheader("🧾 Form Input Data Pasien")
+    st.info("Halaman ini digunakan oleh tenaga kesehatan untuk mencatat data pasien.")
+
+    with st.form("form_data_pasien_nakes"):
+        col1, col2 = st.columns(2)
+
+        with col1:
+            nama = st.text_input("👤 Nama Pasien")
+            nik = st.text_input("🆔 NIK")
+            usia = st.selectbox(
+                "🎂 Kelompok Umur",
+                [
+                    "",
+                    "Ibu Hamil",
+                    "Bayi/Balita (0–5 tahun)",
+                    "Anak-anak (6–11 tahun)",
+                    "Remaja (12–18 tahun)",
+                    "PUS/WUS (19–49 tahun)",
+                    "Lansia (50+ tahun)",
+                ],
+            )
+            jenis_kelamin = st.selectbox("🚻 Jenis Kelamin", ["Laki-laki", "Perempuan"])
+
+        with col2:
+            alamat = st.text_area("🏠 Alamat Pasien")
+            keluhan = st.text_area("💬 Keluhan Utama")
+            diagnosa = st.text_input("🩺 Diagnosa Medis (misal: ISPA, Hipertensi, dll)")
+
+        submitted = st.form_submit_button("💾 Simpan Data Pasien")
+
+    if submitted:
+        if not nama or not nik or not diagnosa:
+            st.error("⚠️ Mohon isi minimal **Nama**, **NIK**, dan **Diagnosa**.")
+        else:
+            tanggal = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            new_row = {
+                "Nama": nama,
+                "NIK": nik,
+                "Umur": usia,
+                "Jenis Kelamin": jenis_kelamin,
+                "Alamat": alamat,
+                "Keluhan": keluhan,
+                "Diagnosa": diagnosa,
+                "Tanggal Input": tanggal,
+            }
+            kunjungan, ganda = nik_index.visit_flags(nik, "nakes")
+            data_store.append_row("data_pasien_nakes", new_row)
+            new_data = pd.DataFrame([new_row])
+            st.success("✅ Data pasien berhasil disimpan.")
+            if ganda:
+                st.warning(
+                    "⚠️ Pasien dengan NIK ini sudah dicatat hari ini, periksa kemungkinan data ganda."
+                )
+            elif kunjungan:
+                st.info(f"🔁 Pasien lama: sudah tercatat {kunjungan} kali.")
+            if kunjungan:
+                with st.expander("🗂️ Riwayat Pasien (Gabungan)"):
+                    st.dataframe(nik_index.history(nik), use_container_width=True)
+
+            with st.expander("📋 Lihat Data yang Baru Dimasukkan"):
+                st.dataframe(new_data, use_container_width=True)
+
+    st.markdown("---")
+    show_bulk_import()
+
+with tab2:
+    # --- Tabel Data Pasien ---
+    st.subheader("📋 Data Pasien yang Sudah Tercatat")
+    st.info("Halaman ini digunakan oleh tenaga kesehatan melihat data pasien.")
+
+    # --- Cari riwayat gabungan per NIK ---
+    cari_nik = st.text_input("🔎 Cari Riwayat Pasien berdasarkan NIK")
+    if cari_nik:
+        riwayat = nik_index.history(cari_nik)
+        if riwayat.empty:
+            st.info("Belum ada riwayat untuk NIK ini.")
+        else:
+            st.dataframe(riwayat, use_container_width=True)
+    if data_store.table_exists("data_pasien_nakes"):
+        show_period_table(
+            "data_pasien_nakes", "Tanggal Input", key="bulan_pasien_nakes"
+        )
+
+        exports.download_on_demand(
+            label="📥 Unduh Data Pasien (Excel)",
+            build=lambda: exports.table_excel("data_pasien_nakes", "Data_Pasien_Nakes"),
+            file_name="Data_Pasien_Nakes.xlsx",
+            mime=exports.XLSX_MIME,
+            key="unduh_pasien_nakes",
+            prepare_label="⚙️ Siapkan Data Pasien (Excel)",
+            signature=data_store.table_signature("data_pasien_nakes"),
+        )
+    else:
+        st.info("📭 Belum ada data pasien yang dimasukkan.")
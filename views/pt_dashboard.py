@@ -0,0 +1,45 @@
+import streamlit as st
+
+import data_store
+import reports
+
+# ===========================================================
+# ==================== DASHBOARD PT =========================
+# ===========================================================
+st.title("Dashboard PT")
+
+
+@st.fragment
+def pt_feedback_panel():
+    df_pt = reports.table(status="Diteruskan ke PT")
+
+    if df_pt.empty:
+        st.info("Tidak ada laporan yang perlu ditindaklanjuti PT.")
+    else:
+        st.dataframe(df_pt)
+
+        idx = st.selectbox("Pilih ID Laporan", df_pt.index)
+
+        feedback = st.text_area("Feedback / Tindakan PT")
+
+        status_baru = st.selectbox("Update Status", ["Diproses PT", "Selesai"])
+
+        if st.button("Kirim Feedback PT"):
+            reports.record_event("pt", idx, feedback, status_baru)
+
+            st.success("Feedback PT disimpan!")
+
+    st.markdown("## 🗂️ Riwayat Lengkap Tindakan PT")
+
+    if data_store.table_exists("log_pt"):
+        log_pt = data_store.read_table("log_pt")
+
+        if log_pt.empty:
+            st.info("Belum ada riwayat tindakan PT.")
+        else:
+            st.dataframe(log_pt, use_container_width=True)
+    else:
+        st.info("Riwayat PT belum dibuat.")
+
+
+pt_feedback_panel()
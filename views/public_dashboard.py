@@ -0,0 +1,240 @@
+import os
+from datetime import datetime
+
+import streamlit as st
+
+from comment_feed import show_comment_feed
+import charts
+import rollup
+import timing
+import write_queue
+
+DATA_PATH = "data/data_penyakit.csv"
+
+# ===========================================================
+# ================ DASHBOARD PUBLIK =========================
+# ===========================================================
+st.header("📊 Dashboard Publik")
+
+waktu_sekarang = datetime.now()
+tanggal_hari_ini = waktu_sekarang.strftime("%A, %d %B %Y")
+st.markdown(f"🗓️ **Tanggal hari ini:** {tanggal_hari_ini}")
+
+st.info(
+    "Menampilkan data 10 penyakit terbesar berdasarkan laporan dari nakes dan masyarakat"
+)
+
+# --- 1️⃣ Penanda waktu update terakhir ---
+last_updated = datetime.fromtimestamp(os.path.getmtime(DATA_PATH))
+st.caption(
+    f"📅 **Data terakhir diperbarui:** {last_updated.strftime('%d %B %Y, %H:%M:%S')}"
+)
+
+
+# Filter & grafik dan komentar adalah fragment terpisah: interaksi di satu
+# bagian hanya menjalankan ulang bagian itu.
+@st.fragment
+def public_dashboard_charts():
+    # ===========================================================
+    # 🔎 FILTER DATA (Tahun, Bulan, Kelompok Umur)
+    # ===========================================================
+    # ======================================
+    # ⏰ REAL TIME DEFAULT (Bulan & Tahun)
+    # ======================================
+    today = datetime.now()
+    current_year = today.strftime("%Y")
+    current_month = today.strftime("%m")
+
+    # Gabungkan tahun dari kedua data
+    tahun_list = rollup.years()
+
+    bulan_list = [
+        "",
+        "01",
+        "02",
+        "03",
+        "04",
+        "05",
+        "06",
+        "07",
+        "08",
+        "09",
+        "10",
+        "11",
+        "12",
+    ]
+
+    kategori_umur_list = [
+        "",
+        "Ibu Hamil",
+        "Bayi/Balita (0–5 tahun)",
+        "Anak-anak (6–11 tahun)",
+        "Remaja (12–18 tahun)",
+        "PUS/WUS (19–49 tahun)",
+        "Lansia (50+ tahun)",
+    ]
+
+    st.markdown("### 🎛️ Filter Data")
+    colF1, colF2, colF3 = st.columns(3)
+
+    with colF1:
+        tahun_filter = st.selectbox(
+            "📅 Pilih Tahun",
+            [""] + tahun_list,
+            index=(
+                (tahun_list.index(current_year) + 1)
+                if current_year in tahun_list
+                else 0
+            ),
+        )
+
+    with colF2:
+        bulan_filter = st.selectbox(
+            "🗓️ Pilih Bulan",
+            bulan_list,
+            index=(
+                bulan_list.index(current_month) if current_month in bulan_list else 0
+            ),
+        )
+
+    with colF3:
+        umur_filter = st.selectbox("🎂 Kelompok Umur", kategori_umur_list)
+
+    # ======================
+    # 🔍 Terapkan Filter
+    # ======================
+    # Jika kosong maka gunakan real-time
+    year_to_use = tahun_filter if tahun_filter != "" else current_year
+    month_to_use = bulan_filter if bulan_filter != "" else current_month
+
+    def apply_filters(source):
+        # Dibaca dari kubus rollup, bukan scan tabel lengkap
+        return rollup.top_diagnoses(
+            source, [(year_to_use, month_to_use)], umur=umur_filter
+        )
+
+    with timing.section("dashboard:filter") as span:
+        top10_nakes = apply_filters("nakes")
+        top10_diagnosa = apply_filters("masyarakat")
+        span.rows = len(top10_nakes) + len(top10_diagnosa)
+
+    st.markdown("---")
+
+    # ===========================================================
+    # 🔍 10 Penyakit Berdasarkan Diagnosa Nakes
+    # ===========================================================
+    st.markdown("### 💉 10 Penyakit Berdasarkan Data Nakes (Terfilter)")
+
+    if not top10_nakes.empty:
+        st.dataframe(top10_nakes, use_container_width=True)
+    else:
+        st.info("Tidak ada data dari nakes sesuai filter.")
+
+    st.markdown("---")
+
+    st.markdown("### 📊 Grafik 10 Penyakit Terbesar Berdasarkan Data Nakes")
+
+    if not top10_nakes.empty:
+        col1, col2 = st.columns(2)
+
+        # --- Bar Chart ---
+        with col1:
+            st.image(
+                charts.bar_chart(
+                    top10_nakes["Diagnosa"],
+                    top10_nakes["Jumlah Kasus"],
+                    title="Bar Chart",
+                ),
+                use_container_width=True,
+            )
+
+        # --- Pie Chart ---
+        with col2:
+            st.image(
+                charts.pie_chart(
+                    top10_nakes["Diagnosa"],
+                    top10_nakes["Jumlah Kasus"],
+                    title="Pie Chart",
+                ),
+                use_container_width=True,
+            )
+
+    # ===========================================================
+    # 🔍 10 Penyakit Berdasarkan Diagnosa Masyarakat
+    # ===========================================================
+    st.markdown("### 🧑‍⚕️ 10 Penyakit Berdasarkan Diagnosa Masyarakat (Terfilter)")
+
+    if not top10_diagnosa.empty:
+        st.dataframe(top10_diagnosa, use_container_width=True)
+    else:
+        st.info("Tidak ada data masyarakat sesuai filter.")
+
+    st.markdown("### 📊 Grafik 10 Penyakit Terbesar Berdasarkan Diagnosa Masyarakat")
+
+    if not top10_diagnosa.empty:
+        colA, colB = st.columns(2)
+
+        # --- Bar Chart ---
+        with colA:
+            st.image(
+                charts.bar_chart(
+                    top10_diagnosa["Diagnosa"],
+                    top10_diagnosa["Jumlah Kasus"],
+                    title="Bar Chart",
+                ),
+                use_container_width=True,
+            )
+
+        # --- Pie Chart ---
+        with colB:
+            st.image(
+                charts.pie_chart(
+                    top10_diagnosa["Diagnosa"],
+                    top10_diagnosa["Jumlah Kasus"],
+                    title="Pie Chart",
+                ),
+                use_container_width=True,
+            )
+
+
+public_dashboard_charts()
+
+
+@st.fragment
+def comment_section():
+    # ===========================================================
+    # 📝 FITUR KOMENTAR
+    # ===========================================================
+
+    st.markdown("## 🗨️ Tulis Komentar")
+
+    # --- Form Input Komentar ---
+    with st.form("form_komentar"):
+        nama_komen = st.text_input("👤 Nama Anda")
+        waktu_komen = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+        komentar = st.text_area("💬 Komentar Anda (saran, kritik, masukan)")
+
+        submit_komen = st.form_submit_button("✉️ Kirim Komentar")
+
+    if submit_komen:
+        if not nama_komen or not komentar:
+            st.error("⚠️ Nama dan komentar tidak boleh kosong.")
+        else:
+            st.session_state["tiket_komentar"] = write_queue.submit(
+                "komentar_pengunjung",
+                {
+                    "Nama": nama_komen,
+                    "Komentar": komentar,
+                    "Waktu": waktu_komen,
+                },
+            )
+    write_queue.show_status("tiket_komentar", "✅ Komentar berhasil dikirim!")
+
+    # --- Tampilkan Komentar dalam Bentuk Bubble Chat ---
+    st.markdown("### 💬 Komentar")
+
+    show_comment_feed()
+
+
+comment_section()
@@ -0,0 +1,78 @@
+from datetime import datetime
+
+import streamlit as st
+
+import data_store
+import reports
+
+# ===========================================================
+# ========== TAB 2: LAPORAN MASALAH DESA ====================
+# ===========================================================
+st.subheader("📢 Form Laporan Masalah Kesehatan Desa")
+st.info(
+    "Halaman ini digunakan oleh tenaga kesehatan untuk melaporkan masalah kesehatan."
+)
+
+
+# Form, tabel & riwayat satu fragment: kirim laporan / pilih ID
+# tidak menjalankan ulang seluruh halaman
+@st.fragment
+def village_report_panel():
+    # Buat file laporan jika belum ada
+    data_store.ensure_table("laporan_nakes", data_store.COLUMNS["laporan_nakes"])
+
+    desa = st.text_input("🏘️ Nama Desa")
+    penyakit = st.text_input("🦠 Penyakit yang Meningkat")
+    jumlah = st.number_input("📌 Jumlah Kasus", min_value=0, step=1)
+    urgensi = st.selectbox("⚠️ Tingkat Urgensi", ["Rendah", "Sedang", "Tinggi"])
+    uraian = st.text_area("📝 Uraian Masalah")
+
+    if st.button("📨 Kirim Laporan"):
+        if desa and penyakit:
+            new_row = {
+                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "desa": desa,
+                "penyakit": penyakit,
+                "jumlah_kasus": jumlah,
+                "urgensi": urgensi,
+                "uraian": uraian,
+                "status": "Menunggu Pemerintah",
+            }
+
+            laporan_id = reports.create(new_row)
+
+            st.success(f"✅ Laporan berhasil dikirim (ID {laporan_id}).")
+        else:
+            st.error("⚠️ Mohon isi minimal **Nama Desa** dan **Penyakit**.")
+
+    # ---- Tampilkan laporan yang sudah ada ----
+    st.markdown("### 📊 Laporan Masalah Desa")
+    df = reports.table()
+
+    if df.empty:
+        st.info("Belum ada laporan desa.")
+    else:
+        st.dataframe(df, use_container_width=True)
+
+    st.markdown("### 🗂️ Riwayat Tindakan Laporan")
+
+    idx = st.selectbox("Pilih ID Laporan", df.index)
+
+    # Riwayat hanya dari baris event milik laporan yang dipilih
+    riwayat = reports.history(idx)
+    riwayat_pem = riwayat["pemerintah"]
+    riwayat_pt = riwayat["pt"]
+
+    if riwayat_pem.empty and riwayat_pt.empty:
+        st.info("Belum ada riwayat tindakan untuk laporan ini.")
+    else:
+        if not riwayat_pem.empty:
+            st.markdown("#### 🏛️ Riwayat Tindakan")
+            st.dataframe(riwayat_pem, use_container_width=True)
+
+        if not riwayat_pt.empty:
+            st.markdown("#### 🏢 Feedback dari PT")
+            st.dataframe(riwayat_pt, use_container_width=True)
+
+
+village_report_panel()
@@ -0,0 +1,218 @@
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+
+import assets
+import data_store
+
+# ===========================================================
+# ========== PEMANASAN CACHE SAAT START =====================
+# ===========================================================
+# Setelah restart, pengunjung pertama tidak perlu menunggu semua cache
+# dibangun: entrypoint `--serve` memanggil start() saat proses mulai
+# (sebelum server Streamlit menerima koneksi), yang menjalankan langkah-
+# langkah di bawah di satu thread latar (aset teroptimasi, tabel data,
+# kubus rollup, indeks NIK, status laporan, model keluhan, grafik filter
+# default). Server berjalan di proses yang sama, jadi cache di memori
+# yang dipanaskan langsung dipakai sesi pertama.
+#
+# Kesiapan dilaporkan lewat file statis static/ready.json, dilayani
+# Streamlit di /app/static/ready.json: 404 selama pemanasan, 200 berisi
+# durasi tiap langkah setelah selesai (cocok untuk readiness probe). File
+# lama dihapus setiap kali pemanasan baru dimulai.
+#
+#     python warmup.py --serve [opsi streamlit]   # entrypoint produksi
+#     python warmup.py                            # foreground (cache disk)
+#
+# SIPETUALANG_WARMUP=0 mematikan thread (`--serve` hanya membangun aset).
+# `streamlit run app.py` biasa tidak memanaskan cache & tidak menulis
+# ready.json; app.py hanya memastikan aset sudah dibangun.
+
+ENABLED = os.environ.get("SIPETUALANG_WARMUP", "1") != "0"
+STATUS_PATH = os.path.join("static", "ready.json")
+STATUS_URL = "app/static/ready.json"
+
+# Tabel yang dibaca sekali agar indeks baris & DataFrame sudah di-cache
+TABLES = [
+    "diagnosa_masyarakat",
+    "data_pasien_nakes",
+    "komentar_pengunjung",
+    "laporan_nakes",
+    "csr_log",
+]
+
+_lock = threading.Lock()
+_started = False
+_status = {"ready": False, "started": None, "finished": None, "steps": {}}
+
+
+# ===========================================================
+# ========== LANGKAH PEMANASAN ==============================
+# ===========================================================
+def _warm_tables():
+    for name in TABLES:
+        if data_store.table_exists(name):
+            data_store.read_table(name)
+
+
+def _warm_indexes():
+    import nik_index
+    import reports
+    import rollup
+
+    rollup.years()
+    nik_index.ensure_loaded()
+    reports.ids()
+
+
+def _warm_models():
+    import complaint_model
+    import diagnosis_rules
+
+    diagnosis_rules.load_rules()
+    complaint_model.load_model()
+
+
+def _warm_charts():
+    import charts
+    import rollup
+
+    # Argumen sama dengan views/public_dashboard.py (filter default:
+    # bulan berjalan, semua umur) agar kunci cache grafiknya cocok
+    today = datetime.now()
+    period = [(today.strftime("%Y"), today.strftime("%m"))]
+    for source in ("nakes", "masyarakat"):
+        top10 = rollup.top_diagnoses(source, period, umur="")
+        if top10.empty:
+            continue
+        charts.bar_chart(top10["Diagnosa"], top10["Jumlah Kasus"], title="Bar Chart")
+        charts.pie_chart(top10["Diagnosa"], top10["Jumlah Kasus"], title="Pie Chart")
+
+
+STEPS = [
+    ("aset", assets.ensure_built),
+    ("tabel", _warm_tables),
+    ("indeks", _warm_indexes),
+    ("model", _warm_models),
+    ("grafik", _warm_charts),
+]
+
+
+# ===========================================================
+# ========== STATUS KESIAPAN ================================
+# ===========================================================
+def _clear_status_file():
+    try:
+        os.remove(STATUS_PATH)
+    except FileNotFoundError:
+        pass
+
+
+def _write_status_file(status):
+    os.makedirs(os.path.dirname(STATUS_PATH), exist_ok=True)
+    tmp_path = f"{STATUS_PATH}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(status, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, STATUS_PATH)
+
+
+def _begin():
+    # Pemanasan baru dimulai: status (dan ready.json lama) direset
+    with _lock:
+        _status.update(ready=False, started=time.time(), finished=None, steps={})
+    _clear_status_file()
+
+
+def _run_steps(steps):
+    for name, step in steps:
+        t0 = time.perf_counter()
+        error = None
+        try:
+            step()
+        except Exception as exc:  # cache tetap dibangun saat dipakai
+            error = f"{type(exc).__name__}: {exc}"
+        result = {"ms": round((time.perf_counter() - t0) * 1000, 1)}
+        if error:
+            result["error"] = error
+        with _lock:
+            _status["steps"][name] = result
+    with _lock:
+        _status.update(ready=True, finished=time.time())
+    snapshot = status()
+    _write_status_file(snapshot)
+    return snapshot
+
+
+def run(steps=STEPS):
+    """Jalankan semua langkah; langkah yang gagal dicatat, sisanya tetap jalan."""
+    _begin()
+    return _run_steps(steps)
+
+
+def start():
+    """Mulai thread pemanasan (sekali per proses) saat proses server mulai."""
+    global _started
+    with _lock:
+        if _started:
+            return
+        _started = True
+    _begin()
+    if not ENABLED:
+        _run_steps(STEPS[:1])
+        return
+    threading.Thread(
+        target=_run_steps, args=(STEPS,), name="warmup", daemon=True
+    ).start()
+
+
+def serve(streamlit_args):
+    """Mulai pemanasan lalu jalankan server Streamlit di proses ini."""
+    from streamlit.web import cli
+
+    # Dijalankan sebagai `python warmup.py`: halaman yang `import warmup`
+    # harus melihat modul (dan status) yang sama, bukan salinan kedua
+    sys.modules.setdefault("warmup", sys.modules[__name__])
+    start()
+    sys.argv = ["streamlit", "run", "app.py", *streamlit_args]
+    return cli.main()
+
+
+def status():
+    """Salinan status pemanasan: ready, started, finished, durasi per langkah."""
+    with _lock:
+        out = dict(_status)
+        out["steps"] = {k: dict(v) for k, v in _status["steps"].items()}
+    return out
+
+
+def is_ready():
+    with _lock:
+        return _status["ready"]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Bangun cache aset, data, indeks & grafik sebelum server melayani."
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="panaskan di latar lalu jalankan `streamlit run app.py` (opsi lain "
+        "diteruskan ke streamlit)",
+    )
+    args, streamlit_args = parser.parse_known_args()
+    if args.serve:
+        sys.exit(serve(streamlit_args))
+    elif streamlit_args:
+        parser.error(f"opsi tidak dikenal: {' '.join(streamlit_args)}")
+    result = run()
+    for name, step in result["steps"].items():
+        print(
+            f"- {name}: {step['ms']} ms"
+            + (f" ({step['error']})" if "error" in step else "")
+        )
+    print(f"Status ditulis ke {STATUS_PATH}")
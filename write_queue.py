@@ -0,0 +1,234 @@
+import atexit
+import collections
+import itertools
+import os
+import queue
+import threading
+import time
+
+import pandas as pd
+import streamlit as st
+
+import data_store
+
+# ===========================================================
+# ========== ANTRIAN TULIS LATAR BELAKANG (FORM PUBLIK) =====
+# ===========================================================
+# Kiriman form publik (cek diagnosa, komentar) dimasukkan ke antrian
+# terbatas dan langsung diterima; satu thread penulis menggabungkannya
+# menjadi satu append per tabel setiap BATCH_MS milidetik atau BATCH_ROWS
+# baris, sehingga lock & fsync CSV dipakai sekali per kelompok, bukan
+# sekali per pengunjung. Setiap kiriman mendapat Ticket yang selesai
+# (done) setelah barisnya benar-benar tertulis ke disk.
+#
+# Diatur lewat env SIPETUALANG_WRITE_BATCH_MS / _WRITE_BATCH_ROWS /
+# _WRITE_QUEUE_MAX; SIPETUALANG_WRITE_QUEUE=0 menulis langsung (sinkron).
+
+BATCH_MS = int(os.environ.get("SIPETUALANG_WRITE_BATCH_MS", "200"))
+BATCH_ROWS = int(os.environ.get("SIPETUALANG_WRITE_BATCH_ROWS", "100"))
+MAX_PENDING = int(os.environ.get("SIPETUALANG_WRITE_QUEUE_MAX", "5000"))
+ENABLED = os.environ.get("SIPETUALANG_WRITE_QUEUE", "1") != "0"
+# Interval (detik) fragment status memeriksa ulang tiket yang belum tertulis
+POLL_INTERVAL = float(os.environ.get("SIPETUALANG_WRITE_POLL_INTERVAL", "0.5"))
+LATENCY_SAMPLES = 1000
+
+_queue = queue.Queue(maxsize=MAX_PENDING)
+_thread = None
+_thread_lock = threading.Lock()
+_ids = itertools.count(1)
+_STOP = object()
+
+_metrics_lock = threading.Lock()
+_latencies = collections.deque(maxlen=LATENCY_SAMPLES)  # detik, kirim -> tertulis
+_counters = {"submitted": 0, "written": 0, "batches": 0, "failed": 0, "max_batch": 0}
+
+
+class Ticket:
+    """Tanda terima satu kiriman; `done` di-set setelah tertulis (atau gagal)."""
+
+    def __init__(self, table, row, columns=None):
+        self.id = next(_ids)
+        self.table = table
+        self.row = row
+        self.columns = columns
+        self.submitted = time.monotonic()
+        self.error = None
+        self._done = threading.Event()
+
+    @property
+    def done(self):
+        return self._done.is_set()
+
+    @property
+    def ok(self):
+        return self.done and self.error is None
+
+    def wait(self, timeout=None):
+        """Tunggu sampai tertulis; True jika sudah selesai dalam `timeout` detik."""
+        return self._done.wait(timeout)
+
+    def _finish(self, error=None):
+        self.error = error
+        self._done.set()
+
+
+# ===========================================================
+# ========== THREAD PENULIS =================================
+# ===========================================================
+def _next_batch():
+    # Blok sampai ada kiriman, lalu kumpulkan hingga BATCH_ROWS / BATCH_MS
+    first = _queue.get()
+    batch = [first]
+    if first is _STOP or isinstance(first, threading.Event):
+        return batch
+    deadline = time.monotonic() + BATCH_MS / 1000
+    while len(batch) < BATCH_ROWS:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            item = _queue.get(timeout=remaining)
+        except queue.Empty:
+            break
+        batch.append(item)
+        if item is _STOP or isinstance(item, threading.Event):
+            break
+    return batch
+
+
+def _write(tickets):
+    # Satu append per (tabel, kolom); urutan kiriman dipertahankan
+    groups = {}
+    for ticket in tickets:
+        key = (ticket.table, tuple(ticket.columns or ()))
+        groups.setdefault(key, []).append(ticket)
+
+    for (table, columns), group in groups.items():
+        try:
+            data_store.append_rows(
+                table, [t.row for t in group], columns=list(columns) or None
+            )
+            error = None
+        except Exception as exc:  # kiriman lain tetap diproses
+            error = exc
+        now = time.monotonic()
+        with _metrics_lock:
+            _counters["batches"] += 1
+            _counters["max_batch"] = max(_counters["max_batch"], len(group))
+            _counters["failed" if error else "written"] += len(group)
+            if error is None:
+                _latencies.extend(now - t.submitted for t in group)
+        for ticket in group:
+            ticket._finish(error)
+
+
+def _run():
+    while True:
+        batch = _next_batch()
+        tickets = [item for item in batch if isinstance(item, Ticket)]
+        if tickets:
+            _write(tickets)
+        for item in batch:
+            if isinstance(item, threading.Event):
+                item.set()  # penanda flush: semua kiriman sebelumnya sudah tertulis
+        if any(item is _STOP for item in batch):
+            return
+
+
+def _ensure_thread():
+    global _thread
+    with _thread_lock:
+        if _thread is None or not _thread.is_alive():
+            _thread = threading.Thread(target=_run, name="write-queue", daemon=True)
+            _thread.start()
+
+
+# ===========================================================
+# ========== API ============================================
+# ===========================================================
+def submit(table, row, columns=None):
+    """Masukkan satu baris ke antrian tulis; kembalikan Ticket.
+
+    Jika antrian penuh (atau antrian dimatikan), baris ditulis langsung
+    sehingga kiriman tidak pernah hilang.
+    """
+    ticket = Ticket(table, row, columns)
+    with _metrics_lock:
+        _counters["submitted"] += 1
+    if ENABLED:
+        _ensure_thread()
+        try:
+            _queue.put_nowait(ticket)
+            return ticket
+        except queue.Full:
+            pass
+    _write([ticket])
+    return ticket
+
+
+def flush(timeout=None):
+    """Tunggu sampai semua kiriman yang sudah masuk antrian tertulis."""
+    if _thread is None or not _thread.is_alive():
+        return True
+    marker = threading.Event()
+    _queue.put(marker)
+    return marker.wait(timeout)
+
+
+def shutdown(timeout=10):
+    """Tulis sisa antrian lalu hentikan thread penulis (dipanggil saat exit)."""
+    global _thread
+    with _thread_lock:
+        thread, _thread = _thread, None
+    if thread is not None and thread.is_alive():
+        _queue.put(_STOP)
+        thread.join(timeout)
+
+
+atexit.register(shutdown)
+
+
+def metrics():
+    """Kedalaman antrian, jumlah kiriman/batch, dan latensi kirim -> tertulis (ms)."""
+    with _metrics_lock:
+        latencies = pd.Series(list(_latencies), dtype="float64") * 1000
+        out = dict(_counters)
+    out["depth"] = _queue.qsize()
+    if latencies.empty:
+        latencies = pd.Series([0.0])
+    out["latency_p50_ms"] = round(float(latencies.quantile(0.5)), 1)
+    out["latency_p95_ms"] = round(float(latencies.quantile(0.95)), 1)
+    out["latency_max_ms"] = round(float(latencies.max()), 1)
+    return out
+
+
+# ===========================================================
+# ========== KONFIRMASI KE SESI =============================
+# ===========================================================
+def show_status(key, success_message):
+    """Status kiriman sesi ini (Ticket di st.session_state[key]); tidak menunggu.
+
+    Selama belum tertulis tampil "sedang disimpan" di fragment yang
+    memeriksa ulang tiap POLL_INTERVAL detik. Begitu tiket selesai fragment
+    memicu rerun penuh (menghentikan polling di browser) dan konfirmasi
+    ditampilkan sekali di sini.
+    """
+    ticket = st.session_state.get(key)
+    if ticket is None:
+        return
+    if not ticket.done:
+        _pending_status(key)
+        return
+    del st.session_state[key]
+    if ticket.error is not None:
+        st.error(f"❌ Data gagal disimpan: {ticket.error}")
+    else:
+        st.success(success_message)
+
+
+@st.fragment(run_every=POLL_INTERVAL)
+def _pending_status(key):
+    ticket = st.session_state.get(key)
+    if ticket is None or ticket.done:
+        st.rerun()
+    st.info("⏳ Data diterima dan sedang disimpan...")